@@ -0,0 +1,222 @@
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+from abc import ABC, abstractmethod
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, QStandardPaths
+
+
+class AuthError(Exception):
+    """认证后端出错（凭据文件损坏、服务不可用等），区别于用户名或密码错误"""
+
+
+class AuthBackend(ABC):
+    """认证后端接口：authenticate 在工作线程中调用，可以是耗时的阻塞操作
+
+    返回 True/False 表示凭据是否正确；后端自身出错时抛出 AuthError。
+    """
+
+    @abstractmethod
+    def authenticate(self, username, password):
+        """校验用户名和密码"""
+
+
+class FileCredentialStore(AuthBackend):
+    """本地文件凭据库（参考实现）：每个用户保存随机盐和 PBKDF2-SHA256 哈希
+
+    文件格式：{"users": {"用户名": {"salt": hex, "hash": hex, "iterations": 次数}}}
+    文件不存在时使用默认账号 admin / 123456（与原演示一致），默认账号只在内存中，不写入文件；
+    第一次 set_password / remove_user 时才创建文件，此后只认文件中的账号。
+    """
+
+    ITERATIONS = 200_000  # PBKDF2 迭代次数
+    DEFAULT_USERS = {"admin": "123456"}
+
+    def __init__(self, path=None, iterations=None):
+        if path is None:
+            directory = (QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+                         or os.path.expanduser("~/.macwindow"))
+            path = os.path.join(directory, "credentials.json")
+        self.path = path
+        self.iterations = iterations or self.ITERATIONS
+        self._lock = threading.Lock()
+        self._users = None
+        self._defaults = set()  # 只在内存中的默认账号
+        # 用户不存在时也做一次同样代价的哈希，避免通过耗时判断用户是否存在
+        self._dummy = {"salt": secrets.token_hex(16), "hash": "", "iterations": self.iterations}
+
+    def _load(self):
+        if self._users is not None:
+            return self._users
+        if not os.path.exists(self.path):
+            self._users = {username: self._make_record(password)
+                           for username, password in self.DEFAULT_USERS.items()}
+            self._defaults = set(self._users)
+            return self._users
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._users = json.load(f)["users"]
+        except (OSError, ValueError, KeyError) as e:
+            raise AuthError(f"无法读取凭据文件：{e}") from e
+        return self._users
+
+    def _save(self):
+        # 有了真正的凭据文件后不再使用默认账号
+        for username in self._defaults:
+            self._users.pop(username, None)
+        self._defaults.clear()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"users": self._users}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _make_record(self, password):
+        salt = secrets.token_bytes(16)
+        digest = self._hash(password, salt, self.iterations)
+        return {"salt": salt.hex(), "hash": digest.hex(), "iterations": self.iterations}
+
+    @staticmethod
+    def _hash(password, salt, iterations):
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+    def set_password(self, username, password):
+        """新增用户或修改密码"""
+        with self._lock:
+            users = self._load()
+            self._defaults.discard(username)
+            users[username] = self._make_record(password)
+            self._save()
+
+    def remove_user(self, username):
+        with self._lock:
+            if self._load().pop(username, None) is not None:
+                self._defaults.discard(username)
+                self._save()
+
+    def authenticate(self, username, password):
+        with self._lock:
+            record = self._load().get(username)
+        known = record is not None
+        record = record or self._dummy
+        try:
+            digest = self._hash(password, bytes.fromhex(record["salt"]), int(record["iterations"]))
+            expected = bytes.fromhex(record["hash"])
+        except (KeyError, ValueError) as e:
+            raise AuthError(f"凭据记录损坏：{username}") from e
+        return hmac.compare_digest(digest, expected) and known
+
+
+class _AuthSignals(QObject):
+    done = Signal(int, bool, str)  # 请求序号，是否通过，错误信息（为空表示没有出错）
+
+
+class _AuthTask(QRunnable):
+    def __init__(self, backend, username, password, request, signals):
+        super().__init__()
+        self._backend = backend
+        self._username = username
+        self._password = password
+        self._request = request
+        self._signals = signals
+
+    def run(self):
+        try:
+            ok = bool(self._backend.authenticate(self._username, self._password))
+            error = ""
+        except AuthError as e:
+            ok, error = False, str(e) or "认证失败"
+        except Exception as e:  # 后端的意外异常也不能让线程悄悄结束，界面要能退出忙碌状态
+            ok, error = False, f"{type(e).__name__}: {e}"
+        self._signals.done.emit(self._request, ok, error)
+
+
+class AuthRunner(QObject):
+    """在 QThreadPool 中调用认证后端，结果通过信号回到界面线程
+
+    cancel() 和超时只是放弃等待：已在工作线程里运行的哈希无法中断，算完后结果会被丢弃。
+    """
+
+    TIMEOUT_MS = 10_000
+
+    busyChanged = Signal(bool)
+    succeeded = Signal(str)  # 用户名
+    failed = Signal(str)  # 用户名或密码错误
+    errored = Signal(str)  # 后端出错
+    timedOut = Signal()
+    canceled = Signal()
+
+    def __init__(self, backend, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._signals = _AuthSignals(self)
+        self._signals.done.connect(self._on_done)
+        self._request = 0  # 当前请求序号；旧请求的结果直接丢弃
+        self._busy = False
+        self._username = ""
+        self._timeout = QTimer(self)
+        self._timeout.setSingleShot(True)
+        self._timeout.setInterval(self.TIMEOUT_MS)
+        self._timeout.timeout.connect(self._on_timeout)
+
+    def setTimeout(self, ms):
+        self._timeout.setInterval(ms)
+
+    def timeout(self):
+        return self._timeout.interval()
+
+    def isBusy(self):
+        return self._busy
+
+    def start(self, username, password):
+        """开始认证；正在认证时忽略"""
+        if self._busy:
+            return False
+        self._request += 1
+        self._username = username
+        self._set_busy(True)
+        self._timeout.start()
+        self._pool.start(_AuthTask(self.backend, username, password, self._request, self._signals))
+        return True
+
+    def cancel(self):
+        if not self._busy:
+            return
+        self._abandon()
+        self.canceled.emit()
+
+    def _abandon(self):
+        self._request += 1
+        self._timeout.stop()
+        self._set_busy(False)
+
+    def _on_timeout(self):
+        if self._busy:
+            self._abandon()
+            self.timedOut.emit()
+
+    def _on_done(self, request, ok, error):
+        if request != self._request:
+            return
+        self._timeout.stop()
+        self._set_busy(False)
+        if error:
+            self.errored.emit(error)
+        elif ok:
+            self.succeeded.emit(self._username)
+        else:
+            self.failed.emit(self._username)
+
+    def _set_busy(self, busy):
+        if self._busy != busy:
+            self._busy = busy
+            self.busyChanged.emit(busy)
+
+    def waitForDone(self, msecs=-1):
+        """等待工作线程结束（退出程序前调用）"""
+        return self._pool.waitForDone(msecs)
@@ -0,0 +1,360 @@
+import getpass
+import json
+import os
+import sys
+import time
+from collections import deque
+
+from PySide6.QtCore import QObject, QEvent, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from MacStartup import process_start_time
+from MacWindowPool import MacWindowPool
+
+
+# 本次启动的时间：launch-to-window 的起点；调用方可以用环境变量传入更早的时间（例如 fork 之前）
+LAUNCHED = float(os.environ.get("MACWINDOW_LAUNCH_T0") or process_start_time())
+
+
+class MacLauncher(QObject):
+    """单实例启动：第一个进程监听 QLocalServer，之后的启动只把参数转发过去就退出
+
+    转发端只需要 QtCore/QtNetwork，不导入 QtWidgets、不创建 QApplication，也不构建窗口。
+    协议是一行 JSON：{"argv": [...], "cwd": ..., "launched": 启动时间, "wait": 是否等窗口显示}，
+    运行中的实例回复一行 JSON：{"ok": true}，wait 时在窗口首次绘制后回复并带上 "window_ms"；
+    无法处理的请求回复 {"ok": false, "error": 原因}，运行中的实例不受影响。
+    """
+
+    CONNECT_TIMEOUT_MS = 300  # 连接运行中实例的超时
+    REPLY_TIMEOUT_MS = 10_000  # 等待回复的超时（wait 时包含打开窗口的时间）
+    MAX_SAMPLES = 100
+
+    requested = Signal(list, str, object)  # 参数，工作目录，请求（打开窗口后调用 request.shown(window)）
+
+    def __init__(self, key=None, parent=None):
+        super().__init__(parent)
+        self.key = key or self.default_key()
+        self._server = None
+        self._buffers = {}  # 连接 -> 未读完的数据
+        self._launch_ms = {"cold": deque(maxlen=self.MAX_SAMPLES), "warm": deque(maxlen=self.MAX_SAMPLES)}
+
+    @staticmethod
+    def default_key():
+        return f"MacWindow-{getpass.getuser()}"
+
+    # ---------- 转发端 ----------
+
+    @classmethod
+    def forward(cls, argv, key=None, wait=False):
+        """把参数交给运行中的实例；返回它的回复（dict），没有运行中的实例时返回 None"""
+        socket = QLocalSocket()
+        socket.connectToServer(key or cls.default_key())
+        if not socket.waitForConnected(cls.CONNECT_TIMEOUT_MS):
+            return None
+        message = {"argv": list(argv), "cwd": os.getcwd(), "launched": LAUNCHED, "wait": wait}
+        socket.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        socket.waitForBytesWritten(cls.CONNECT_TIMEOUT_MS)
+        reply = b""
+        while not reply.endswith(b"\n") and socket.waitForReadyRead(cls.REPLY_TIMEOUT_MS):
+            reply += socket.readAll().data()
+        socket.disconnectFromServer()
+        try:
+            return json.loads(reply) if reply else {"ok": False}
+        except ValueError:
+            return {"ok": False}
+
+    # ---------- 运行中的实例 ----------
+
+    def listen(self):
+        """开始监听；已有实例在运行时返回 False"""
+        server = QLocalServer(self)
+        server.setSocketOptions(QLocalServer.UserAccessOption)
+        if not server.listen(self.key):
+            # 上次异常退出会留下失效的套接字文件：确认没有实例在监听后删除再试
+            probe = QLocalSocket()
+            probe.connectToServer(self.key)
+            if probe.waitForConnected(self.CONNECT_TIMEOUT_MS):
+                probe.disconnectFromServer()
+                return False
+            QLocalServer.removeServer(self.key)
+            if not server.listen(self.key):
+                return False
+        server.newConnection.connect(self._on_new_connection)
+        self._server = server
+        return True
+
+    def isListening(self):
+        return self._server is not None and self._server.isListening()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._buffers.pop(s, None))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _on_ready_read(self, socket):
+        data = self._buffers.get(socket, b"") + socket.readAll().data()
+        line, newline, rest = data.partition(b"\n")
+        if not newline:
+            self._buffers[socket] = data
+            return
+        self._buffers[socket] = rest
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            socket.disconnectFromServer()
+            return
+        request = LaunchRequest(self, socket, message.get("launched"), message.get("wait", False))
+        # 处理方可以先 accept() / reject()，没有回复时在这里确认收到
+        self.requested.emit(message.get("argv", []), message.get("cwd", ""), request)
+        request.accept()
+
+    # ---------- 统计 ----------
+
+    def _record(self, kind, ms):
+        self._launch_ms[kind].append(ms)
+
+    def stats(self):
+        """冷启动（本进程）和热启动（转发）的启动到窗口首次绘制耗时（毫秒）"""
+        result = {}
+        for kind, samples in self._launch_ms.items():
+            samples = sorted(samples)
+            result[kind] = {
+                "samples": len(samples),
+                "p50_ms": samples[len(samples) // 2] if samples else None,
+                "max_ms": samples[-1] if samples else None,
+            }
+        return result
+
+
+class LaunchRequest(QObject):
+    """一次启动请求：处理方打开窗口后调用 shown(window)，首次绘制时记录耗时并（按需）回复转发端
+
+    本进程自己的首个窗口也用它计时（冷启动，没有连接）。
+    """
+
+    finished = Signal(object)  # 启动到窗口首次绘制的耗时（毫秒），没有打开窗口时为 None
+
+    def __init__(self, launcher, socket=None, launched=None, wait=False):
+        super().__init__(launcher)
+        self._launcher = launcher
+        self._socket = socket
+        self.forwarded = socket is not None
+        self.launched = launched or LAUNCHED
+        self.wait = wait
+        self.window_ms = None
+
+    def accept(self):
+        """请求有效：不等窗口显示的转发端现在就可以退出"""
+        if not self.wait:
+            self.reply({"ok": True})
+
+    def reject(self, error):
+        """请求无效：回复错误原因（不打开窗口，随后调用 shown(None) 结束请求）"""
+        self.reply({"ok": False, "error": error})
+
+    def shown(self, window):
+        """窗口已 show()：等它首次绘制"""
+        if window is None:
+            self._finish(None)
+            return
+        window.installEventFilter(self)
+        window.update()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            self._finish(obj)
+        return False
+
+    def _finish(self, window):
+        if window is not None:
+            self.window_ms = (time.time() - self.launched) * 1000
+            self._launcher._record("warm" if self.forwarded else "cold", self.window_ms)
+        if self.wait:
+            self.reply({"ok": window is not None, "window_ms": self.window_ms})
+        self.finished.emit(self.window_ms)
+        self.deleteLater()
+
+    def reply(self, message):
+        """回复转发端（只回复一次）"""
+        socket, self._socket = self._socket, None
+        if socket is None or socket.state() != QLocalSocket.ConnectedState:
+            return
+        socket.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        socket.flush()  # 一行回复很短，立即写出，不依赖之后的事件循环（例如 --quit）
+        socket.disconnectFromServer()
+
+
+# ---------- 演示程序的单实例入口 ----------
+
+USAGE = """用法：python MacLauncher.py [hello|login|todo] [--standalone] [--wait] [--report]
+       python MacLauncher.py --quit | --stats
+
+    已有实例在运行时只把参数转发过去（不导入 QtWidgets，也不创建 QApplication），由它打开窗口；
+    窗口优先从预先构建的窗口池中取出。todo 先打开带持久化的主列表，主列表已显示时再打开
+    同一份数据的视图窗口（各自搜索、过滤和排序，修改实时同步）。
+
+    --standalone  不使用单实例，总是冷启动
+    --wait        等到窗口显示后再退出
+    --report      打印启动到窗口首次绘制的耗时（隐含 --wait）
+"""
+
+APPS = {
+    "hello": ("demo1_hello", "MyApp"),
+    "login": ("demo2_login", "LoginWindow"),
+    "todo": ("demo3_todo", "TodoApp"),
+}
+
+
+class _DemoHost(QObject):
+    """运行中的实例：按请求打开演示窗口，每类窗口一个窗口池"""
+
+    POOL_SIZE = 1
+
+    def __init__(self, launcher, app):
+        super().__init__(app)
+        self._app = app
+        self._launcher = launcher
+        self._pools = {}
+        self._todo_main = None
+        self._journal = None
+        self._logins = {}  # id -> 需要在退出前等待认证线程的登录窗口（窗口池销毁的窗口自动移出）
+        app.aboutToQuit.connect(self._on_quit)
+        launcher.requested.connect(self.handle)
+
+    def handle(self, argv, cwd, request):
+        # 转发来的参数来自另一个（可能是不同版本的）进程：有错只拒绝这次请求，不能让主实例退出
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            request.reject("参数格式不正确")
+        elif "--quit" in argv:
+            request.reply({"ok": True})
+            self._app.quit()
+        elif "--stats" in argv:
+            request.reply({"ok": True, "stats": self._launcher.stats()})
+        elif _kind(argv) not in APPS:
+            request.reject(f"未知的窗口类型：{_kind(argv)}")
+        else:
+            request.accept()
+            request.finished.connect(self._fill_pools)
+            request.shown(self.open(_kind(argv)))
+            return
+        request.shown(None)
+
+    def open(self, kind):
+        window = self._todo_window() if kind == "todo" else self._pool(kind).acquire()
+        if kind == "login" and id(window) not in self._logins:
+            key = id(window)
+            self._logins[key] = window
+            window.destroyed.connect(lambda *_, k=key: self._logins.pop(k, None))
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        return window
+
+    def _pool(self, kind, factory=None):
+        # 新建的池先不预热，等窗口首次绘制后再补满（_fill_pools），预热不占用打开窗口的时间
+        pool = self._pools.get(kind)
+        if pool is None:
+            if factory is None:
+                module, name = APPS[kind]
+                factory = getattr(__import__(module), name)
+            pool = self._pools[kind] = MacWindowPool(factory, size=0)
+        return pool
+
+    def _todo_window(self):
+        # 主列表接日志（持久化）；主列表已显示时再打开的窗口是同一个 store 上的视图
+        main = self._todo_main
+        if main is None:
+            from TodoJournal import TodoJournal
+            from demo3_todo import TodoApp
+
+            self._journal = TodoJournal()
+            main = self._todo_main = TodoApp(journal=self._journal)
+            main.setGeometryKey("todo")
+            self._pool("todo", lambda: TodoApp(store=main.store))
+            return main
+        if not main.isVisible():
+            return main
+        return self._pool("todo").acquire()
+
+    def _fill_pools(self):
+        for pool in self._pools.values():
+            if pool.size() < self.POOL_SIZE:
+                pool.setSize(self.POOL_SIZE)
+
+    def _on_quit(self):
+        for window in self._logins.values():
+            window.auth.waitForDone()
+        if self._journal is not None:
+            self._journal.close()
+        self._launcher.close()
+
+
+def _kind(argv):
+    return next((arg for arg in argv if not arg.startswith("-")), "hello")
+
+
+def _app_kind(argv):
+    """命令行参数中的窗口类型；未知类型时打印用法并退出（只在命令行入口使用，运行中的实例见 handle）"""
+    kind = _kind(argv)
+    if kind not in APPS:
+        raise SystemExit(f"未知的窗口类型：{kind}\n\n{USAGE}")
+    return kind
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if "-h" in argv or "--help" in argv:
+        print(USAGE)
+        return 0
+    report = "--report" in argv
+    standalone = "--standalone" in argv
+    control = "--quit" in argv or "--stats" in argv
+    if not control:
+        _app_kind(argv)  # 先检查参数，不要把错误的参数转发出去
+
+    if not standalone:
+        reply = MacLauncher.forward(argv, wait=control or report or "--wait" in argv)
+        if reply is not None:
+            if "stats" in reply:
+                print(json.dumps(reply["stats"], ensure_ascii=False, indent=2))
+            if report and reply.get("window_ms") is not None:
+                print(json.dumps({"mode": "warm", "window_ms": round(reply["window_ms"], 1)}), flush=True)
+            if reply.get("error"):
+                print(reply["error"], file=sys.stderr)
+            return 0 if reply.get("ok") else 1
+        if control:
+            print("没有运行中的实例")
+            return 1
+
+    # 没有运行中的实例：本进程成为主实例
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    launcher = MacLauncher()
+    if not standalone and not launcher.listen():
+        # 另一个进程恰好同时启动并抢先开始监听：改为转发给它
+        reply = MacLauncher.forward(argv, wait=report)
+        return 0 if reply and reply.get("ok") else 1
+    host = _DemoHost(launcher, app)
+
+    request = LaunchRequest(launcher)
+    request.finished.connect(host._fill_pools)
+    if report:
+        request.finished.connect(lambda ms: print(json.dumps({"mode": "cold", "window_ms": round(ms, 1)}), flush=True))
+    request.shown(host.open(_app_kind(argv)))
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+from PySide6.QtWidgets import QApplication, QMenu
+
+from MacTheme import MacTheme
+
+# 共享菜单的样式，注册到应用级主题中统一编译；所有菜单共用 objectName，样式只解析一次
+MENU_STYLE = """
+    QMenu#macMenu {
+        background-color: $menu_bg;
+        border: 1px solid $menu_border;
+        border-radius: 0px;
+        padding: 4px 0;
+        font-size: 14px;
+        color: $text;
+    }
+    QMenu#macMenu::item {
+        padding: 6px 20px;
+    }
+    QMenu#macMenu::item:selected {
+        background-color: $menu_highlight;
+        color: $menu_highlight_text;
+    }
+"""
+
+MacTheme.register_style("MacMenu", MENU_STYLE)
+
+
+class MenuContext:
+    """一次弹出的目标：target 是回调作用的对象，pos 是弹出位置，其余关键字参数作为属性保存"""
+
+    def __init__(self, target, pos=None, **values):
+        self.target = target
+        self.pos = pos
+        self.__dict__.update(values)
+
+
+class MenuItem:
+    """菜单项的声明
+
+    text、enabled、visible、checked 可以是固定值，也可以是以 MenuContext 为参数的函数，每次弹出前重新求值；
+    checked 不为 None 的菜单项带勾选标记。
+    triggered 是以 MenuContext 为参数的函数，或 target 上无参数方法的名称。
+    不带 text 的菜单项是分隔线（见 SEPARATOR）。
+    """
+
+    __slots__ = ("text", "triggered", "enabled", "visible", "checked")
+
+    def __init__(self, text=None, triggered=None, enabled=True, visible=True, checked=None):
+        self.text = text
+        self.triggered = triggered
+        self.enabled = enabled
+        self.visible = visible
+        self.checked = checked
+
+    def isSeparator(self):
+        return self.text is None
+
+
+SEPARATOR = MenuItem()
+
+
+def _value(value, context):
+    return value(context) if callable(value) else value
+
+
+class MacMenu(QMenu):
+    """声明式的共享右键菜单
+
+    用 define() 按名称声明菜单项，第一次弹出时才构建 QMenu 和 QAction，之后所有窗口复用同一个菜单；
+    每次弹出只重新绑定 MenuContext，并按 text/enabled/visible 刷新菜单项，不再重建菜单。
+    相邻、开头和结尾的分隔线由 QMenu 自动折叠。
+    """
+
+    _definitions = {}  # 名称 -> 菜单项元组
+    _menus = {}  # 名称 -> 已构建的菜单
+    _quit_connected = False
+
+    def __init__(self, items, parent=None):
+        super().__init__(parent)
+        self.setObjectName("macMenu")
+        self._context = None
+        self._entries = []  # [(QAction, MenuItem)]，只含需要每次刷新的菜单项
+        for item in items:
+            if item.isSeparator():
+                self.addSeparator()
+                continue
+            action = self.addAction("" if callable(item.text) else item.text)
+            action.triggered.connect(lambda checked=False, item=item: self._trigger(item))
+            action.setCheckable(item.checked is not None)
+            if any(callable(value) for value in (item.text, item.enabled, item.visible, item.checked)):
+                self._entries.append((action, item))
+            else:
+                action.setEnabled(bool(item.enabled))
+                action.setVisible(bool(item.visible))
+                action.setChecked(bool(item.checked))
+
+    # ---------- 注册表 ----------
+
+    @classmethod
+    def define(cls, name, items):
+        """声明（或替换）名为 name 的菜单；已构建的旧菜单在下次弹出时按新声明重建"""
+        cls._definitions[name] = tuple(items)
+        old = cls._menus.pop(name, None)
+        if old is not None:
+            old.deleteLater()
+
+    @classmethod
+    def isDefined(cls, name):
+        return name in cls._definitions
+
+    @classmethod
+    def menu(cls, name):
+        """返回名为 name 的菜单，第一次调用时构建"""
+        menu = cls._menus.get(name)
+        if menu is None:
+            try:
+                items = cls._definitions[name]
+            except KeyError:
+                raise KeyError(f"未定义的菜单：{name}") from None
+            menu = cls._menus[name] = cls(items)
+            if not cls._quit_connected:
+                # 共享菜单没有父控件，在 QApplication 销毁前释放
+                QApplication.instance().aboutToQuit.connect(cls.release)
+                cls._quit_connected = True
+        return menu
+
+    @classmethod
+    def popup_menu(cls, name, context):
+        """在 context.pos 弹出菜单并等待选择；返回被触发的 QAction，取消时返回 None"""
+        return cls.menu(name).execFor(context)
+
+    @classmethod
+    def builtMenus(cls):
+        """已构建的菜单名称"""
+        return list(cls._menus)
+
+    @classmethod
+    def release(cls):
+        """释放所有已构建的菜单（声明保留，下次弹出时重新构建）"""
+        cls._menus.clear()  # 菜单由 Python 持有，去掉引用即销毁
+
+    # ---------- 弹出 ----------
+
+    def execFor(self, context):
+        self.bind(context)
+        try:
+            return self.exec(context.pos)
+        finally:
+            self._context = None  # 不在两次弹出之间持有目标
+
+    def bind(self, context):
+        """绑定本次弹出的目标并刷新菜单项"""
+        self._context = context
+        for action, item in self._entries:
+            visible = bool(_value(item.visible, context))
+            action.setVisible(visible)
+            if not visible:
+                continue
+            if callable(item.text):
+                action.setText(item.text(context))
+            action.setEnabled(bool(_value(item.enabled, context)))
+            if item.checked is not None:
+                action.setChecked(bool(_value(item.checked, context)))
+
+    def _trigger(self, item):
+        context = self._context
+        if context is None or item.triggered is None:
+            return
+        if callable(item.triggered):
+            item.triggered(context)
+        else:
+            getattr(context.target, item.triggered)()
@@ -0,0 +1,244 @@
+import time
+from array import array
+
+from PySide6.QtCore import Qt, QObject, QEvent, QTimer
+from PySide6.QtWidgets import QLabel
+
+from MacTheme import MacTheme
+
+# 标题栏性能浮层的样式，注册到应用级主题中统一编译
+PROFILER_STYLE = """
+    QLabel#macProfilerOverlay {
+        background-color: transparent;
+        color: $title_fg;
+        font-family: "Menlo", "Consolas", monospace;
+        font-size: 10px;
+    }
+"""
+
+MacTheme.register_style("MacProfiler", PROFILER_STYLE)
+
+
+class LatencyRing:
+    """固定容量的环形缓冲：只保留最近 size 个数值，写入不分配内存"""
+
+    __slots__ = ("_data", "_size", "_pos", "total")
+
+    def __init__(self, size):
+        self._data = array("d", bytes(8 * size))
+        self._size = size
+        self._pos = 0
+        self.total = 0  # 累计写入次数（包括已被覆盖的）
+
+    def __len__(self):
+        return min(self.total, self._size)
+
+    def add(self, value):
+        self._data[self._pos] = value
+        self._pos = (self._pos + 1) % self._size
+        self.total += 1
+
+    def values(self):
+        """按写入顺序返回缓冲中的数值"""
+        if self.total < self._size:
+            return self._data[:self._pos].tolist()
+        return self._data[self._pos:].tolist() + self._data[:self._pos].tolist()
+
+    def last(self):
+        return self._data[self._pos - 1] if self.total else None
+
+    def clear(self):
+        self._pos = 0
+        self.total = 0
+
+
+def percentiles(values, points=(0.5, 0.95, 0.99)):
+    """返回 {"p50": ..., "p95": ..., "p99": ..., "max": ...}（最近邻取值）"""
+    if not values:
+        return {}
+    values = sorted(values)
+    n = len(values)
+    result = {f"p{round(p * 100)}": values[min(n - 1, int(n * p))] for p in points}
+    result["max"] = values[-1]
+    return result
+
+
+class _ProfilerOverlay(QLabel):
+    """标题栏右侧的一行统计文字，不接收鼠标事件"""
+
+    def __init__(self, title_bar):
+        super().__init__(title_bar)
+        self.setObjectName("macProfilerOverlay")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        title_bar.installEventFilter(self)
+
+    def setStats(self, text):
+        self.setText(text)
+        self._reposition()
+
+    def _reposition(self):
+        bar = self.parentWidget()
+        width = min(self.sizeHint().width(), bar.width() // 2)
+        self.setGeometry(bar.width() - width - 12, 0, width, bar.height())
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize:
+            self._reposition()
+        return False
+
+
+class MacProfiler(QObject):
+    """MacWindow 事件处理耗时统计
+
+    开启时把窗口的事件处理函数和动画的 updateCurrentValue 替换为实例属性上的计时包装，
+    关闭时删除这些属性，恢复为类上的原方法；未开启的窗口没有任何额外开销。
+    每类事件保存最近 BUFFER_SIZE 次耗时（毫秒），按需计算 p50/p95/p99；
+    paint 和动画帧另外记录时间戳，用于计算最近 FPS_WINDOW 秒的帧率。
+    """
+
+    HOOKS = ("mousePressEvent", "mouseMoveEvent", "resizeEvent", "paintEvent")
+    ANIMATION = "animationFrame"
+    BUFFER_SIZE = 1024
+    FPS_WINDOW = 1.0  # 计算帧率的时间窗口（秒）
+    OVERLAY_INTERVAL_MS = 500  # 浮层刷新间隔
+    OVERLAY_KEYS = ("mouseMoveEvent", "paintEvent", ANIMATION)  # 浮层显示的 p95
+
+    def __init__(self, window):
+        super().__init__(window)
+        self._window = window
+        self._latency = {name: LatencyRing(self.BUFFER_SIZE) for name in self.HOOKS + (self.ANIMATION,)}
+        self._frames = {"paint": LatencyRing(self.BUFFER_SIZE), "animation": LatencyRing(self.BUFFER_SIZE)}
+        self._hooked = []  # [(对象, 属性名)]
+        self._overlay = None
+        self._overlay_timer = None
+
+    # ---------- 安装 ----------
+
+    def install(self):
+        if self._hooked:
+            return
+        window = self._window
+        for name in self.HOOKS:
+            frames = self._frames["paint"] if name == "paintEvent" else None
+            self._hook(window, name, self._latency[name], frames)
+        # 已创建的动画直接挂上；还没创建的（从未最大化过）不强行创建，等创建时再挂上
+        for animation in (window._animation, window._snapshot_animation):
+            if animation is not None:
+                self._hook_animation(animation)
+        make = window._make_geometry_animation
+
+        def make_geometry_animation(target):
+            animation = make(target)
+            self._hook_animation(animation)
+            return animation
+
+        self._set_hook(window, "_make_geometry_animation", make_geometry_animation)
+
+    def uninstall(self):
+        for obj, name in self._hooked:
+            try:
+                delattr(obj, name)
+            except (AttributeError, RuntimeError):  # 对象已被删除
+                pass
+        self._hooked = []
+        self.setOverlayVisible(False)
+
+    def isInstalled(self):
+        return bool(self._hooked)
+
+    def _set_hook(self, obj, name, hook):
+        setattr(obj, name, hook)
+        self._hooked.append((obj, name))
+
+    def _hook(self, obj, name, latency, frames=None):
+        handler = getattr(obj, name)
+        clock = time.perf_counter
+        add = latency.add
+
+        if frames is None:
+            def hook(arg):
+                started = clock()
+                try:
+                    return handler(arg)
+                finally:
+                    add((clock() - started) * 1000)
+        else:
+            add_frame = frames.add
+
+            def hook(arg):
+                started = clock()
+                try:
+                    return handler(arg)
+                finally:
+                    ended = clock()
+                    add((ended - started) * 1000)
+                    add_frame(ended)
+
+        self._set_hook(obj, name, hook)
+
+    def _hook_animation(self, animation):
+        # 动画每帧调用 updateCurrentValue，窗口几何/截图位置的更新都在其中同步完成
+        self._hook(animation, "updateCurrentValue", self._latency[self.ANIMATION], self._frames["animation"])
+
+    # ---------- 统计 ----------
+
+    def latencies(self, name):
+        """某类事件最近的耗时列表（毫秒）"""
+        return self._latency[name].values()
+
+    def fps(self, kind="paint"):
+        """最近 FPS_WINDOW 秒内的帧率（kind: paint / animation）"""
+        frames = self._frames[kind]
+        now = time.perf_counter()
+        stamps = [t for t in frames.values() if now - t <= self.FPS_WINDOW]
+        if len(stamps) < 2:
+            return 0.0
+        # 只有一小段时间有帧时（例如短暂的动画），按实际跨度计算
+        return (len(stamps) - 1) / (stamps[-1] - stamps[0])
+
+    def stats(self):
+        """{事件名: {"count", "p50", "p95", "p99", "max"}, "fps": ..., "animationFps": ...}"""
+        result = {}
+        for name, ring in self._latency.items():
+            result[name] = dict(percentiles(ring.values()), count=ring.total)
+        result["fps"] = self.fps("paint")
+        result["animationFps"] = self.fps("animation")
+        return result
+
+    def reset(self):
+        for ring in self._latency.values():
+            ring.clear()
+        for ring in self._frames.values():
+            ring.clear()
+
+    # ---------- 浮层 ----------
+
+    def setOverlayVisible(self, visible):
+        if not visible:
+            if self._overlay_timer is not None:
+                self._overlay_timer.stop()
+            if self._overlay is not None:
+                self._overlay.hide()
+            return
+        if self._overlay is None:
+            self._overlay = _ProfilerOverlay(self._window.title_bar)
+            self._overlay_timer = QTimer(self)
+            self._overlay_timer.setInterval(self.OVERLAY_INTERVAL_MS)
+            self._overlay_timer.timeout.connect(self._update_overlay)
+        self._update_overlay()
+        self._overlay.show()
+        self._overlay_timer.start()
+
+    def isOverlayVisible(self):
+        return self._overlay is not None and self._overlay.isVisible()
+
+    def _update_overlay(self):
+        labels = {"mouseMoveEvent": "move", "paintEvent": "paint", self.ANIMATION: "anim"}
+        parts = []
+        for name in self.OVERLAY_KEYS:
+            values = self._latency[name].values()
+            if values:
+                parts.append(f"{labels.get(name, name)} {percentiles(values)['p95']:.2f}ms")
+        parts.append(f"{self.fps('paint'):.0f}fps")
+        self._overlay.setStats("  ".join(parts))
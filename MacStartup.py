@@ -0,0 +1,322 @@
+import contextlib
+import importlib.abc
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+
+
+def process_start_time():
+    """本进程启动时的墙钟时间（Linux 上精确到一个时钟节拍）；取不到时退回到现在"""
+    try:
+        with open("/proc/self/stat") as f:
+            ticks = int(f.read().rsplit(")", 1)[1].split()[19])  # 第 22 个字段 starttime：开机后的节拍数
+        elapsed = time.clock_gettime(time.CLOCK_BOOTTIME) - ticks / os.sysconf("SC_CLK_TCK")
+        return time.time() - max(elapsed, 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+
+_profiler = None  # 启动分析模式下的 StartupProfiler
+_NULL = contextlib.nullcontext()
+
+
+def section(name):
+    """记录一段启动耗时：with section("MacWindow.title_bar"): ...
+
+    未开启启动分析时返回共享的空上下文，几乎没有开销。
+    """
+    return _NULL if _profiler is None else _profiler.span(name, "section")
+
+
+def profiler():
+    return _profiler
+
+
+class _TimedLoader:
+    """包装真实的 loader：扩展模块的初始化在 create_module 中，所以从 create_module 开始计时"""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+        self._started = None
+
+    def create_module(self, spec):
+        self._started = time.perf_counter()
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        started = self._started or time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.add(f"import {self._name}", "import", started, time.perf_counter())
+        self._profiler._imported(self._name, module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """排在 sys.meta_path 最前面：交给其余的 finder 查找，再给找到的 loader 套上计时"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, name, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """启动分析：解释器启动、每个模块的导入、QApplication 创建、MacWindow.__init__ 各段和首次绘制
+
+    用法::
+
+        python MacStartup.py [--trace startup-trace.json] [--exit] demo3_todo.py [参数...]
+
+    首个顶层窗口绘制后打印汇总，并写出 Chrome 跟踪格式的文件（chrome://tracing 或 https://ui.perfetto.dev 打开）。
+    --exit 在首次绘制后直接退出，便于反复测量。
+    """
+
+    TOP_IMPORTS = 12  # 汇总中列出自身耗时最多的导入数
+
+    def __init__(self, trace_path="startup-trace.json", exit_after_paint=False):
+        self.trace_path = trace_path
+        self.exit_after_paint = exit_after_paint
+        self.origin = process_start_time()
+        self._offset = time.time() - time.perf_counter()  # perf_counter -> 墙钟
+        self.events = []  # (名称, 分类, 开始, 结束, 线程)；时间为 perf_counter 秒
+        self.first_paint = None
+        self._finder = None
+        self._paint_watcher = None
+        # 解释器启动：进程启动到本模块开始工作
+        self.add("interpreter start", "process", self.origin - self._offset, time.perf_counter())
+
+    # ---------- 记录 ----------
+
+    def add(self, name, category, start, end):
+        self.events.append((name, category, start, end, threading.get_ident()))
+
+    @contextlib.contextmanager
+    def span(self, name, category="section"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, time.perf_counter())
+
+    # ---------- 安装 ----------
+
+    def install(self):
+        global _profiler
+        _profiler = self
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+        # 已经导入的模块（例如直接在程序里开启时）也要挂上钩子
+        for name in ("PySide6.QtWidgets", "MacWindow"):
+            if name in sys.modules:
+                self._imported(name, sys.modules[name])
+
+    def uninstall(self):
+        global _profiler
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        _profiler = None
+
+    def _imported(self, name, module):
+        # 关键模块导入完成时再挂计时，不需要提前导入它们
+        if name == "PySide6.QtWidgets":
+            self._patch_application(module)
+        elif name == "MacWindow":
+            self._patch_window(module.MacWindow)
+
+    def _patch_application(self, module):
+        base = module.QApplication
+        if getattr(base, "_startup_timed", False):
+            return
+        profiler = self
+
+        class QApplication(base):
+            _startup_timed = True
+
+            def __init__(self, *args, **kwargs):
+                with profiler.span("QApplication()", "qt"):
+                    super().__init__(*args, **kwargs)
+                profiler._watch_first_paint(self)
+
+        module.QApplication = QApplication
+
+    def _patch_window(self, window_class):
+        """给 MacWindow 及之后定义的子类的 __init__ 套上计时（子类的计时包含 MacWindow.__init__）"""
+        if getattr(window_class.__init__, "_startup_timed", False):
+            return
+        self._wrap_init(window_class)
+        profiler = self
+
+        def __init_subclass__(cls, **kwargs):
+            super(window_class, cls).__init_subclass__(**kwargs)
+            if "__init__" in vars(cls):
+                profiler._wrap_init(cls)
+
+        window_class.__init_subclass__ = classmethod(__init_subclass__)
+
+    def _wrap_init(self, cls):
+        init = cls.__init__
+        name = f"{cls.__name__}.__init__"
+        profiler = self
+
+        def __init__(window, *args, **kwargs):
+            with profiler.span(name, "window"):
+                init(window, *args, **kwargs)
+
+        __init__._startup_timed = True
+        cls.__init__ = __init__
+
+    def _watch_first_paint(self, app):
+        from PySide6.QtCore import QObject, QEvent
+
+        profiler = self
+
+        class FirstPaintWatcher(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint and obj.isWidgetType() and obj.isWindow():
+                    app.removeEventFilter(self)
+                    profiler._on_first_paint(obj)
+                return False
+
+        self._paint_watcher = FirstPaintWatcher(app)
+        app.installEventFilter(self._paint_watcher)
+
+    def _on_first_paint(self, window):
+        self.first_paint = time.perf_counter()
+        self.add(f"first paint ({type(window).__name__})", "paint", self.first_paint, self.first_paint)
+        self.uninstall()
+        if self.trace_path:
+            self.write_trace(self.trace_path)
+        print(self.summary(), file=sys.stderr, flush=True)
+        if self.exit_after_paint:
+            os._exit(0)
+
+    # ---------- 输出 ----------
+
+    def _ms(self, t):
+        """perf_counter 时间 -> 从进程启动算起的毫秒数"""
+        return (t + self._offset - self.origin) * 1000
+
+    def write_trace(self, path):
+        """写出 Chrome 跟踪格式（时间单位微秒，从进程启动算起）"""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": os.path.basename(sys.argv[0])}}]
+        for name, category, start, end, tid in self.events:
+            event = {"name": name, "cat": category, "pid": pid, "tid": tid, "ts": round(self._ms(start) * 1000, 1)}
+            if end > start:
+                event.update(ph="X", dur=round((end - start) * 1e6, 1))
+            else:
+                event.update(ph="i", s="p")
+            events.append(event)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+    def self_times(self, category="import"):
+        """同一线程内嵌套的同类事件：自身耗时 = 总耗时 - 直接子事件耗时；返回 {名称: 毫秒}"""
+        result = {}
+        stack = []  # [[结束时间, 名称, 开始时间, 直接子事件耗时]]
+        spans = sorted((e for e in self.events if e[1] == category), key=lambda e: (e[4], e[2], -e[3]))
+        last_tid = None
+
+        def pop():
+            end, name, start, children = stack.pop()
+            total = end - start
+            result[name] = result.get(name, 0.0) + (total - children) * 1000
+            if stack:
+                stack[-1][3] += total
+
+        for name, _, start, end, tid in spans:
+            if tid != last_tid:
+                while stack:
+                    pop()
+                last_tid = tid
+            while stack and stack[-1][0] <= start:
+                pop()
+            stack.append([end, name, start, 0.0])
+        while stack:
+            pop()
+        return result
+
+    def summary(self):
+        def total(category):
+            # 只算最外层，嵌套部分不重复计
+            spans = sorted((e[2], e[3]) for e in self.events if e[1] == category)
+            covered, edge = 0.0, None
+            for start, end in spans:
+                if edge is None or start >= edge:
+                    covered += end - start
+                    edge = end
+                elif end > edge:
+                    covered += end - edge
+                    edge = end
+            return covered * 1000
+
+        lines = ["启动分析（毫秒，从进程启动算起）"]
+        interpreter = next(e for e in self.events if e[1] == "process")
+        lines.append(f"  {'解释器启动':<19}  {(interpreter[3] - interpreter[2]) * 1000:8.1f}")
+        lines.append(f"  {'模块导入（合计）':<16}  {total('import'):8.1f}")
+        for name, ms in sorted(self.self_times().items(), key=lambda item: -item[1])[:self.TOP_IMPORTS]:
+            lines.append(f"      {ms:8.1f}  {name}")
+        for category in ("qt", "window"):
+            spans = sorted((e for e in self.events if e[1] == category), key=lambda e: (e[2], -e[3]))
+            for name, _, start, end, _ in spans:
+                lines.append(f"  {name:<24}  {(end - start) * 1000:8.1f}  （开始于 {self._ms(start):.1f}）")
+        sections = {}
+        for name, category, start, end, _ in self.events:
+            if category == "section":
+                sections[name] = sections.get(name, 0.0) + (end - start) * 1000
+        for name, ms in sections.items():
+            lines.append(f"      {ms:8.1f}  {name}")
+        if self.first_paint is not None:
+            lines.append(f"  {'首次绘制于':<19}  {self._ms(self.first_paint):8.1f}")
+        if self.trace_path:
+            lines.append(f"  跟踪文件：{os.path.abspath(self.trace_path)}")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    trace_path, exit_after_paint = "startup-trace.json", False
+    while argv and argv[0].startswith("--"):
+        option = argv.pop(0)
+        if option == "--trace" and argv:
+            trace_path = argv.pop(0)
+        elif option == "--exit":
+            exit_after_paint = True
+        else:
+            argv = []
+    if not argv:
+        print(StartupProfiler.__doc__)
+        return 2
+
+    # 以脚本运行时本模块是 __main__，让 MacWindow 等 import MacStartup 时拿到同一个模块
+    sys.modules.setdefault("MacStartup", sys.modules[__name__])
+    StartupProfiler(trace_path, exit_after_paint).install()
+    script = argv[0]
+    sys.argv = argv
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    runpy.run_path(script, run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
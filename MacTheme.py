@@ -0,0 +1,205 @@
+from string import Template
+
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
+
+
+# 主题色板：样式模板中通过 $名称 引用
+LIGHT_THEME = {
+    "window_bg": "white",
+    "title_bg": "#E9EBEC",
+    "title_fg": "#444444",
+    "text": "#333333",
+    "muted_text": "#666666",
+    "border": "#bbbbbb",
+    "soft_border": "#dddddd",
+    "input_bg": "#fafafa",
+    "input_focus_bg": "#ffffff",
+    "list_bg": "#ffffff",
+    "menu_bg": "#ffffff",
+    "menu_border": "#cccccc",
+    "menu_highlight": "#4caf50",
+    "menu_highlight_text": "white",
+    "close": "#FF5F56",
+    "minimize": "#FFBD2E",
+    "maximize": "#27C93F",
+}
+
+DARK_THEME = {
+    "window_bg": "#2B2B2D",
+    "title_bg": "#3A3A3C",
+    "title_fg": "#D0D0D0",
+    "text": "#E6E6E6",
+    "muted_text": "#9A9A9A",
+    "border": "#555555",
+    "soft_border": "#4A4A4A",
+    "input_bg": "#333336",
+    "input_focus_bg": "#3A3A3D",
+    "list_bg": "#303033",
+    "menu_bg": "#2F2F31",
+    "menu_border": "#555555",
+    "menu_highlight": "#4caf50",
+    "menu_highlight_text": "white",
+    "close": "#FF5F56",
+    "minimize": "#FFBD2E",
+    "maximize": "#27C93F",
+}
+
+# MacWindow 自身的样式，通过 objectName 和动态属性 macRole 选择控件
+WINDOW_STYLE = """
+    QWidget#macContent {
+        background-color: $window_bg;
+        border-radius: 8px;
+    }
+    QWidget#macTitleBar {
+        background-color: $title_bg;
+        border-top-left-radius: 10px;
+        border-top-right-radius: 10px;
+        border-bottom-left-radius: 0px;
+        border-bottom-right-radius: 0px;
+    }
+    QWidget#macBody {
+        background: transparent;
+        border-top-left-radius: 0px;
+        border-top-right-radius: 0px;
+        border-bottom-left-radius: 10px;
+        border-bottom-right-radius: 10px;
+    }
+    QPushButton#macTitleLabel {
+        background: transparent;
+        border: none;
+        color: $title_fg;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton[macRole="close"], QPushButton[macRole="minimize"], QPushButton[macRole="maximize"] {
+        border: none;
+        border-radius: 7px;
+    }
+    QPushButton[macRole="close"] { background-color: $close; }
+    QPushButton[macRole="close"]:hover { background-color: $close_hover; }
+    QPushButton[macRole="minimize"] { background-color: $minimize; }
+    QPushButton[macRole="minimize"]:hover { background-color: $minimize_hover; }
+    QPushButton[macRole="maximize"] { background-color: $maximize; }
+    QPushButton[macRole="maximize"]:hover { background-color: $maximize_hover; }
+"""
+
+
+def darken_color(color_str, factor):
+    """颜色变暗（用于 hover 效果）"""
+    color = QColor(color_str)
+    r = max(0, min(255, int(color.red() * factor)))
+    g = max(0, min(255, int(color.green() * factor)))
+    b = max(0, min(255, int(color.blue() * factor)))
+    return f"rgb({r},{g},{b})"
+
+
+class MacTheme:
+    """应用级主题：把所有样式编译成一份 QApplication 样式表并缓存
+
+    各窗口和控件只设置 objectName / 动态属性，不再单独调用 setStyleSheet，
+    切换主题时整个应用只需重新 polish 一次。
+    """
+
+    _themes = {"light": LIGHT_THEME, "dark": DARK_THEME}
+    _styles = {"MacWindow": WINDOW_STYLE}
+    _compiled = {}  # 主题名 -> 编译好的样式表
+    _resolved = {}  # 主题名 -> 展开后的颜色表（含 hover 色），绘制时直接查表
+    _colors = {}  # (主题名, 颜色名) -> QColor
+    _current = "light"
+    _applied = None  # 当前已设置到 QApplication 的样式表
+
+    @classmethod
+    def register_theme(cls, name, tokens):
+        """注册或覆盖一套主题色板（缺失的颜色取浅色主题的值）"""
+        cls._themes[name] = {**LIGHT_THEME, **tokens}
+        cls._compiled.pop(name, None)
+        cls._forget_colors(name)
+        if name == cls._current:
+            cls._reapply()
+
+    @classmethod
+    def register_style(cls, key, template):
+        """注册一段样式模板（同一 key 重复注册会覆盖）"""
+        if cls._styles.get(key) == template:
+            return
+        cls._styles[key] = template
+        cls._compiled.clear()
+        cls._reapply()
+
+    @classmethod
+    def themes(cls):
+        return list(cls._themes)
+
+    @classmethod
+    def current(cls):
+        return cls._current
+
+    @classmethod
+    def token(cls, name):
+        """读取当前主题中的某个颜色"""
+        return cls._tokens(cls._current)[name]
+
+    @classmethod
+    def color(cls, name):
+        """当前主题中某个颜色的 QColor（每个主题只解析一次，返回副本）"""
+        key = (cls._current, name)
+        color = cls._colors.get(key)
+        if color is None:
+            color = cls._colors[key] = QColor(cls.token(name))
+        return QColor(color)
+
+    @classmethod
+    def compile(cls, name=None):
+        """编译（并缓存）指定主题的完整样式表"""
+        name = name or cls._current
+        sheet = cls._compiled.get(name)
+        if sheet is None:
+            tokens = cls._tokens(name)
+            sheet = "\n".join(Template(t).substitute(tokens) for t in cls._styles.values())
+            cls._compiled[name] = sheet
+        return sheet
+
+    @classmethod
+    def apply(cls, name=None):
+        """切换主题：只对 QApplication 设置一次样式表"""
+        if name is not None:
+            if name not in cls._themes:
+                raise ValueError(f"未知的主题：{name}")
+            cls._current = name
+        app = QApplication.instance()
+        if app is None:
+            return
+        sheet = cls.compile()
+        if sheet != cls._applied or app.styleSheet() != sheet:
+            app.setStyleSheet(sheet)
+            cls._applied = sheet
+
+    @classmethod
+    def ensure_applied(cls):
+        """窗口创建时调用：样式表已是最新时什么也不做"""
+        if cls._applied is None or cls._applied != cls._compiled.get(cls._current):
+            cls.apply()
+
+    @classmethod
+    def _reapply(cls):
+        # 还没有应用过主题时，等第一个窗口创建时再统一应用
+        if cls._applied is not None:
+            cls.apply()
+
+    @classmethod
+    def _tokens(cls, name):
+        tokens = cls._resolved.get(name)
+        if tokens is None:
+            tokens = dict(cls._themes[name])
+            for key in ("close", "minimize", "maximize"):
+                tokens[f"{key}_hover"] = darken_color(tokens[key], 0.85)
+            cls._resolved[name] = tokens
+        return tokens
+
+    @classmethod
+    def _forget_colors(cls, name):
+        # 色板变化后重新展开
+        cls._resolved.pop(name, None)
+        for key in [key for key in cls._colors if key[0] == name]:
+            del cls._colors[key]
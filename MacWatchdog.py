@@ -0,0 +1,295 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+from PySide6.QtCore import Qt, QObject, QEvent, QTimer, Signal, QStandardPaths
+from PySide6.QtWidgets import QApplication, QLabel
+
+from MacTheme import MacTheme
+from MacWindow import MacWindow
+
+# 卡顿浮层的样式（深浅主题下都用深色底，注册到应用级主题中统一编译）
+WATCHDOG_STYLE = """
+    QLabel#macStallOverlay {
+        background-color: rgba(30, 30, 30, 200);
+        color: #ffd479;
+        border-radius: 6px;
+        padding: 6px 8px;
+        font-family: "Menlo", "Consolas", monospace;
+        font-size: 11px;
+    }
+"""
+
+MacTheme.register_style("MacWatchdog", WATCHDOG_STYLE)
+
+
+class StallReport:
+    """一次界面线程卡顿：卡住时后台线程抓取的主线程调用栈，以及正在分发的事件"""
+
+    __slots__ = ("started", "duration_ms", "stack", "event", "receiver", "window", "_receiver_ref", "_window_ref")
+
+    def __init__(self, started, stack, event, receiver, window):
+        self.started = started  # 卡顿开始的时间（time.time()）
+        self.duration_ms = None  # 恢复后才知道总时长；程序一直没恢复时保持 None
+        self.stack = stack  # traceback.format_stack 的结果
+        self.event = event  # 事件类型名
+        self.receiver = receiver  # 接收事件的对象类名
+        self.window = window  # 所在窗口（类名，恢复后补上标题）
+        self._receiver_ref = None
+        self._window_ref = None
+
+    def summary(self):
+        duration = f"{self.duration_ms:.0f}ms" if self.duration_ms is not None else "未恢复"
+        clock = time.strftime("%H:%M:%S", time.localtime(self.started))
+        return f"{clock}  {duration}  {self.event} → {self.receiver}  [{self.window}]"
+
+
+class _StallOverlay(QLabel):
+    """窗口右下角的半透明浮层，列出最近几次卡顿，一段时间后自动隐藏"""
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.setObjectName("macStallOverlay")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._hide_timer = QTimer(self)
+        self._hide_timer.setSingleShot(True)
+        self._hide_timer.timeout.connect(self.hide)
+        window.installEventFilter(self)
+
+    def showReports(self, reports, timeout_ms):
+        self.setText("界面卡顿\n" + "\n".join(report.summary() for report in reports))
+        self.adjustSize()
+        self._reposition()
+        self.show()
+        self.raise_()
+        self._hide_timer.start(timeout_ms)
+
+    def _reposition(self):
+        # 贴着可见区域（不含阴影边距）的右下角
+        frame = self.parentWidget().content.geometry()
+        self.move(frame.right() - self.width() - 12, frame.bottom() - self.height() - 12)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize and self.isVisible():
+            self._reposition()
+        return False
+
+
+class MacWatchdog(QObject):
+    """界面线程卡顿监视（可选）：事件循环中的心跳定时器 + 后台检查线程
+
+    心跳超过 THRESHOLD_MS 没有更新时，后台线程通过 sys._current_frames 抓取主线程的 Python 调用栈，
+    连同正在分发的事件和所在窗口立即写入滚动日志（程序就此卡死也能留下记录）；
+    事件循环恢复后再补记总时长，发出 stalled 信号，并在窗口上显示最近几次卡顿。
+
+    TRACK_EVENTS 会在 QApplication 上安装事件过滤器记录最近分发的事件，每个事件多一次 Python 调用。
+    """
+
+    THRESHOLD_MS = 500  # 超过多久算卡顿
+    HEARTBEAT_MS = 100  # 心跳间隔
+    TRACK_EVENTS = True  # 记录正在分发的事件
+    STACK_LIMIT = 40  # 调用栈最多保留的层数
+    RECENT_LIMIT = 20  # 内存中保留的最近卡顿数
+    LOG_MAX_BYTES = 1024 * 1024  # 单个日志文件上限
+    LOG_BACKUPS = 3  # 保留的旧日志个数
+    OVERLAY = True  # 恢复后在窗口上显示浮层
+    OVERLAY_ROWS = 5  # 浮层显示的卡顿条数
+    OVERLAY_TIMEOUT_MS = 8000  # 浮层自动隐藏的时间
+
+    stalled = Signal(object)  # 恢复后发出：StallReport
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, log_path=None, parent=None):
+        super().__init__(parent)
+        self._threshold = self.THRESHOLD_MS
+        self._log_path = log_path or os.path.join(self.default_directory(), "watchdog.log")
+        self._logger = None
+        self._recent = deque(maxlen=self.RECENT_LIMIT)
+
+        self._lock = threading.Lock()
+        self._beat = time.monotonic()  # 最近一次心跳（只由界面线程写）
+        self._pending = None  # 后台线程已抓取、等待恢复的卡顿
+        self._reported_beat = None  # 已经报告过的心跳，同一次卡顿只抓一次
+        self._main_ident = threading.main_thread().ident
+        self._event = None  # (事件类型, 接收者)：最近分发的事件
+        self._thread = None
+        self._stop = threading.Event()
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(self.HEARTBEAT_MS)
+        self._heartbeat.timeout.connect(self._on_heartbeat)
+
+    @staticmethod
+    def default_directory():
+        return QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or os.path.expanduser("~/.macwindow")
+
+    # ---------- 配置 ----------
+
+    def setThreshold(self, ms):
+        self._threshold = ms
+
+    def threshold(self):
+        return self._threshold
+
+    def logPath(self):
+        return self._log_path
+
+    def isRunning(self):
+        return self._thread is not None
+
+    def recentStalls(self):
+        return list(self._recent)
+
+    # ---------- 启停 ----------
+
+    def start(self):
+        """开始监视（需在界面线程、QApplication 创建之后调用）"""
+        if self._thread is not None:
+            return
+        self._main_ident = threading.get_ident()
+        if self.TRACK_EVENTS:
+            QApplication.instance().installEventFilter(self)
+        self._beat = time.monotonic()
+        self._heartbeat.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch_loop, name="MacWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._heartbeat.stop()
+        app = QApplication.instance()
+        if app is not None:
+            app.removeEventFilter(self)
+        self._event = None
+
+    def eventFilter(self, obj, event):
+        # 只保存引用，格式化留到真正卡顿时再做
+        self._event = (event.type(), obj)
+        return False
+
+    # ---------- 后台线程 ----------
+
+    def _watch_loop(self):
+        while not self._stop.wait(max(self._threshold / 4000, 0.01)):
+            with self._lock:
+                beat = self._beat
+                if beat == self._reported_beat or (time.monotonic() - beat) * 1000 < self._threshold:
+                    continue
+                self._reported_beat = beat
+                report = self._capture()
+                if report is None:
+                    continue
+                self._pending = report
+            self._log_capture(report)
+
+    def _capture(self):
+        """抓取主线程当前的调用栈；只读取 Python 对象，不调用 Qt 接口"""
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return None
+        stack = traceback.format_stack(frame, limit=self.STACK_LIMIT)
+
+        # 调用栈中最内层的 MacWindow 方法就是卡住的窗口
+        window = None
+        f = frame
+        while f is not None and window is None:
+            owner = f.f_locals.get("self")
+            if isinstance(owner, MacWindow):
+                window = owner
+            f = f.f_back
+
+        event_name, receiver = "-", None
+        current = self._event
+        if current is not None:
+            event_type, receiver = current
+            event_name = getattr(event_type, "name", str(event_type))
+            if window is None and isinstance(receiver, MacWindow):
+                window = receiver
+
+        report = StallReport(time.time() - (time.monotonic() - self._beat), stack, event_name,
+                             type(receiver).__name__ if receiver is not None else "-",
+                             type(window).__name__ if window is not None else "-")
+        report._receiver_ref = receiver
+        report._window_ref = window
+        return report
+
+    # ---------- 恢复 ----------
+
+    def _on_heartbeat(self):
+        now = time.monotonic()
+        with self._lock:
+            report, self._pending = self._pending, None
+            last, self._beat = self._beat, now
+        if report is None:
+            return
+        report.duration_ms = (now - last) * 1000  # 从上次心跳算起，误差不超过一个心跳间隔
+        window = self._resolve_window(report)
+        self._recent.append(report)
+        self._log().warning("界面线程已恢复：%s", report.summary())
+        self.stalled.emit(report)
+        if self.OVERLAY:
+            self._show_overlay(window)
+
+    def _resolve_window(self, report):
+        """回到界面线程后再通过 Qt 接口补全窗口标题；报告本身不再引用窗口和接收者"""
+        window, receiver = report._window_ref, report._receiver_ref
+        report._window_ref = report._receiver_ref = None
+        try:
+            if window is None and receiver is not None and hasattr(receiver, "window"):
+                top = receiver.window()
+                window = top if isinstance(top, MacWindow) else None
+            if window is not None:
+                report.window = f"{type(window).__name__} “{window.title()}”"
+        except RuntimeError:  # 对象已被删除
+            window = None
+        return window
+
+    def _show_overlay(self, window):
+        if window is None:
+            active = QApplication.activeWindow()
+            window = active if isinstance(active, MacWindow) else None
+        if window is None or not window.isVisible():
+            return
+        overlay = window.findChild(_StallOverlay)
+        if overlay is None:
+            overlay = _StallOverlay(window)
+        reports = list(self._recent)[-self.OVERLAY_ROWS:]
+        overlay.showReports(reversed(reports), self.OVERLAY_TIMEOUT_MS)
+
+    # ---------- 日志 ----------
+
+    def _log(self):
+        if self._logger is None:
+            os.makedirs(os.path.dirname(self._log_path) or ".", exist_ok=True)
+            logger = logging.getLogger(f"MacWatchdog.{id(self)}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(self._log_path, maxBytes=self.LOG_MAX_BYTES,
+                                          backupCount=self.LOG_BACKUPS, encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def _log_capture(self, report):
+        # 在后台线程写，界面线程卡死时也能落盘
+        self._log().warning("界面线程超过 %dms 无响应：事件 %s → %s，窗口 %s\n%s",
+                            self._threshold, report.event, report.receiver, report.window,
+                            "".join(report.stack).rstrip())
@@ -1,20 +1,100 @@
-from PySide6.QtCore import Qt, QRect, QPoint, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QColor, QCursor
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout
+from enum import IntFlag
+
+from PySide6.QtCore import (
+    Qt, QRect, QRectF, QPoint, QMargins, QPropertyAnimation, QEasingCurve, QTimer, Signal, QObject, QEvent
+)
+from PySide6.QtGui import QPainter, QPixmap, QImage, QColor, QFont, QFontMetrics
+from PySide6.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QRubberBand,
+    QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect
+)
+
+from MacStartup import section
+from MacTheme import MacTheme
+from MacWindowManager import MacWindowManager
+
+
+class ResizeEdge(IntFlag):
+    """缩放方向：四条边的组合，角落即两条边同时命中"""
+    NONE = 0
+    LEFT = 1
+    TOP = 2
+    RIGHT = 4
+    BOTTOM = 8
+    TOP_LEFT = TOP | LEFT
+    TOP_RIGHT = TOP | RIGHT
+    BOTTOM_LEFT = BOTTOM | LEFT
+    BOTTOM_RIGHT = BOTTOM | RIGHT
 
 
 class MacWindow(QWidget):
     RESIZE_MARGIN = 8  # 边缘可用于调整窗口大小的范围像素
 
+    # 缩放方向对应的光标
+    _EDGE_CURSORS = {
+        ResizeEdge.NONE: Qt.ArrowCursor,
+        ResizeEdge.TOP: Qt.SizeVerCursor,
+        ResizeEdge.BOTTOM: Qt.SizeVerCursor,
+        ResizeEdge.LEFT: Qt.SizeHorCursor,
+        ResizeEdge.RIGHT: Qt.SizeHorCursor,
+        ResizeEdge.TOP_LEFT: Qt.SizeFDiagCursor,
+        ResizeEdge.BOTTOM_RIGHT: Qt.SizeFDiagCursor,
+        ResizeEdge.TOP_RIGHT: Qt.SizeBDiagCursor,
+        ResizeEdge.BOTTOM_LEFT: Qt.SizeBDiagCursor,
+    }
+
+    # 缩放模式：live 实时按帧更新几何；outline 拖动时只画虚框，松开后一次性提交
+    RESIZE_MODE_LIVE = "live"
+    RESIZE_MODE_OUTLINE = "outline"
+    RESIZE_MODE = RESIZE_MODE_LIVE
+    DEFAULT_REFRESH_RATE = 60.0  # 取不到屏幕刷新率时使用的帧率
+
+    # 最大化动画模式：geometry 逐帧改变真实窗口几何；snapshot 只动画一张窗口截图
+    ANIMATION_MODE_GEOMETRY = "geometry"
+    ANIMATION_MODE_SNAPSHOT = "snapshot"
+    ANIMATION_MODE = ANIMATION_MODE_GEOMETRY
+    SNAPSHOT_MIN_AREA = 640 * 480  # 起止尺寸都小于该面积时退回 geometry 动画
+    ANIMATION_DURATION = 200  # 最大化/还原动画时长（毫秒）
+
+    FRAME_RADIUS = 8  # 窗口圆角半径（阴影按它挖空）
+    TITLE_BAR_HEIGHT = 36
+
+    # 实时缩放时冻结正文：用截图代替正文，松开鼠标后只做一次真正的布局
+    # 正文需要在缩放过程中实时重新布局的子类可设为 False
+    DEFER_BODY_LAYOUT = True
+    BODY_SNAPSHOT_STRETCH = False  # True 拉伸截图，False 按原尺寸裁剪显示
+
+    # 使用单控件自绘标题栏（MacTitleBar）代替多控件标题栏，减少每个窗口的控件数量
+    PAINTED_TITLE_BAR = False
+
+    # 窗口阴影：content 四周留出 SHADOW_RADIUS 的透明边距，用缓存的九宫格模糊位图绘制（最大化时不绘制）
+    WINDOW_SHADOW = False
+    SHADOW_RADIUS = 16
+    SHADOW_COLOR = QColor(0, 0, 0, 80)
+    _shadow_cache = {}  # (半径, 圆角, 颜色, dpr) -> 九宫格源位图，所有窗口共享
+
+    # 事件耗时统计：开启时才在实例上挂计时包装（见 MacProfiler），未开启的窗口没有额外开销
+    PROFILING = False
+
+    # 几何持久化：设置后按该键保存/恢复窗口位置、大小和最大化状态（见 MacWindowState）；None 不保存
+    GEOMETRY_KEY = None
+
     def __init__(self, title="无标题窗口", min_size=(400, 300), default_size=(600, 400)):
         super().__init__()
 
-
+        # 样式统一由应用级主题提供，这里只在样式表过期时设置一次
+        with section("MacWindow.theme"):
+            MacTheme.ensure_applied()
 
         # 设置无边框 + 支持透明背景
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setMouseTracking(True)  # 鼠标跟踪（不按键也能触发 mouseMove）
+        # 悬停时的边缘检测由应用级事件过滤器统一处理，子控件无需开启鼠标跟踪
+        _HoverTracker.install()
+
+        # 几何持久化的键（见 setGeometryKey）；在第一次 resize 之前设置
+        self._geometry_key = None
+        self._geometry_restore_pending = False
 
         # 设置窗口初始大小和最小大小
         self.resize(*default_size)
@@ -24,34 +104,277 @@ class MacWindow(QWidget):
         self._drag_pos = None
         self._dragging = False
         self._resizing = False
-        self._resize_dir = None  # 当前缩放方向
+        self._resize_dir = ResizeEdge.NONE  # 当前缩放方向
+        self._hover_edge = ResizeEdge.NONE  # 当前悬停所在的边缘区域（用于光标去重）
+        self._window_shadow = False
+        self._hit_left = 0  # 边缘命中区域，仅在 resizeEvent 中更新
+        self._hit_top = 0
+        self._hit_right = 0
+        self._hit_bottom = 0
+        self._update_hit_zones()
+
+        # 帧合并缩放：缓存最新的鼠标位置，每帧最多提交一次几何更新
+        self._resize_mode = self.RESIZE_MODE
+        self._pending_resize_pos = None
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setTimerType(Qt.PreciseTimer)
+        self._resize_timer.timeout.connect(self._flush_resize)
+        self._rubber_band = None
+        self._body_snapshot = None  # 冻结正文时显示的截图控件
+        self._body_focus = None
+        self._resize_stats = {"events": 0, "updates": 0}
 
         # 最大化相关状态变量
         self._normal_geometry = self.geometry()
         self._is_maximized = False
         self._is_animating = False
         self._target_maximize = False
+        self._animation_mode = self.ANIMATION_MODE
+        self._snapshot_overlay = None
+        self._snapshot_animation = None
+        self._maximized_geometry = QRect()  # 最大化目标区域（开始动画时从屏幕缓存取得）
+
+        # 由 MacWindowPool 管理时指向所属的窗口池，关闭时回收而不销毁
+        self._pool = None
+
+        # 登记到窗口管理器，用于拖动/缩放吸附和平铺
+        self._window_manager = MacWindowManager.instance()
+        self._window_manager.register(self)
 
         # 主内容容器（带圆角和背景色）
         self.content = QWidget(self)
-        self.content.setMouseTracking(True)
-        self.content.setStyleSheet(self._content_style())
+        self.content.setObjectName("macContent")
 
         # 主布局：垂直方向，包含标题栏和正文区域
         self._main_layout = QVBoxLayout(self.content)
         self._main_layout.setContentsMargins(0, 0, 0, 0)
         self._main_layout.setSpacing(0)
 
-        # 创建标题栏
+        # 创建标题栏（多控件版本或单控件自绘版本）
+        with section("MacWindow.title_bar"):
+            if self.PAINTED_TITLE_BAR:
+                self._create_painted_title_bar(title)
+            else:
+                self._create_widget_title_bar(title)
+
+        self._main_layout.addWidget(self.title_bar)
+
+        # 正文区域（空壳容器，内容由外部设置）
+        self.body_widget = QWidget()
+        self.body_widget.setObjectName("macBody")
+        self.body_layout = QVBoxLayout(self.body_widget)
+        self.body_layout.setContentsMargins(0, 0, 0, 0)
+        self.body_layout.setSpacing(0)
+
+        self._main_layout.addWidget(self.body_widget)
+
+        # 最大化/还原动画在第一次使用时创建（见 animation）
+        self._animation = None
+
+        # 阴影切片缓存（按尺寸重建）
+        self._shadow_slices_key = None
+        self._shadow_slices = None
+        with section("MacWindow.frame"):
+            if self.WINDOW_SHADOW:
+                self.setWindowShadow(True)
+
+        # 事件耗时统计（按需创建）
+        self._profiler = None
+        if self.PROFILING:
+            self.setProfilingEnabled(True)
+
+        # 几何持久化（首次显示时恢复，子类在 __init__ 中设置的默认大小会被覆盖）
+        if self.GEOMETRY_KEY:
+            self.setGeometryKey(self.GEOMETRY_KEY)
+
+    def setContentLayout(self, layout):
+        self.body_layout.addLayout(layout)
+
+    def setTitle(self, title):
+        """设置标题栏文字"""
+        if self.title_label is None:
+            self.title_bar.setTitle(title)
+        else:
+            self.title_label.setText(f"  {title}  ")
+
+    def title(self):
+        if self.title_label is None:
+            return self.title_bar.title()
+        return self.title_label.text().strip()
+
+    def setAnimationMode(self, mode):
+        """设置最大化/还原动画模式（geometry / snapshot）"""
+        if mode not in (self.ANIMATION_MODE_GEOMETRY, self.ANIMATION_MODE_SNAPSHOT):
+            raise ValueError(f"未知的动画模式：{mode}")
+        self._animation_mode = mode
+
+    def animationMode(self):
+        return self._animation_mode
+
+    def setWindowShadow(self, enabled):
+        """开启/关闭窗口阴影；窗口几何随之增减阴影边距，可见区域保持不变"""
+        enabled = bool(enabled)
+        if enabled == self._window_shadow:
+            return
+        visible = self.visibleGeometry()
+        margin = self.SHADOW_RADIUS * (1 if enabled else -1)
+        self._window_shadow = enabled
+        self.setMinimumSize(max(0, self.minimumWidth() + 2 * margin), max(0, self.minimumHeight() + 2 * margin))
+        self._normal_geometry = self._normal_geometry.adjusted(-margin, -margin, margin, margin)
+        if not self._is_maximized:
+            self.setGeometry(visible.marginsAdded(self._shadow_margins()))
+        self._update_content_geometry()
+        self.update()
+
+    def windowShadow(self):
+        return self._window_shadow
+
+    def _shadow_margins(self):
+        """当前的阴影边距（未开启阴影或最大化时为 0）"""
+        if not self._window_shadow or self._is_maximized or self.isMaximized() or self.isFullScreen():
+            return QMargins()
+        r = self.SHADOW_RADIUS
+        return QMargins(r, r, r, r)
+
+    def visibleGeometry(self):
+        """窗口可见部分（不含阴影边距）的全局几何，吸附和平铺都以它为准"""
+        return self.geometry().marginsRemoved(self._shadow_margins())
+
+    def setResizeMode(self, mode):
+        """设置缩放模式（live / outline）"""
+        if mode not in (self.RESIZE_MODE_LIVE, self.RESIZE_MODE_OUTLINE):
+            raise ValueError(f"未知的缩放模式：{mode}")
+        self._resize_mode = mode
+
+    def resizeMode(self):
+        return self._resize_mode
+
+    def resizeStats(self):
+        """缩放统计：收到的鼠标事件数 / 实际提交的几何更新数"""
+        return dict(self._resize_stats)
+
+    def resetResizeStats(self):
+        self._resize_stats["events"] = 0
+        self._resize_stats["updates"] = 0
+
+    def setProfilingEnabled(self, enabled):
+        """开启/关闭事件耗时统计（鼠标按下/移动、缩放、绘制和动画帧）"""
+        if enabled:
+            if self._profiler is None:
+                from MacProfiler import MacProfiler  # 只有开启统计时才需要
+                self._profiler = MacProfiler(self)
+            self._profiler.install()
+        elif self._profiler is not None:
+            self._profiler.uninstall()
+
+    def isProfilingEnabled(self):
+        return self._profiler is not None and self._profiler.isInstalled()
+
+    def profiler(self):
+        """返回 MacProfiler（从未开启过统计时为 None）"""
+        return self._profiler
+
+    def profilerStats(self):
+        """各类事件耗时的 p50/p95/p99 与帧率，见 MacProfiler.stats()"""
+        return self._profiler.stats() if self._profiler is not None else {}
+
+    def setProfilerOverlay(self, visible):
+        """在标题栏右侧显示统计浮层；显示时自动开启统计"""
+        if visible:
+            self.setProfilingEnabled(True)
+        if self._profiler is not None:
+            self._profiler.setOverlayVisible(visible)
+
+    @staticmethod
+    def defineMenu(name, items):
+        """声明一个右键菜单（MenuItem 列表，见 MacMenu）；所有窗口共享，第一次弹出时才构建"""
+        from MacMenu import MacMenu  # 只有用到右键菜单的程序才加载菜单和它的样式
+
+        MacMenu.define(name, items)
+
+    def execMenu(self, name, global_pos, target=None, **values):
+        """在 global_pos 弹出共享菜单 name 并等待选择
+
+        回调作用于 target（默认本窗口），values 作为 MenuContext 的属性传给各回调；
+        返回被触发的 QAction，取消时返回 None。
+        """
+        from MacMenu import MacMenu, MenuContext
+
+        context = MenuContext(self if target is None else target, global_pos, window=self, **values)
+        return MacMenu.popup_menu(name, context)
+
+    def setGeometryKey(self, key):
+        """按 key 保存/恢复窗口几何和最大化状态；None 关闭持久化
+
+        未显示的窗口在首次显示时恢复，已显示的窗口立即恢复。
+        """
+        from MacWindowState import MacWindowState  # 只有开启持久化的窗口才需要
+
+        self._geometry_key = key or None
+        self._geometry_restore_pending = False
+        if self._geometry_key is None:
+            MacWindowState.instance().untrack(self)
+            return
+        # 移动/缩放/状态变化由 MacWindowState 的事件过滤器记录，未开启持久化的窗口没有额外开销
+        MacWindowState.instance().track(self)
+        if self.isVisible():
+            self.restoreGeometryState()
+        else:
+            self._geometry_restore_pending = True
+
+    def geometryKey(self):
+        return self._geometry_key
+
+    def restoreGeometryState(self):
+        """恢复上次保存的几何和最大化状态，并按当前的屏幕布局修正；没有保存过时返回 False"""
+        from MacWindowState import MacWindowState
+
+        if self._geometry_key is None:
+            return False
+        saved = MacWindowState.instance().load(self._geometry_key)
+        if saved is None:
+            return False
+        rect, maximized = saved
+        manager = self._window_manager
+        r = self.SHADOW_RADIUS if self._window_shadow else 0
+        # 先按最小尺寸修正，再放进屏幕，避免 setGeometry 放大窗口后又超出屏幕
+        rect.setSize(rect.size().expandedTo(self.minimumSize().shrunkBy(QMargins(r, r, r, r))))
+        rect = manager.clamp_to_screens(rect)
+        self._normal_geometry = rect.adjusted(-r, -r, r, r)
+        if maximized:
+            self._is_maximized = True
+            self.setGeometry(manager.available_geometry(manager.screen_at(rect.center())))
+            self.setWindowState(self.windowState() | Qt.WindowMaximized)
+        else:
+            if self._is_maximized:
+                self._is_maximized = False
+                self.setWindowState(self.windowState() & ~Qt.WindowMaximized)
+            self.setGeometry(self._normal_geometry)
+        return True
+
+    def _save_geometry_state(self):
+        """记下当前状态，由 MacWindowState 合并后延迟写出；动画期间不记录"""
+        if self._geometry_key is None or self._is_animating or not self.isVisible():
+            return
+        from MacWindowState import MacWindowState
+
+        if self._is_maximized:
+            r = self.SHADOW_RADIUS if self._window_shadow else 0
+            normal = self._normal_geometry.adjusted(r, r, -r, -r)
+        else:
+            normal = self.visibleGeometry()
+        MacWindowState.instance().save(self._geometry_key, normal, self._is_maximized)
+
+    def _create_widget_title_bar(self, title):
+        """多控件标题栏：三个圆形按钮 + 标题按钮"""
         self.title_bar = QWidget()
-        self.title_bar.setFixedHeight(36)
-        self.title_bar.setMouseTracking(True)
-        self.title_bar.setStyleSheet(self._title_bar_style())
+        self.title_bar.setFixedHeight(self.TITLE_BAR_HEIGHT)
+        self.title_bar.setObjectName("macTitleBar")
 
         # 标题栏三个按钮（关闭、最小化、最大化）
-        self.close_btn = self._create_circle_button("#FF5F56")
-        self.min_btn = self._create_circle_button("#FFBD2E")
-        self.max_btn = self._create_circle_button("#27C93F")
+        self.close_btn = self._create_circle_button("close")
+        self.min_btn = self._create_circle_button("minimize")
+        self.max_btn = self._create_circle_button("maximize")
 
         # 绑定按钮点击事件
         self.close_btn.clicked.connect(self.close)
@@ -62,7 +385,7 @@ class MacWindow(QWidget):
         self.title_label = QPushButton(f"  {title}  ")
         self.title_label.setFlat(True)
         self.title_label.setEnabled(False)
-        self.title_label.setStyleSheet("color: #444444; font-weight: bold; font-size: 12px;")
+        self.title_label.setObjectName("macTitleLabel")
 
         # 左侧按钮布局
         left_widget = QWidget()
@@ -88,89 +411,49 @@ class MacWindow(QWidget):
         btn_layout.addStretch()
         btn_layout.addWidget(right_widget)
 
-        self._main_layout.addWidget(self.title_bar)
+    def _create_painted_title_bar(self, title):
+        """单控件标题栏：按钮和标题文字都由 MacTitleBar 自绘"""
+        self.title_bar = MacTitleBar(title)
+        self.title_bar.setFixedHeight(self.TITLE_BAR_HEIGHT)
+        self.title_bar.setObjectName("macTitleBar")
+        self.title_bar.closeClicked.connect(self.close)
+        self.title_bar.minimizeClicked.connect(self.showMinimized)
+        self.title_bar.maximizeClicked.connect(self.toggle_max_restore)
+        self.close_btn = self.min_btn = self.max_btn = None
+        self.title_label = None
 
-        # 正文区域（空壳容器，内容由外部设置）
-        self.body_widget = QWidget()
-        self.body_widget.setMouseTracking(True)
-        self.body_widget.setStyleSheet(self._main_bar_style())
-        self.body_layout = QVBoxLayout(self.body_widget)
-        self.body_layout.setContentsMargins(0, 0, 0, 0)
-        self.body_layout.setSpacing(0)
-
-        self._main_layout.addWidget(self.body_widget)
-
-        # 创建最大化/还原时的动画
-        self.animation = QPropertyAnimation(self, b"geometry")
-        self.animation.setDuration(200)
-        self.animation.setEasingCurve(QEasingCurve.InOutQuad)
-        self.animation.finished.connect(self._on_animation_finished)
-
-
-    def setContentLayout(self, layout):
-        self.body_layout.addLayout(layout)
-
-    def _create_circle_button(self, color):
-        """生成圆形按钮"""
-        hover_color = self._darken_color(color, 0.85)
+    def _create_circle_button(self, role):
+        """生成圆形按钮（颜色由主题按 macRole 属性提供）"""
         btn = QPushButton()
+        btn.setProperty("macRole", role)
         btn.setFixedSize(14, 14)
         btn.setCursor(Qt.PointingHandCursor)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {color};
-                border: none;
-                border-radius: 7px;
-            }}
-            QPushButton:hover {{
-                background-color: {hover_color};
-            }}
-        """)
         return btn
 
-    @staticmethod
-    def _darken_color(color_str, factor):
-        """颜色变暗（用于 hover 效果）"""
-        color = QColor(color_str)
-        r = max(0, min(255, int(color.red() * factor)))
-        g = max(0, min(255, int(color.green() * factor)))
-        b = max(0, min(255, int(color.blue() * factor)))
-        return f"rgb({r},{g},{b})"
-
-    @staticmethod
-    def _content_style():
-        return """
-            background-color: white;
-            border-radius: 8px;
-        """
-
-    @staticmethod
-    def _title_bar_style():
-        return """
-            background-color: #E9EBEC;
-            border-top-left-radius: 10px;
-            border-top-right-radius: 10px;
-            border-bottom-left-radius: 0px;
-            border-bottom-right-radius: 0px;
-        """
+    @property
+    def animation(self):
+        """最大化/还原的几何动画（第一次访问时创建，从不最大化的窗口不需要它）"""
+        if self._animation is None:
+            self._animation = self._make_geometry_animation(self)
+        return self._animation
 
-    @staticmethod
-    def _main_bar_style():
-        return """
-            background: transparent;
-            border-top-left-radius: 0px;
-            border-top-right-radius: 0px;
-            border-bottom-left-radius: 10px;
-            border-bottom-right-radius: 10px;
-        """
+    def _make_geometry_animation(self, target):
+        """创建最大化/还原用的几何动画（真实窗口和截图浮层共用同样的时长和曲线）"""
+        animation = QPropertyAnimation(target, b"geometry")
+        animation.setDuration(self.ANIMATION_DURATION)
+        animation.setEasingCurve(QEasingCurve.InOutQuad)
+        animation.finished.connect(self._on_animation_finished)
+        return animation
 
     def toggle_max_restore(self):
         """最大化与还原切换动画"""
         if self._is_animating:
             return
 
-        screen_geom = self.screen().availableGeometry()
-        self.animation.stop()
+        # 屏幕可用区域由窗口管理器缓存，屏幕变化时才刷新
+        screen_geom = self._window_manager.available_geometry(self.screen())
+        if self._animation is not None:
+            self._animation.stop()
         start_geom = self.geometry()
 
         if self._is_maximized:
@@ -179,30 +462,216 @@ class MacWindow(QWidget):
         else:
             self._normal_geometry = start_geom
             self._target_maximize = True
-            end_geom = screen_geom
+            self._maximized_geometry = end_geom = screen_geom
 
-        self.animation.setStartValue(start_geom)
-        self.animation.setEndValue(end_geom)
         self._is_animating = True
-        self.animation.start()
+        if self._use_snapshot_animation(start_geom, end_geom):
+            self._start_snapshot_animation(start_geom, end_geom)
+        else:
+            self.animation.setStartValue(start_geom)
+            self.animation.setEndValue(end_geom)
+            self.animation.start()
 
         self._is_maximized = not self._is_maximized
 
+    def _use_snapshot_animation(self, start_geom, end_geom):
+        """snapshot 模式下，小窗口仍使用 geometry 动画"""
+        if self._animation_mode != self.ANIMATION_MODE_SNAPSHOT:
+            return False
+        area = min(start_geom.width() * start_geom.height(), end_geom.width() * end_geom.height())
+        return area >= self.SNAPSHOT_MIN_AREA
+
+    def _start_snapshot_animation(self, start_geom, end_geom):
+        """截图一次，隐藏真实窗口，只对截图浮层做几何动画"""
+        if self._snapshot_overlay is None:
+            self._snapshot_overlay = _SnapshotOverlay()
+            self._snapshot_animation = self._make_geometry_animation(self._snapshot_overlay)
+
+        self._snapshot_overlay.setPixmap(self.grab())
+        self._snapshot_overlay.setGeometry(start_geom)
+        self._snapshot_overlay.show()
+        self.setWindowOpacity(0.0)
+
+        self._snapshot_animation.setStartValue(start_geom)
+        self._snapshot_animation.setEndValue(end_geom)
+        self._snapshot_animation.start()
+
     def _on_animation_finished(self):
         """动画结束后修正窗口状态"""
         if self._target_maximize:
-            self.setGeometry(self.screen().availableGeometry())
+            self.setGeometry(self._maximized_geometry)
             super().showMaximized()
         else:
             self.setGeometry(self._normal_geometry)
             super().showNormal()
+        if self._snapshot_overlay is not None and self._snapshot_overlay.isVisible():
+            self.setWindowOpacity(1.0)
+            self._snapshot_overlay.hide()
+            self._snapshot_overlay.setPixmap(None)
+        self._is_animating = False
+        self._save_geometry_state()
+
+    def place(self, rect):
+        """直接把窗口放到 rect（不播放动画），用于平铺等场景"""
+        if self._is_animating:
+            if self._animation is not None:
+                self._animation.stop()
+            if self._snapshot_animation is not None:
+                self._snapshot_animation.stop()
+            self._on_animation_finished()
+        if self._is_maximized:
+            self._is_maximized = False
+            self.setWindowState(Qt.WindowNoState)
+        self.setGeometry(rect.marginsAdded(self._shadow_margins()))
+
+    def tile(self, layout):
+        """把当前窗口平铺到屏幕的某个区域（left_half / right_half / top_half / bottom_half / maximize）"""
+        self._window_manager.tile(layout, [self])
+
+    def reset_for_reuse(self):
+        """窗口被窗口池回收时调用：清理交互状态，回到未最大化的初始状态
+
+        子类可重写以清理自身状态（记得调用 super()）。
+        """
+        if self._animation is not None:
+            self._animation.stop()
+        if self._snapshot_animation is not None:
+            self._snapshot_animation.stop()
+            self._snapshot_overlay.hide()
+            self.setWindowOpacity(1.0)
+        self._resize_timer.stop()
+        if self._rubber_band is not None:
+            self._rubber_band.hide()
+        self._thaw_body()
+        self._pending_resize_pos = None
+        self._dragging = False
+        self._resizing = False
+        self._resize_dir = ResizeEdge.NONE
+        self._set_cursor_by_direction(ResizeEdge.NONE)
         self._is_animating = False
+        if self._is_maximized:
+            self._is_maximized = False
+            self.setWindowState(Qt.WindowNoState)
+            self.setGeometry(self._normal_geometry)
+
+    def closeEvent(self, event):
+        """关闭窗口：由窗口池管理时回收复用，而不是销毁"""
+        super().closeEvent(event)
+        if event.isAccepted() and self._pool is not None:
+            self._pool.recycle(self)
+
+    def changeEvent(self, event):
+        # 最大化/还原时阴影边距随之出现或消失
+        if event.type() == QEvent.WindowStateChange:
+            self._update_content_geometry()
+        super().changeEvent(event)
 
     def resizeEvent(self, event):
         """窗口大小改变时，更新内容区域大小"""
-        self.content.setGeometry(self.rect())
+        self._update_content_geometry()
         super().resizeEvent(event)
 
+    def _update_content_geometry(self):
+        """content 占据窗口去掉阴影边距后的区域；尺寸或边距变化时重建命中区域"""
+        frame = self.rect().marginsRemoved(self._shadow_margins())
+        if frame != self.content.geometry():
+            self.content.setGeometry(frame)
+            self._update_hit_zones()
+
+    def paintEvent(self, event):
+        """窗口阴影用九宫格位图，只绘制与受损区域相交的切片；窗口本身由样式表绘制"""
+        if not self._window_shadow or self._shadow_margins().isNull():
+            super().paintEvent(event)
+            return
+        region = event.region()
+        painter = QPainter(self)
+        painter.setClipRegion(region)
+        self._paint_shadow(painter, region)
+
+    def _paint_shadow(self, painter, region):
+        """只绘制与受损区域相交的阴影切片：四角原样绘制，四边拉伸，中间被 content 覆盖不绘制"""
+        pixmap, slices = self._shadow_geometry()
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        for target, source in slices:
+            if region.intersects(target):
+                painter.drawPixmap(QRectF(target), pixmap, source)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
+    def _shadow_geometry(self):
+        """按 content 位置计算八个切片的目标/源矩形（尺寸不变时复用）"""
+        dpr = self.devicePixelRatioF()
+        frame = self.content.geometry()
+        key = (frame, self.size(), dpr)
+        pixmap = self._shadow_pixmap(self.SHADOW_RADIUS, self.FRAME_RADIUS, self.SHADOW_COLOR, dpr)
+        if key == self._shadow_slices_key:
+            return pixmap, self._shadow_slices
+
+        pad = self.SHADOW_RADIUS
+        c = pad + self.FRAME_RADIUS  # 角切片的边长（逻辑像素）
+        outer = frame.adjusted(-pad, -pad, pad, pad)
+        x0, y0, x1, y1 = outer.left(), outer.top(), outer.right() + 1, outer.bottom() + 1
+        mid_w, mid_h = max(0, outer.width() - 2 * c), max(0, outer.height() - 2 * c)
+        cd, md = c * dpr, dpr  # 源位图中角切片和中间 1 像素的设备像素尺寸
+        slices = [
+            (QRect(x0, y0, c, c), QRectF(0, 0, cd, cd)),
+            (QRect(x1 - c, y0, c, c), QRectF(cd + md, 0, cd, cd)),
+            (QRect(x0, y1 - c, c, c), QRectF(0, cd + md, cd, cd)),
+            (QRect(x1 - c, y1 - c, c, c), QRectF(cd + md, cd + md, cd, cd)),
+            (QRect(x0 + c, y0, mid_w, c), QRectF(cd, 0, md, cd)),
+            (QRect(x0 + c, y1 - c, mid_w, c), QRectF(cd, cd + md, md, cd)),
+            (QRect(x0, y0 + c, c, mid_h), QRectF(0, cd, cd, md)),
+            (QRect(x1 - c, y0 + c, c, mid_h), QRectF(cd + md, cd, cd, md)),
+        ]
+        self._shadow_slices = [(target, source) for target, source in slices if not target.isEmpty()]
+        self._shadow_slices_key = key
+        return pixmap, self._shadow_slices
+
+    @classmethod
+    def _shadow_pixmap(cls, radius, corner, color, dpr):
+        """生成九宫格阴影源位图：每组半径/圆角/颜色/dpr 只模糊一次，所有窗口共享"""
+        key = (radius, corner, color.rgba(), dpr)
+        pixmap = cls._shadow_cache.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        # 最小的圆角矩形（四角 + 中间 1 像素）四周各留 radius 的模糊空间
+        c = radius + corner
+        side = round((2 * c + 1) * dpr)
+        pad = round(radius * dpr)
+        hole = QRectF(pad, pad, side - 2 * pad, side - 2 * pad)
+        shape = QImage(side, side, QImage.Format_ARGB32_Premultiplied)
+        shape.fill(Qt.transparent)
+        painter = QPainter(shape)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(hole, corner * dpr, corner * dpr)
+        painter.end()
+
+        # 只在这里用一次模糊效果，之后绘制都是位图拷贝
+        scene = QGraphicsScene()
+        item = QGraphicsPixmapItem(QPixmap.fromImage(shape))
+        blur = QGraphicsBlurEffect()
+        blur.setBlurRadius(pad)
+        blur.setBlurHints(QGraphicsBlurEffect.QualityHint)
+        item.setGraphicsEffect(blur)
+        scene.addItem(item)
+        image = QImage(side, side, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        scene.render(painter, QRectF(0, 0, side, side), QRectF(0, 0, side, side))
+        # 挖掉窗口本身所在的区域，圆角处不会透出阴影
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setCompositionMode(QPainter.CompositionMode_Clear)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(Qt.black)
+        painter.drawRoundedRect(hole, corner * dpr, corner * dpr)
+        painter.end()
+
+        pixmap = QPixmap.fromImage(image)
+        cls._shadow_cache[key] = pixmap
+        return pixmap
+
     def mousePressEvent(self, event):
         """鼠标按下：开始拖动或调整大小"""
         if event.button() == Qt.LeftButton:
@@ -210,93 +679,176 @@ class MacWindow(QWidget):
             self._start_rect = self.geometry()
             self._resize_dir = self._get_resize_direction(event.pos())
 
-            title_bar_pos = self.title_bar.mapFromParent(event.pos())
-            if not self._resize_dir and self.title_bar.rect().contains(title_bar_pos):
+            title_bar_pos = self.title_bar.mapFrom(self, event.pos())
+            if self._resize_dir == ResizeEdge.NONE and self.title_bar.rect().contains(title_bar_pos):
                 self._dragging = True
             elif self._resize_dir:
                 self._resizing = True
+                self._begin_resize()
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event):
-        """鼠标移动：拖动、调整大小或显示对应光标"""
-        pos = event.pos()
-        global_pos = event.globalPos()
-
+        """鼠标移动：拖动或调整大小（悬停光标由 _HoverTracker 处理）"""
         if event.buttons() & Qt.LeftButton:
+            global_pos = event.globalPos()
             if self._resizing:
-                self._perform_resize(global_pos)
+                self._queue_resize(global_pos)
             elif self._dragging:
                 delta = global_pos - self._drag_pos
-                self.move(self._start_rect.topLeft() + delta)
-        else:
-            direction = self._get_resize_direction(pos)
-            self._set_cursor_by_direction(direction)
+                margins = self._shadow_margins()
+                rect = self._start_rect.translated(delta).marginsRemoved(margins)
+                snapped = self._window_manager.snap_move(self, rect)
+                self.move(snapped.topLeft() - QPoint(margins.left(), margins.top()))
 
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
         """鼠标释放：结束拖动/缩放"""
+        if self._resizing:
+            self._end_resize()
         self._dragging = False
         self._resizing = False
-        self._resize_dir = None
-        self.setCursor(Qt.ArrowCursor)
+        self._resize_dir = ResizeEdge.NONE
+        self._set_cursor_by_direction(ResizeEdge.NONE)
         super().mouseReleaseEvent(event)
 
     def mouseDoubleClickEvent(self, event):
         """双击标题栏：最大化/还原"""
-        title_bar_pos = self.title_bar.mapFromParent(event.pos())
+        title_bar_pos = self.title_bar.mapFrom(self, event.pos())
         if self.title_bar.rect().contains(title_bar_pos):
             self.toggle_max_restore()
         super().mouseDoubleClickEvent(event)
 
+    def _update_hit_zones(self):
+        """窗口尺寸或阴影边距变化时重新计算四条边缘命中区域的界线
+
+        可见边缘内外各 RESIZE_MARGIN 都算边缘；开启阴影时整条阴影边距也可用于缩放。
+        """
+        frame = self.rect().marginsRemoved(self._shadow_margins())
+        m = self.RESIZE_MARGIN
+        self._hit_left = frame.left() + m
+        self._hit_top = frame.top() + m
+        self._hit_right = frame.right() + 1 - m
+        self._hit_bottom = frame.bottom() + 1 - m
+
     def _get_resize_direction(self, pos: QPoint):
-        """判断鼠标在边缘哪个方向"""
+        """判断鼠标在边缘哪个方向（返回 ResizeEdge）"""
         x, y = pos.x(), pos.y()
-        w, h = self.width(), self.height()
-        m = self.RESIZE_MARGIN
+        # 大部分移动都落在内部区域，先快速排除
+        if self._hit_left < x < self._hit_right and self._hit_top < y < self._hit_bottom:
+            return ResizeEdge.NONE
 
-        left = x <= m
-        right = x >= w - m
-        top = y <= m
-        bottom = y >= h - m
-
-        if left and top:
-            return "top_left"
-        if right and bottom:
-            return "bottom_right"
-        if right and top:
-            return "top_right"
-        if left and bottom:
-            return "bottom_left"
-        if top:
-            return "top"
-        if bottom:
-            return "bottom"
-        if left:
-            return "left"
-        if right:
-            return "right"
-        return None
+        edge = ResizeEdge.NONE
+        if x <= self._hit_left:
+            edge |= ResizeEdge.LEFT
+        elif x >= self._hit_right:
+            edge |= ResizeEdge.RIGHT
+        if y <= self._hit_top:
+            edge |= ResizeEdge.TOP
+        elif y >= self._hit_bottom:
+            edge |= ResizeEdge.BOTTOM
+        return edge
 
     def _set_cursor_by_direction(self, direction):
-        """根据方向设置鼠标光标样式"""
-        cursors = {
-            "top": Qt.SizeVerCursor,
-            "bottom": Qt.SizeVerCursor,
-            "left": Qt.SizeHorCursor,
-            "right": Qt.SizeHorCursor,
-            "top_left": Qt.SizeFDiagCursor,
-            "bottom_right": Qt.SizeFDiagCursor,
-            "top_right": Qt.SizeBDiagCursor,
-            "bottom_left": Qt.SizeBDiagCursor,
-        }
-        if direction:
-            self.setCursor(QCursor(cursors[direction]))
+        """根据方向设置鼠标光标样式，所在区域没变时不重复设置"""
+        if direction == self._hover_edge:
+            return
+        self._hover_edge = direction
+        self.setCursor(self._EDGE_CURSORS[direction])
+
+    def _update_hover(self, pos: QPoint):
+        """悬停时根据所在边缘区域更新光标"""
+        if self._resizing or self._dragging:
+            return
+        self._set_cursor_by_direction(self._get_resize_direction(pos))
+
+    def _frame_interval(self):
+        """按屏幕刷新率计算每帧间隔（毫秒）"""
+        screen = self.screen()
+        rate = screen.refreshRate() if screen else 0
+        if not rate or rate <= 0:
+            rate = self.DEFAULT_REFRESH_RATE
+        return max(1, int(1000 / rate))
+
+    def _begin_resize(self):
+        """开始缩放：启动帧定时器，outline 模式下显示虚框"""
+        self._pending_resize_pos = None
+        if self._resize_mode == self.RESIZE_MODE_OUTLINE:
+            if self._rubber_band is None:
+                self._rubber_band = QRubberBand(QRubberBand.Rectangle)
+            self._rubber_band.setGeometry(self.geometry())
+            self._rubber_band.show()
+        elif self.DEFER_BODY_LAYOUT:
+            self._freeze_body()
+        self._resize_timer.start(self._frame_interval())
+
+    def _queue_resize(self, global_pos: QPoint):
+        """缓存最新的鼠标位置，等待下一帧统一处理"""
+        self._resize_stats["events"] += 1
+        self._pending_resize_pos = global_pos
+
+    def _flush_resize(self):
+        """每帧回调：只处理最后一次缓存的位置"""
+        if self._pending_resize_pos is None:
+            return
+        global_pos = self._pending_resize_pos
+        self._pending_resize_pos = None
+        if self._resize_mode == self.RESIZE_MODE_OUTLINE:
+            self._rubber_band.setGeometry(self._calc_resize_rect(global_pos))
         else:
-            self.setCursor(Qt.ArrowCursor)
+            self._perform_resize(global_pos)
+
+    def _end_resize(self):
+        """结束缩放：提交剩余的更新，outline 模式下一次性应用最终几何"""
+        self._resize_timer.stop()
+        if self._resize_mode == self.RESIZE_MODE_OUTLINE:
+            if self._pending_resize_pos is not None:
+                self._rubber_band.setGeometry(self._calc_resize_rect(self._pending_resize_pos))
+            self._rubber_band.hide()
+            if self._rubber_band.geometry() != self.geometry():
+                self.setGeometry(self._rubber_band.geometry())
+                self._resize_stats["updates"] += 1
+        elif self._pending_resize_pos is not None:
+            self._perform_resize(self._pending_resize_pos)
+        self._pending_resize_pos = None
+        self._thaw_body()
+
+    def _freeze_body(self):
+        """用正文截图替换正文控件，缩放过程中正文不再重新布局和重绘"""
+        if self._body_snapshot is not None and self._body_snapshot.isVisible():
+            return
+        if self._body_snapshot is None:
+            self._body_snapshot = _BodySnapshot()
+        self._body_snapshot.setPixmap(self.body_widget.grab(), self.BODY_SNAPSHOT_STRETCH)
+
+        focus = QApplication.focusWidget()
+        self._body_focus = focus if focus is not None and self.body_widget.isAncestorOf(focus) else None
+
+        self.body_widget.setUpdatesEnabled(False)
+        self._main_layout.replaceWidget(self.body_widget, self._body_snapshot)
+        self.body_widget.hide()
+        self._body_snapshot.show()
+
+    def _thaw_body(self):
+        """恢复正文控件，按最终尺寸只布局一次"""
+        if self._body_snapshot is None or not self._body_snapshot.isVisible():
+            return
+        self._main_layout.replaceWidget(self._body_snapshot, self.body_widget)
+        self._body_snapshot.hide()
+        self._body_snapshot.setPixmap(None)
+        self.body_widget.show()
+        self.body_widget.setUpdatesEnabled(True)
+        if self._body_focus is not None:
+            self._body_focus.setFocus()
+            self._body_focus = None
 
     def _perform_resize(self, global_pos: QPoint):
         """执行窗口大小调整"""
+        self.setGeometry(self._calc_resize_rect(global_pos))
+        self._resize_stats["updates"] += 1
+
+    def _calc_resize_rect(self, global_pos: QPoint):
+        """根据鼠标位置计算缩放后的窗口矩形"""
         delta = global_pos - self._drag_pos
         rect = QRect(self._start_rect)
 
@@ -308,33 +860,229 @@ class MacWindow(QWidget):
         d = self._resize_dir
 
         # 水平方向调整
-        if d in ("left", "top_left", "bottom_left"):
+        if d & ResizeEdge.LEFT:
             new_width = rect.width() - dx
             if new_width < min_w:
                 dx = rect.width() - min_w
                 new_width = min_w
             rect.setX(rect.x() + dx)
             rect.setWidth(new_width)
-        elif d in ("right", "top_right", "bottom_right"):
+        elif d & ResizeEdge.RIGHT:
             new_width = rect.width() + dx
             if new_width < min_w:
                 new_width = min_w
             rect.setWidth(new_width)
 
         # 垂直方向调整
-        if d in ("top", "top_left", "top_right"):
+        if d & ResizeEdge.TOP:
             new_height = rect.height() - dy
             if new_height < min_h:
                 dy = rect.height() - min_h
                 new_height = min_h
             rect.setY(rect.y() + dy)
             rect.setHeight(new_height)
-        elif d in ("bottom", "bottom_left", "bottom_right"):
+        elif d & ResizeEdge.BOTTOM:
             new_height = rect.height() + dy
             if new_height < min_h:
                 new_height = min_h
             rect.setHeight(new_height)
 
-        self.setGeometry(rect)
+        # 吸附到附近的边（按不含阴影的可见区域）；吸附后小于最小尺寸则放弃吸附
+        margins = self._shadow_margins()
+        snapped = self._window_manager.snap_resize(self, rect.marginsRemoved(margins), d).marginsAdded(margins)
+        if snapped.width() >= min_w and snapped.height() >= min_h:
+            return snapped
+        return rect
+
+
+class _HoverTracker(QObject):
+    """应用级事件过滤器：把所有无按键的鼠标移动转发给所属的 MacWindow
+
+    Qt 会把未开启鼠标跟踪的控件上的移动事件仍然交给应用级过滤器，
+    因此只需安装一个过滤器，不必给每个子控件开启 setMouseTracking。
+    """
+
+    _instance = None
+
+    @classmethod
+    def install(cls):
+        if cls._instance is None:
+            app = QApplication.instance()
+            cls._instance = cls(app)
+            app.installEventFilter(cls._instance)
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._last = None  # 同一事件向父控件传递时只处理一次
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.MouseMove and not event.buttons() and obj.isWidgetType():
+            global_pos = event.globalPosition().toPoint()
+            key = (event.timestamp(), global_pos.x(), global_pos.y())
+            if key != self._last:
+                self._last = key
+                window = obj.window()
+                if isinstance(window, MacWindow):
+                    window._update_hover(window.mapFromGlobal(global_pos))
+        return False
+
+
+class MacTitleBar(QWidget):
+    """单控件自绘标题栏：自己绘制三个圆形按钮和省略后的标题，并自行做命中检测"""
+
+    closeClicked = Signal()
+    minimizeClicked = Signal()
+    maximizeClicked = Signal()
+
+    BUTTON_SIZE = 14
+    BUTTON_SPACING = 4
+    SIDE_MARGIN = 10
+    ROLES = ("close", "minimize", "maximize")
+
+    def __init__(self, title="", parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_StyledBackground)  # 背景仍由主题样式表绘制
+        self.setMouseTracking(True)
+        self._title = title
+        self._hover = None  # 当前悬停的按钮序号
+        self._pressed = None
+        self._elided = None  # (宽度, 省略后的文字) 缓存
+        self._font = QFont(self.font())
+        self._font.setBold(True)
+        self._font.setPixelSize(12)
+        self._button_rects = []
+        self._layout_buttons()
+
+    def setTitle(self, title):
+        self._title = title
+        self._elided = None
+        self.update()
+
+    def title(self):
+        return self._title
+
+    def buttonAt(self, pos):
+        """返回 pos 处的按钮角色，没有则返回 None"""
+        for role, rect in zip(self.ROLES, self._button_rects):
+            if rect.contains(pos):
+                return role
+        return None
+
+    def _layout_buttons(self):
+        size = self.BUTTON_SIZE
+        y = (self.height() - size) // 2
+        self._button_rects = [
+            QRect(self.SIDE_MARGIN + i * (size + self.BUTTON_SPACING), y, size, size)
+            for i in range(len(self.ROLES))
+        ]
+
+    def resizeEvent(self, event):
+        self._layout_buttons()
+        self._elided = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        for index, (role, rect) in enumerate(zip(self.ROLES, self._button_rects)):
+            color = MacTheme.color(role)
+            if index == self._hover:
+                color = color.darker(118)  # 与 darken_color(..., 0.85) 的效果一致
+            painter.setBrush(color)
+            painter.drawEllipse(rect)
+
+        # 标题居中，左右各留出按钮区域的宽度以保持对称
+        side = self.SIDE_MARGIN + len(self.ROLES) * (self.BUTTON_SIZE + self.BUTTON_SPACING)
+        text_rect = self.rect().adjusted(side, 0, -side, 0)
+        if self._elided is None or self._elided[0] != text_rect.width():
+            metrics = QFontMetrics(self._font)
+            self._elided = (text_rect.width(), metrics.elidedText(self._title, Qt.ElideRight, text_rect.width()))
+        painter.setFont(self._font)
+        painter.setPen(MacTheme.color("title_fg"))
+        painter.drawText(text_rect, Qt.AlignCenter, self._elided[1])
+
+    def _set_hover(self, index):
+        if index == self._hover:
+            return
+        self._hover = index
+        if index is not None:
+            self.setCursor(Qt.PointingHandCursor)
+        else:
+            self.unsetCursor()  # 不留下显式光标，窗口上边缘的缩放光标照常显示
+        self.update(QRect(0, 0, self._button_rects[-1].right() + 1, self.height()))
+
+    def _index_at(self, pos):
+        role = self.buttonAt(pos)
+        return None if role is None else self.ROLES.index(role)
+
+    def mouseMoveEvent(self, event):
+        self._set_hover(self._index_at(event.position().toPoint()))
+        event.ignore()  # 交给窗口处理拖动
+
+    def leaveEvent(self, event):
+        self._set_hover(None)
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        index = self._index_at(event.position().toPoint())
+        if event.button() == Qt.LeftButton and index is not None:
+            self._pressed = index
+            event.accept()
+        else:
+            event.ignore()
+
+    def mouseReleaseEvent(self, event):
+        pressed, self._pressed = self._pressed, None
+        if pressed is None:
+            event.ignore()
+            return
+        if self._index_at(event.position().toPoint()) == pressed:
+            (self.closeClicked, self.minimizeClicked, self.maximizeClicked)[pressed].emit()
+        event.accept()
+
+    def mouseDoubleClickEvent(self, event):
+        if self._index_at(event.position().toPoint()) is None:
+            event.ignore()
 
 
+class _BodySnapshot(QWidget):
+    """缩放过程中代替正文显示的截图"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pixmap = None
+        self._stretch = False
+
+    def setPixmap(self, pixmap, stretch=False):
+        self._pixmap = pixmap
+        self._stretch = stretch
+
+    def paintEvent(self, event):
+        if self._pixmap is None:
+            return
+        painter = QPainter(self)
+        if self._stretch:
+            painter.drawPixmap(self.rect(), self._pixmap)
+        else:
+            painter.drawPixmap(0, 0, self._pixmap)
+
+
+class _SnapshotOverlay(QWidget):
+    """最大化/还原动画时使用的截图浮层，只负责把截图缩放绘制到自身区域"""
+
+    def __init__(self):
+        super().__init__(None, Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._pixmap = None
+
+    def setPixmap(self, pixmap):
+        self._pixmap = pixmap
+
+    def paintEvent(self, event):
+        if self._pixmap is None:
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(self.rect(), self._pixmap)
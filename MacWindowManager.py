@@ -0,0 +1,300 @@
+import math
+from collections import defaultdict
+
+from PySide6.QtCore import QObject, QEvent, QRect, QTimer, Signal
+from PySide6.QtGui import QGuiApplication
+
+
+class _EdgeGrid:
+    """按坐标分桶的边索引：查询只扫描容差范围内的几个桶，而不是所有窗口"""
+
+    def __init__(self, cell=64):
+        self._cell = cell
+        self._buckets = defaultdict(set)  # 桶序号 -> {(key, pos, lo, hi)}
+        self._entries = {}  # key -> [(桶序号, 条目)]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def insert(self, key, edges):
+        """edges: [(坐标, 跨度起点, 跨度终点)]"""
+        self.remove(key)
+        entries = []
+        for pos, lo, hi in edges:
+            entry = (key, pos, lo, hi)
+            bucket = pos // self._cell
+            self._buckets[bucket].add(entry)
+            entries.append((bucket, entry))
+        self._entries[key] = entries
+
+    def remove(self, key):
+        for bucket, entry in self._entries.pop(key, ()):
+            items = self._buckets[bucket]
+            items.discard(entry)
+            if not items:
+                del self._buckets[bucket]
+
+    def query(self, pos, tolerance, lo, hi, exclude=None):
+        """返回与 pos 距离不超过 tolerance、且跨度与 [lo, hi] 重叠的边坐标"""
+        first = (pos - tolerance) // self._cell
+        last = (pos + tolerance) // self._cell
+        for bucket in range(first, last + 1):
+            for key, edge_pos, edge_lo, edge_hi in self._buckets.get(bucket, ()):
+                if key == exclude or abs(edge_pos - pos) > tolerance:
+                    continue
+                if edge_lo <= hi and lo <= edge_hi:
+                    yield edge_pos
+
+
+class MacWindowManager(QObject):
+    """多窗口管理：登记所有 MacWindow，拖动/缩放时吸附到屏幕边缘和其他窗口边缘，并提供平铺布局
+
+    屏幕的几何和可用区域缓存在这里，只在 Qt 的屏幕增减/几何变化信号到来时刷新，
+    拖动吸附、最大化和平铺都不必每次向平台查询。
+    """
+
+    SNAP_DISTANCE = 12  # 吸附距离（像素）
+    LAYOUTS = ("left_half", "right_half", "top_half", "bottom_half", "maximize", "grid", "columns", "rows")
+
+    screensChanged = Signal()  # 屏幕布局变化，缓存已刷新
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._windows = {}  # id -> 可见的窗口（显示期间由这里保持存活，隐藏后释放）
+        self._vertical = _EdgeGrid()  # 左右边（按 x 分桶）
+        self._horizontal = _EdgeGrid()  # 上下边（按 y 分桶）
+        self.snap_distance = self.SNAP_DISTANCE
+
+        self._screens = []  # [(QScreen, 几何, 可用区域)]，第一块是主屏幕
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.screenAdded.connect(self._on_screen_added)
+            app.screenRemoved.connect(self._refresh_screens)
+            app.primaryScreenChanged.connect(self._refresh_screens)
+            for screen in app.screens():
+                self._watch_screen(screen)
+        self._refresh_screens()
+
+    # ---------- 登记 ----------
+
+    def register(self, window):
+        key = id(window)
+        if key in self._windows:
+            return
+        window.installEventFilter(self)
+        window.destroyed.connect(lambda *_, k=key: self._forget(k))
+        if window.isVisible():
+            self._track(window)
+
+    def unregister(self, window):
+        window.removeEventFilter(self)
+        self._forget(id(window))
+
+    def windows(self):
+        """当前可见的已登记窗口"""
+        return [w for w in self._windows.values() if w.isVisible()]
+
+    def _track(self, window):
+        self._windows[id(window)] = window
+        self._index(window)
+
+    def _release(self, key):
+        # 隐藏后在下一轮事件循环再释放：关闭且没有别处引用的窗口照常回收，但不会在它自己的事件处理中途被销毁
+        window = self._windows.get(key)
+        if window is not None and not window.isVisible():
+            self._forget(key)
+
+    def _forget(self, key):
+        self._windows.pop(key, None)
+        self._vertical.remove(key)
+        self._horizontal.remove(key)
+
+    def _index(self, window):
+        key = id(window)
+        r = window.visibleGeometry()
+        left, top = r.x(), r.y()
+        right, bottom = left + r.width(), top + r.height()
+        self._vertical.insert(key, [(left, top, bottom), (right, top, bottom)])
+        self._horizontal.insert(key, [(top, left, right), (bottom, left, right)])
+
+    def eventFilter(self, obj, event):
+        # 窗口显示/移动/缩放时更新索引，隐藏（包括被接受的关闭）时移出；被忽略的关闭不会隐藏窗口
+        t = event.type()
+        if t in (QEvent.Move, QEvent.Resize, QEvent.Show):
+            if obj.isVisible():
+                self._track(obj)
+        elif t == QEvent.Hide:
+            key = id(obj)
+            self._vertical.remove(key)
+            self._horizontal.remove(key)
+            QTimer.singleShot(0, lambda k=key: self._release(k))
+        return False
+
+    # ---------- 屏幕 ----------
+
+    def _watch_screen(self, screen):
+        screen.geometryChanged.connect(self._refresh_screens)
+        screen.availableGeometryChanged.connect(self._refresh_screens)
+
+    def _on_screen_added(self, screen):
+        self._watch_screen(screen)
+        self._refresh_screens()
+
+    def _refresh_screens(self, *_):
+        self._screens = [(s, s.geometry(), s.availableGeometry()) for s in QGuiApplication.screens()]
+        self.screensChanged.emit()
+
+    def screen_at(self, point):
+        """包含 point 的屏幕，不在任何屏幕上时返回主屏幕"""
+        for screen, geometry, _ in self._screens:
+            if geometry.contains(point):
+                return screen
+        return self._screens[0][0] if self._screens else None
+
+    def available_geometry(self, screen=None):
+        """屏幕的可用区域（缓存）；screen 为 None 时取主屏幕"""
+        for s, _, area in self._screens:
+            if screen is None or s == screen:
+                return QRect(area)
+        return QRect()
+
+    def clamp_to_screens(self, rect):
+        """把 rect 完整放进一块屏幕的可用区域，用于在变化后的屏幕布局上恢复窗口
+
+        优先选与 rect 重叠最多的屏幕，完全不重叠时（例如原来的显示器已拔掉）选离它中心最近的屏幕；
+        比屏幕大时缩小到屏幕大小。
+        """
+        if not self._screens:
+            return QRect(rect)
+        best, best_overlap = None, 0
+        for _, _, area in self._screens:
+            overlap = area.intersected(rect)
+            size = 0 if overlap.isEmpty() else overlap.width() * overlap.height()
+            if size > best_overlap:
+                best, best_overlap = area, size
+        if best is None:
+            center = rect.center()
+
+            def distance(area):
+                dx = max(area.left() - center.x(), 0, center.x() - area.right())
+                dy = max(area.top() - center.y(), 0, center.y() - area.bottom())
+                return dx * dx + dy * dy
+
+            best = min((area for _, _, area in self._screens), key=distance)
+        width, height = min(rect.width(), best.width()), min(rect.height(), best.height())
+        x = min(max(rect.x(), best.x()), best.x() + best.width() - width)
+        y = min(max(rect.y(), best.y()), best.y() + best.height() - height)
+        return QRect(x, y, width, height)
+
+    # ---------- 吸附 ----------
+
+    def snap_move(self, window, rect):
+        """拖动时吸附：整体平移 rect，使其某条边对齐到附近的边"""
+        dx = self._snap_offset(window, self._vertical, (rect.x(), rect.x() + rect.width()),
+                               rect.y(), rect.y() + rect.height(), self._screen_xs(rect))
+        dy = self._snap_offset(window, self._horizontal, (rect.y(), rect.y() + rect.height()),
+                               rect.x(), rect.x() + rect.width(), self._screen_ys(rect))
+        return rect.translated(dx, dy)
+
+    def snap_resize(self, window, rect, edges):
+        """缩放时吸附：只移动正在拖动的边（edges 为 ResizeEdge 组合）"""
+        from MacWindow import ResizeEdge
+
+        left, top = rect.x(), rect.y()
+        right, bottom = left + rect.width(), top + rect.height()
+        xs, ys = self._screen_xs(rect), self._screen_ys(rect)
+        if edges & ResizeEdge.LEFT:
+            left += self._snap_offset(window, self._vertical, (left,), top, bottom, xs)
+        elif edges & ResizeEdge.RIGHT:
+            right += self._snap_offset(window, self._vertical, (right,), top, bottom, xs)
+        if edges & ResizeEdge.TOP:
+            top += self._snap_offset(window, self._horizontal, (top,), left, right, ys)
+        elif edges & ResizeEdge.BOTTOM:
+            bottom += self._snap_offset(window, self._horizontal, (bottom,), left, right, ys)
+        return QRect(left, top, right - left, bottom - top)
+
+    def _snap_offset(self, window, grid, positions, lo, hi, screen_edges):
+        """在所有候选边中找出距离最近的一条，返回需要移动的偏移量"""
+        tolerance = self.snap_distance
+        if tolerance <= 0:
+            return 0
+        best = None
+        key = id(window)
+        for pos in positions:
+            candidates = list(grid.query(pos, tolerance, lo - tolerance, hi + tolerance, exclude=key))
+            candidates.extend(e for e in screen_edges if abs(e - pos) <= tolerance)
+            for edge in candidates:
+                offset = edge - pos
+                if best is None or abs(offset) < abs(best):
+                    best = offset
+        return best or 0
+
+    def _screen_for(self, rect):
+        center = rect.center()
+        for _, geometry, area in self._screens:
+            if geometry.contains(center):
+                return area
+        return self._screens[0][2] if self._screens else QRect()
+
+    def _screen_xs(self, rect):
+        g = self._screen_for(rect)
+        return (g.x(), g.x() + g.width())
+
+    def _screen_ys(self, rect):
+        g = self._screen_for(rect)
+        return (g.y(), g.y() + g.height())
+
+    # ---------- 平铺 ----------
+
+    def tile(self, layout, windows=None, screen=None):
+        """按布局平铺窗口
+
+        left_half / right_half / top_half / bottom_half / maximize 作用于单个窗口；
+        grid / columns / rows 把多个窗口平均排列在屏幕上。
+        """
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"未知的平铺布局：{layout}")
+        windows = list(windows) if windows is not None else self.windows()
+        if not windows:
+            return
+        area = self.available_geometry(screen or windows[0].screen())
+        rects = self._layout_rects(layout, area, len(windows))
+        for window, rect in zip(windows, rects):
+            window.place(rect)
+
+    @staticmethod
+    def _layout_rects(layout, area, count):
+        x, y, w, h = area.x(), area.y(), area.width(), area.height()
+        if layout == "left_half":
+            return [QRect(x, y, w // 2, h)] * count
+        if layout == "right_half":
+            return [QRect(x + w // 2, y, w - w // 2, h)] * count
+        if layout == "top_half":
+            return [QRect(x, y, w, h // 2)] * count
+        if layout == "bottom_half":
+            return [QRect(x, y + h // 2, w, h - h // 2)] * count
+        if layout == "maximize":
+            return [QRect(area)] * count
+
+        if layout == "columns":
+            cols, rows = count, 1
+        elif layout == "rows":
+            cols, rows = 1, count
+        else:
+            cols = math.ceil(math.sqrt(count))
+            rows = math.ceil(count / cols)
+        rects = []
+        for i in range(count):
+            row, col = divmod(i, cols)
+            left = x + w * col // cols
+            top = y + h * row // rows
+            rects.append(QRect(left, top, x + w * (col + 1) // cols - left, y + h * (row + 1) // rows - top))
+        return rects
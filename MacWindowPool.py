@@ -0,0 +1,119 @@
+import time
+from collections import deque
+
+from PySide6.QtCore import QObject, QEvent, QTimer
+
+
+class MacWindowPool(QObject):
+    """MacWindow 窗口池：空闲时预先构建隐藏窗口，打开时直接取用，关闭时回收复用
+
+    用法::
+
+        pool = MacWindowPool(TodoApp, size=2)
+        pool.prewarm()
+        win = pool.acquire()
+        win.show()
+    """
+
+    MAX_SAMPLES = 100  # 保留最近多少次“打开到首次绘制”的耗时
+
+    def __init__(self, factory, size=2, max_size=None, parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._size = size  # 预热目标数量
+        self._max_size = max_size if max_size is not None else size * 2  # 回收时最多保留的空闲窗口
+        self._free = []
+        self._prewarm_scheduled = False
+        self._open_started = {}  # 窗口 -> 请求打开的时间
+        self._first_paint_ms = deque(maxlen=self.MAX_SAMPLES)
+        self._stats = {"hits": 0, "misses": 0, "prewarmed": 0, "recycled": 0}
+
+    def setSize(self, size, max_size=None):
+        """设置预热数量和回收上限"""
+        self._size = size
+        self._max_size = max_size if max_size is not None else size * 2
+        while len(self._free) > self._max_size:
+            self._free.pop().deleteLater()
+        self.prewarm()
+
+    def size(self):
+        return self._size
+
+    def available(self):
+        return len(self._free)
+
+    def prewarm(self):
+        """在事件循环空闲时逐个构建窗口，直到池满"""
+        if self._prewarm_scheduled or len(self._free) >= self._size:
+            return
+        self._prewarm_scheduled = True
+        QTimer.singleShot(0, self._prewarm_one)
+
+    def _prewarm_one(self):
+        # 每次空闲只构建一个，避免长时间阻塞事件循环
+        self._prewarm_scheduled = False
+        if len(self._free) >= self._size:
+            return
+        window = self._create()
+        window.ensurePolished()
+        window.content.layout().activate()
+        self._free.append(window)
+        self._stats["prewarmed"] += 1
+        self.prewarm()
+
+    def _create(self):
+        window = self._factory()
+        window._pool = self
+        return window
+
+    def acquire(self):
+        """取出一个已初始化的窗口（尚未显示）"""
+        started = time.perf_counter()
+        if self._free:
+            window = self._free.pop()
+            self._stats["hits"] += 1
+        else:
+            window = self._create()
+            self._stats["misses"] += 1
+        self._open_started[window] = started
+        window.installEventFilter(self)
+        self.prewarm()
+        return window
+
+    def recycle(self, window):
+        """窗口关闭时调用：重置后放回池中；超过回收上限则返回 False，窗口关闭后销毁"""
+        self._open_started.pop(window, None)
+        window.removeEventFilter(self)
+        if len(self._free) >= self._max_size:
+            window._pool = None
+            window.deleteLater()
+            return False
+        window.reset_for_reuse()
+        self._free.append(window)
+        self._stats["recycled"] += 1
+        return True
+
+    def eventFilter(self, obj, event):
+        # 只统计每次打开后的首次绘制
+        if event.type() == QEvent.Paint:
+            started = self._open_started.pop(obj, None)
+            if started is not None:
+                self._first_paint_ms.append((time.perf_counter() - started) * 1000)
+            obj.removeEventFilter(self)
+        return False
+
+    def stats(self):
+        """命中/未命中次数以及打开到首次绘制的耗时（毫秒）"""
+        samples = sorted(self._first_paint_ms)
+        stats = dict(self._stats)
+        stats["available"] = len(self._free)
+        stats["first_paint_samples"] = len(samples)
+        stats["first_paint_avg_ms"] = sum(samples) / len(samples) if samples else None
+        stats["first_paint_p50_ms"] = samples[len(samples) // 2] if samples else None
+        stats["first_paint_max_ms"] = samples[-1] if samples else None
+        return stats
+
+    def clear(self):
+        """销毁池中所有空闲窗口"""
+        while self._free:
+            self._free.pop().deleteLater()
@@ -0,0 +1,130 @@
+import os
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, QRect, QSettings, QStandardPaths, QTimer
+
+
+def _parse_rect(value):
+    """QSettings 读出的 [x, y, 宽, 高]（INI 中为字符串列表）-> QRect；格式不对时返回 None"""
+    if isinstance(value, str):
+        value = value.split(",")
+    try:
+        x, y, width, height = (int(v) for v in value)
+    except (TypeError, ValueError):
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    return QRect(x, y, width, height)
+
+
+class MacWindowState(QObject):
+    """窗口几何和最大化状态的持久化：所有窗口共用一个 QSettings（INI）文件，按键区分
+
+    MacWindow.setGeometryKey() 把窗口交给 track()：事件过滤器在移动/缩放/最大化时记下最新的状态，
+    拖动/缩放期间只更新内存，停止 SAVE_DELAY_MS 后所有窗口的修改一次写出；窗口关闭和程序退出时立即写出。
+    保存的是不含阴影边距的正常（未最大化）几何。
+    """
+
+    TRACKED_EVENTS = (QEvent.Move, QEvent.Resize, QEvent.WindowStateChange)  # 需要记录状态的事件
+
+    SAVE_DELAY_MS = 500  # 最后一次移动/缩放之后多久写盘
+    FILE_NAME = "windows.ini"
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        if path is None:
+            directory = self.default_directory()
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, self.FILE_NAME)
+        self.path = path
+        self._settings = QSettings(path, QSettings.IniFormat)
+        self._saved = {}  # 键 -> 文件中的 (几何, 是否最大化)
+        self._pending = {}  # 键 -> 尚未写出的 (几何, 是否最大化)
+        self._stats = {"requests": 0, "writes": 0}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.SAVE_DELAY_MS)
+        self._timer.timeout.connect(self.flush)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+    @staticmethod
+    def default_directory():
+        return QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or os.path.expanduser("~/.macwindow")
+
+    # ---------- 窗口 ----------
+
+    def track(self, window):
+        window.removeEventFilter(self)  # 重复设置键时不重复安装
+        window.installEventFilter(self)
+
+    def untrack(self, window):
+        window.removeEventFilter(self)
+
+    def eventFilter(self, window, event):
+        t = event.type()
+        if t in self.TRACKED_EVENTS:
+            window._save_geometry_state()
+        elif t == QEvent.Show:
+            if window._geometry_restore_pending:
+                window._geometry_restore_pending = False
+                window.restoreGeometryState()
+        elif t == QEvent.Close:
+            window._save_geometry_state()
+            self.flush()
+        return False
+
+    # ---------- 读写 ----------
+
+    def load(self, key):
+        """返回 (几何, 是否最大化)；没有保存过时返回 None"""
+        state = self._pending.get(key) or self._saved.get(key)
+        if state is None:
+            rect = _parse_rect(self._settings.value(f"{key}/geometry"))
+            if rect is None:
+                return None
+            maximized = self._settings.value(f"{key}/maximized", False) in (True, "true")
+            state = self._saved[key] = (rect, maximized)
+        return QRect(state[0]), state[1]
+
+    def save(self, key, geometry, maximized):
+        """记下 key 的最新状态；SAVE_DELAY_MS 内没有新的修改时才写出"""
+        self._stats["requests"] += 1
+        state = (QRect(geometry), bool(maximized))
+        if key not in self._pending and self._saved.get(key) == state:
+            return
+        self._pending[key] = state
+        self._timer.start()
+
+    def flush(self):
+        """立即写出所有未写出的状态"""
+        self._timer.stop()
+        if not self._pending:
+            return
+        for key, (rect, maximized) in self._pending.items():
+            self._settings.setValue(f"{key}/geometry", [rect.x(), rect.y(), rect.width(), rect.height()])
+            self._settings.setValue(f"{key}/maximized", maximized)
+        self._saved.update(self._pending)
+        self._pending.clear()
+        self._settings.sync()
+        self._stats["writes"] += 1
+
+    def remove(self, key):
+        """删除 key 保存的状态"""
+        self._pending.pop(key, None)
+        self._saved.pop(key, None)
+        self._settings.remove(key)
+        self._settings.sync()
+
+    def stats(self):
+        """保存请求数 / 实际写盘次数"""
+        return dict(self._stats)
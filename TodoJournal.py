@@ -0,0 +1,213 @@
+import json
+import os
+import queue
+import threading
+
+from PySide6.QtCore import QObject, QTimer, QStandardPaths
+
+
+class TodoJournal(QObject):
+    """待办事项持久化：每次修改追加一条 JSONL 日志，后台线程批量写盘，日志过大时压缩成快照
+
+    文件布局（同一目录下）：
+        <name>.snapshot.jsonl   首行 {"gen": 代数}，之后每行一项：[文字, 是否完成]
+        <name>.journal.jsonl    首行 {"gen": 代数}，之后是快照之后的修改记录，每行一条
+
+    只有代数与快照一致的日志才会被重放，压缩过程中异常退出也不会重复应用修改。
+    """
+
+    FLUSH_INTERVAL_MS = 200  # 缓冲的日志最多等待多久写盘
+    COMPACT_THRESHOLD = 10000  # 日志记录数超过该值时压缩成快照
+    COMPACT_BYTES = 4 * 1024 * 1024  # 或日志大小超过该值时压缩
+    LOAD_BATCH = 5000  # 加载快照时每批插入的行数
+
+    def __init__(self, directory=None, name="todo", parent=None):
+        super().__init__(parent)
+        directory = directory or self.default_directory()
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot.jsonl")
+        self.journal_path = os.path.join(directory, f"{name}.journal.jsonl")
+
+        self._model = None
+        self._buffer = []  # 还未交给写线程的日志行
+        self._records = 0  # 上次快照以来的日志记录数
+        self._bytes = 0  # 上次快照以来的日志大小（近似）
+        self._generation = 0  # 当前快照代数（加载后只由写线程修改）
+        self._closed = False  # close() 之后的修改不再记录
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="TodoJournalWriter", daemon=True)
+        self._writer.start()
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+
+    @staticmethod
+    def default_directory():
+        return QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or os.path.expanduser("~/.macwindow")
+
+    # ---------- 加载 ----------
+
+    def load(self, model):
+        """流式读取快照并重放日志，返回加载后的行数（需在 attach 之前调用）"""
+        self._generation = 0
+        texts, dones = [], []
+        for item in self._iter_lines(self.snapshot_path):
+            if isinstance(item, dict):
+                self._generation = item.get("gen", 0)
+                continue
+            texts.append(item[0])
+            dones.append(item[1])
+            if len(texts) >= self.LOAD_BATCH:
+                model.append_many(texts, dones)
+                texts, dones = [], []
+        model.append_many(texts, dones)
+
+        self._records = 0
+        self._bytes = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+        records = self._iter_lines(self.journal_path)
+        header = next(records, None)
+        if header is not None and header.get("gen") == self._generation:
+            for record in records:
+                self._replay(model, record)
+                self._records += 1
+        else:
+            records.close()
+            # 日志属于旧的快照（压缩时中断），内容已包含在快照里，重新开始
+            with open(self.journal_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"gen": self._generation}) + "\n")
+        return model.rowCount()
+
+    @staticmethod
+    def _iter_lines(path):
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # 异常退出时最后一行可能只写了一半，忽略即可
+                    continue
+
+    @staticmethod
+    def _replay(model, record):
+        op, row = record["op"], record["row"]
+        if op == "add":
+            model.insert_many(row, record["texts"], record["done"])
+        elif op == "del":
+            model.remove_rows_range(row, record["count"])
+        elif op == "set":
+            for offset, (text, done) in enumerate(zip(record["texts"], record["done"])):
+                model.set_row(row + offset, text, done)
+
+    # ---------- 记录修改 ----------
+
+    def attach(self, model):
+        """监听模型的修改信号，把每次修改追加到日志"""
+        self._model = model
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelReset.connect(self.compact)
+
+    def _on_rows_inserted(self, parent, first, last):
+        texts, dones = self._model.rows(first, last + 1)
+        self._append({"op": "add", "row": first, "texts": texts, "done": dones})
+
+    def _on_rows_removed(self, parent, first, last):
+        self._append({"op": "del", "row": first, "count": last - first + 1})
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        texts, dones = self._model.rows(first, last + 1)
+        self._append({"op": "set", "row": first, "texts": texts, "done": dones})
+
+    def _append(self, record):
+        if self._closed:
+            return
+        line = json.dumps(record, ensure_ascii=False)
+        self._buffer.append(line)
+        self._records += 1
+        self._bytes += len(line)
+        if self._records >= self.COMPACT_THRESHOLD or self._bytes >= self.COMPACT_BYTES:
+            self.compact()
+        elif not self._flush_timer.isActive():
+            self._flush_timer.start(self.FLUSH_INTERVAL_MS)
+
+    def flush(self):
+        """把缓冲的日志行交给写线程（不等待写盘完成）"""
+        if self._closed:
+            return
+        self._flush_timer.stop()
+        if self._buffer:
+            self._queue.put(("write", self._buffer))
+            self._buffer = []
+
+    def compact(self):
+        """把模型当前内容写成快照并清空日志（写盘在后台线程完成）"""
+        if self._model is None or self._closed:
+            return
+        self._flush_timer.stop()
+        self._buffer = []  # 快照已包含这些修改
+        self._records = 0
+        self._bytes = 0
+        texts, dones = self._model.rows(0, self._model.rowCount())
+        self._queue.put(("snapshot", texts, dones))
+
+    def close(self):
+        """写完所有缓冲内容并结束写线程；重复调用什么也不做"""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(("stop",))
+        self._writer.join()
+
+    # ---------- 写线程 ----------
+
+    def _write_loop(self):
+        while True:
+            task = self._queue.get()
+            kind = task[0]
+            if kind == "stop":
+                return
+            # 把已经排队的写入合并成一次 I/O
+            lines = []
+            while kind == "write":
+                lines.extend(task[1])
+                try:
+                    task = self._queue.get_nowait()
+                except queue.Empty:
+                    task = None
+                    break
+                kind = task[0]
+            if lines:
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    if f.tell() == 0:
+                        f.write(json.dumps({"gen": self._generation}) + "\n")
+                    f.write("\n".join(lines) + "\n")
+            if task is None:
+                continue
+            if task[0] == "snapshot":
+                self._write_snapshot(task[1], task[2])
+            elif task[0] == "stop":
+                return
+
+    def _write_snapshot(self, texts, dones):
+        generation = self._generation + 1
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"gen": generation}) + "\n")
+            for text, done in zip(texts, dones):
+                f.write(json.dumps([text, done], ensure_ascii=False))
+                f.write("\n")
+        os.replace(tmp_path, self.snapshot_path)
+        self._generation = generation
+        # 快照已包含之前的全部修改，日志从新的代数重新开始
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"gen": generation}) + "\n")
+
@@ -0,0 +1,609 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QApplication
+
+DoneRole = Qt.UserRole  # 完成状态（与原 QListWidgetItem 的 UserRole 保持一致）
+
+
+def group_runs(rows, limit=None):
+    """把行号分组为连续区间 [(起始行, 行数)]（按起始行升序）
+
+    给出 limit 时，区间数超过 limit 就提前返回 None。
+    """
+    runs = []
+    start = prev = None
+    for row in sorted(set(rows)):
+        if prev is None or row != prev + 1:
+            if start is not None:
+                if limit is not None and len(runs) >= limit:
+                    return None
+                runs.append((start, prev - start + 1))
+            start = row
+        prev = row
+    if start is not None:
+        if limit is not None and len(runs) >= limit:
+            return None
+        runs.append((start, prev - start + 1))
+    return runs
+
+
+class TodoListModel(QAbstractListModel):
+    """待办事项模型：按列存储（文字列表 + 完成标记字节数组 + 稳定 id 数组），不为每一项创建对象"""
+
+    # 批量操作的连续区间超过该数量时，不再逐段通知，改为一次整体通知
+    MAX_RANGED_RUNS = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._texts = []
+        self._done = bytearray()  # 每项一个字节，0 未完成 / 1 已完成
+        self._ids = array("q")  # 每项的稳定 id，行号变化时不变（供搜索索引使用）
+        self._next_id = 0
+
+    def __len__(self):
+        """行数（与 rowCount() 相同，供按行调用的代理视图使用，省去一次 Qt 接口调用）"""
+        return len(self._texts)
+
+    # ---------- Qt 模型接口 ----------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._texts)
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        # 视图布局时会对每一行调用 index()；直接判断范围，避免默认实现再回调 rowCount()
+        if 0 <= row < len(self._texts) and column == 0 and not parent.isValid():
+            return self.createIndex(row, 0)
+        return QModelIndex()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.data_at(index.row(), role)
+
+    def data_at(self, row, role=Qt.DisplayRole):
+        if row >= len(self._texts):
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._texts[row]
+        if role == DoneRole:
+            return bool(self._done[row])
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """编辑事项文字"""
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        text = str(value).strip()
+        if not text or text == self._texts[index.row()]:
+            return False
+        self.set_text(index.row(), text)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemNeverHasChildren
+
+    # ---------- 读取 ----------
+
+    def text(self, row):
+        return self._texts[row]
+
+    def is_done(self, row):
+        return bool(self._done[row])
+
+    def item_id(self, row):
+        return self._ids[row]
+
+    def ids(self):
+        return self._ids
+
+    def done_count(self):
+        return self._done.count(1)
+
+    def done_rows(self):
+        """所有已完成事项的行号"""
+        return list(compress(range(len(self._done)), self._done))
+
+    def rows(self, first, end):
+        """返回 [first, end) 范围内的 (文字列表, 完成标记列表) 副本"""
+        return self._texts[first:end], list(self._done[first:end])
+
+    # ---------- 修改 ----------
+
+    def append(self, text, done=False):
+        self.insert(len(self._texts), text, done)
+
+    def insert(self, row, text, done=False):
+        self.insert_many(row, [text], [done])
+
+    def append_many(self, texts, dones=None):
+        """批量追加，只发出一次插入通知"""
+        self.insert_many(len(self._texts), texts, dones)
+
+    def insert_many(self, row, texts, dones=None):
+        """在 row 处批量插入连续的多行，只发出一次插入通知"""
+        texts = list(texts)
+        if not texts:
+            return
+        flags = bytes(len(texts)) if dones is None else bytes(1 if d else 0 for d in dones)
+        new_ids = array("q", range(self._next_id, self._next_id + len(texts)))
+        self._next_id += len(texts)
+        self.beginInsertRows(QModelIndex(), row, row + len(texts) - 1)
+        self._texts[row:row] = texts
+        self._done[row:row] = flags
+        self._ids[row:row] = new_ids
+        self.endInsertRows()
+
+    def set_done(self, row, done):
+        value = 1 if done else 0
+        if self._done[row] == value:
+            return
+        self._done[row] = value
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [DoneRole])
+
+    def set_done_rows(self, rows, done):
+        """批量设置完成状态：每段连续区间只发出一次 dataChanged，返回实际改变的行
+
+        逐段修改并通知，收到某段通知时其余区间尚未改变（排序视图依赖这一点定位事项）。
+        """
+        value = 1 if done else 0
+        changed = [row for row in rows if self._done[row] != value]
+        if not changed:
+            return []
+        runs = group_runs(changed, limit=self.MAX_RANGED_RUNS)
+        if runs is None:
+            for row in changed:
+                self._done[row] = value
+            first, last = min(changed), max(changed)
+            self.dataChanged.emit(self.index(first), self.index(last), [DoneRole])
+            return changed
+        for start, count in runs:
+            self._done[start:start + count] = bytes([value]) * count
+            self.dataChanged.emit(self.index(start), self.index(start + count - 1), [DoneRole])
+        return changed
+
+    def toggle(self, row):
+        """切换完成状态，返回新状态"""
+        done = not self._done[row]
+        self.set_done(row, done)
+        return done
+
+    def set_text(self, row, text):
+        self._texts[row] = text
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+
+    def set_row(self, row, text, done):
+        """同时修改某行的文字和完成状态"""
+        self._texts[row] = text
+        self._done[row] = 1 if done else 0
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_row(self, row):
+        self.remove_rows_range(row, 1)
+
+    def remove_rows_range(self, row, count):
+        """删除从 row 开始的连续 count 行，只发出一次删除通知"""
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        del self._texts[row:row + count]
+        del self._done[row:row + count]
+        del self._ids[row:row + count]
+        self.endRemoveRows()
+
+    def remove_rows(self, rows):
+        """批量删除任意行：按连续区间从后往前删除，每段只发出一次通知
+
+        区间过多时（例如隔行删除上万项）逐段移动数组的代价是 O(区间数 × 行数)，
+        此时改为一次性重建各列并整体重置，保证总代价为 O(行数)。
+        """
+        runs = group_runs(rows, limit=self.MAX_RANGED_RUNS)
+        if runs is not None:
+            for start, count in reversed(runs):
+                self.remove_rows_range(start, count)
+            return
+        keep = bytearray(b"\x01") * len(self._texts)
+        for row in rows:
+            keep[row] = 0
+        self.beginResetModel()
+        self._texts = list(compress(self._texts, keep))
+        self._done = bytearray(compress(self._done, keep))
+        self._ids = array("q", compress(self._ids, keep))
+        self.endResetModel()
+
+    def insert_rows(self, rows, texts, dones=None):
+        """在任意位置批量插入（remove_rows 的逆操作）
+
+        rows 为插入后各项所在的行号，须升序且与 texts 一一对应；区间过多时同样改为整体重建。
+        """
+        texts = list(texts)
+        dones = bytes(len(texts)) if dones is None else bytes(1 if d else 0 for d in dones)
+        runs = group_runs(rows, limit=self.MAX_RANGED_RUNS)
+        if runs is not None:
+            offset = 0
+            for start, count in runs:
+                self.insert_many(start, texts[offset:offset + count], dones[offset:offset + count])
+                offset += count
+            return
+        inserted = bytearray(len(self._texts) + len(texts))
+        for row in rows:
+            inserted[row] = 1
+        old_texts, old_done, old_ids = iter(self._texts), iter(self._done), iter(self._ids)
+        new_texts, new_done = iter(texts), iter(dones)
+        new_ids = iter(range(self._next_id, self._next_id + len(texts)))
+        self._next_id += len(texts)
+        self.beginResetModel()
+        self._texts = [next(new_texts) if flag else next(old_texts) for flag in inserted]
+        self._done = bytearray(next(new_done) if flag else next(old_done) for flag in inserted)
+        self._ids = array("q", (next(new_ids) if flag else next(old_ids) for flag in inserted))
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._texts = []
+        self._done = bytearray()
+        self._ids = array("q")
+        self.endResetModel()
+
+
+class TodoFilterModel(QAbstractListModel):
+    """过滤/排序视图：只保存可见行对应的源行号，过滤和排序时不复制、不重建任何事项
+
+    未设置过滤条件和排序时直接透传源模型的行号和信号。源模型的增删改会被转换成
+    本视图上对应行的细粒度通知；排序时事项的位置随排序键的变化移动（beginMoveRows，选择不丢失）。
+    同一个源模型可以挂多个视图，每个视图有自己的过滤条件和排序。
+    """
+
+    # 排序视图一次增删改的行数或区间数超过该数量时，不再逐行通知，改为一次整体重置
+    MAX_INCREMENTAL_ROWS = 64
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self._source = source
+        self._accept = None  # 过滤条件 accept(源行号) -> bool；None 表示不过滤
+        self._sort_key = None  # 排序键 key(源行号)；None 表示按源模型的顺序
+        self._rows = None  # 可见的源行号（按视图顺序）；None 表示与源模型一一对应
+
+        source.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        source.rowsInserted.connect(self._on_rows_inserted)
+        source.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        source.rowsRemoved.connect(self._on_rows_removed)
+        source.dataChanged.connect(self._on_data_changed)
+        source.modelAboutToBeReset.connect(self.beginResetModel)
+        source.modelReset.connect(self._on_model_reset)
+        self._pending_remove = None
+
+    def sourceModel(self):
+        return self._source
+
+    # ---------- 行号映射 ----------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._source.rowCount() if self._rows is None else len(self._rows)
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        count = len(self._source) if self._rows is None else len(self._rows)
+        if 0 <= row < count and column == 0 and not parent.isValid():
+            return self.createIndex(row, 0)
+        return QModelIndex()
+
+    def source_row(self, row):
+        return row if self._rows is None else self._rows[row]
+
+    def map_from_source(self, source_row):
+        """源行号 -> 本视图行号，不可见时返回 -1（排序视图需要线性查找）"""
+        if self._rows is None:
+            return source_row
+        if self._sort_key is not None:
+            try:
+                return self._rows.index(source_row)
+            except ValueError:
+                return -1
+        pos = bisect_left(self._rows, source_row)
+        if pos < len(self._rows) and self._rows[pos] == source_row:
+            return pos
+        return -1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self._source.data_at(self.source_row(index.row()), role)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        return self._source.setData(self._source.index(self.source_row(index.row())), value, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return self._source.flags(self._source.index(self.source_row(index.row())))
+
+    # ---------- 过滤和排序 ----------
+
+    def setFilter(self, accept, rows=None):
+        """设置过滤条件；rows 为已算好的可见源行号（升序），省略时按 accept 扫描一遍"""
+        self.beginResetModel()
+        self._accept = accept
+        self._rows = self._visible_rows(rows if accept is not None else None)
+        self.endResetModel()
+
+    def isFiltered(self):
+        return self._accept is not None
+
+    def setSortKey(self, key):
+        """设置排序键 key(源行号)，None 恢复为源模型的顺序；键相同的事项保持源模型中的先后"""
+        self.beginResetModel()
+        self._sort_key = key
+        # 已过滤时只重排当前可见的行，不再对全部事项执行一遍过滤条件
+        self._rows = self._visible_rows(sorted(self._rows) if self._accept is not None else None)
+        self.endResetModel()
+
+    def sortKey(self):
+        return self._sort_key
+
+    def _accepts(self, row):
+        return self._accept is None or self._accept(row)
+
+    def _order(self, row):
+        return self._sort_key(row), row
+
+    def _visible_rows(self, rows=None):
+        """按当前过滤条件和排序计算可见的源行号；既不过滤也不排序时返回 None"""
+        if self._accept is None and self._sort_key is None:
+            return None
+        if rows is not None:
+            rows = list(rows)
+        elif self._accept is None:
+            rows = list(range(self._source.rowCount()))
+        else:
+            rows = [r for r in range(self._source.rowCount()) if self._accept(r)]
+        if self._sort_key is not None:
+            rows.sort(key=self._order)
+        return rows
+
+    def _position(self, source_row):
+        """source_row 在当前可见行中应处的位置"""
+        rows = self._rows
+        if self._sort_key is None:
+            return bisect_left(rows, source_row)
+        key = self._order(source_row)
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._order(rows[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # ---------- 源模型信号 ----------
+
+    def _on_rows_about_to_be_inserted(self, parent, first, last):
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def _on_rows_inserted(self, parent, first, last):
+        if self._rows is None:
+            self.endInsertRows()
+            return
+        count = last - first + 1
+        accepted = [r for r in range(first, last + 1) if self._accepts(r)]
+        if self._sort_key is None:
+            pos = bisect_left(self._rows, first)
+            rows = self._rows
+            for i in range(pos, len(rows)):
+                rows[i] += count
+            if accepted:
+                self.beginInsertRows(QModelIndex(), pos, pos + len(accepted) - 1)
+                rows[pos:pos] = accepted
+                self.endInsertRows()
+            return
+        # 排序视图：新插入的行分散在各处
+        self._rows = rows = [r + count if r >= first else r for r in self._rows]
+        if len(accepted) > self.MAX_INCREMENTAL_ROWS:
+            self.beginResetModel()
+            rows.extend(accepted)
+            rows.sort(key=self._order)
+            self.endResetModel()
+            return
+        for source_row in accepted:
+            pos = self._position(source_row)
+            self.beginInsertRows(QModelIndex(), pos, pos)
+            rows.insert(pos, source_row)
+            self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            return
+        if self._sort_key is None:
+            # 源行号升序，被删除的源区间在本视图中也是连续的一段
+            start = bisect_left(self._rows, first)
+            end = bisect_right(self._rows, last)
+            self._pending_remove = (start, end)
+            if end > start:
+                self.beginRemoveRows(QModelIndex(), start, end - 1)
+            return
+        # 排序视图：被删除的行可能分成多段，源行还在时逐段从后往前移除
+        positions = [i for i, r in enumerate(self._rows) if first <= r <= last]
+        runs = group_runs(positions, limit=self.MAX_INCREMENTAL_ROWS)
+        if runs is None:
+            self._pending_remove = "reset"
+            self.beginResetModel()
+            return
+        rows = self._rows
+        for start, count in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), start, start + count - 1)
+            del rows[start:start + count]
+            self.endRemoveRows()
+
+    def _on_rows_removed(self, parent, first, last):
+        if self._rows is None:
+            self.endRemoveRows()
+            return
+        count = last - first + 1
+        if self._sort_key is not None:
+            reset = self._pending_remove == "reset"
+            self._pending_remove = None
+            self._rows = [r - count if r > last else r for r in self._rows if not first <= r <= last]
+            if reset:
+                self.endResetModel()
+            return
+        start, end = self._pending_remove
+        self._pending_remove = None
+        rows = self._rows
+        del rows[start:end]
+        for i in range(start, len(rows)):
+            rows[i] -= count
+        if end > start:
+            self.endRemoveRows()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        if self._rows is None:
+            self.dataChanged.emit(self.index(first), self.index(last), roles)
+            return
+        if last - first + 1 > self.MAX_INCREMENTAL_ROWS:
+            self.beginResetModel()
+            self._rows = self._visible_rows()
+            self.endResetModel()
+            return
+        if self._sort_key is None:
+            self._on_filtered_range_changed(first, last, roles)
+            return
+        if last > first:
+            self._on_range_changed(first, last)
+            return
+        row = self.map_from_source(first)
+        accepted = self._accepts(first)
+        if row >= 0 and not accepted:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+        elif row < 0 and accepted:
+            pos = self._position(first)
+            self.beginInsertRows(QModelIndex(), pos, pos)
+            self._rows.insert(pos, first)
+            self.endInsertRows()
+        elif row >= 0:
+            index = self.index(self._move_to_order(row, first))
+            self.dataChanged.emit(index, index, roles)
+
+    def _on_filtered_range_changed(self, first, last, roles):
+        """未排序的过滤视图：改变的源行在本视图中是连续的一段，按连续区间成段移出和放入"""
+        rows = self._rows
+        start = bisect_left(rows, first)
+        end = bisect_right(rows, last)
+        visible = [r for r in range(first, last + 1) if self._accepts(r)]
+        shown = set(visible)
+        for pos, count in reversed(group_runs(i for i in range(start, end) if rows[i] not in shown)):
+            self.beginRemoveRows(QModelIndex(), pos, pos + count - 1)
+            del rows[pos:pos + count]
+            self.endRemoveRows()
+        kept = set(rows[start:bisect_right(rows, last, start)])
+        for pos, count in group_runs(start + i for i, r in enumerate(visible) if r not in kept):
+            self.beginInsertRows(QModelIndex(), pos, pos + count - 1)
+            rows[pos:pos] = visible[pos - start:pos - start + count]
+            self.endInsertRows()
+        if kept:
+            self.dataChanged.emit(self.index(start), self.index(start + len(visible) - 1), roles)
+
+    def _on_range_changed(self, first, last):
+        """排序视图中多行同时改变：这些行的排序键都可能已失效，先全部移出再按新键放回"""
+        rows = self._rows
+        for start, count in reversed(group_runs(i for i, r in enumerate(rows) if first <= r <= last)):
+            self.beginRemoveRows(QModelIndex(), start, start + count - 1)
+            del rows[start:start + count]
+            self.endRemoveRows()
+        for source_row in range(first, last + 1):
+            if self._accepts(source_row):
+                pos = self._position(source_row)
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                rows.insert(pos, source_row)
+                self.endInsertRows()
+
+    def _move_to_order(self, row, source_row):
+        """排序键改变后把 row 移到正确的位置，返回新行号"""
+        rows = self._rows
+        del rows[row]
+        pos = self._position(source_row)
+        rows.insert(row, source_row)
+        if pos == row:
+            return row
+        # beginMoveRows 的目标位置按移动前的行号计算
+        if self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), pos + 1 if pos > row else pos):
+            del rows[row]
+            rows.insert(pos, source_row)
+            self.endMoveRows()
+            return pos
+        return row
+
+    def _on_model_reset(self):
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+
+class TodoItemDelegate(QStyledItemDelegate):
+    """待办事项绘制：已完成项用删除线 + 灰色，字体按原字体缓存共享"""
+
+    DONE_COLOR = QColor("gray")
+    PADDING = 4
+
+    _strike_fonts = {}  # 字体 key -> 带删除线的字体（所有视图共享）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._size_hint = None  # (字体 key, 尺寸)
+
+    @classmethod
+    def _strike_font(cls, font):
+        key = font.key()
+        strike = cls._strike_fonts.get(key)
+        if strike is None:
+            strike = QFont(font)
+            strike.setStrikeOut(True)
+            cls._strike_fonts[key] = strike
+        return strike
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+
+        # 背景（选中/悬停）仍交给样式绘制，文字自己画
+        self.initStyleOption(option, index)
+        text = option.text
+        option.text = ""
+        style.drawControl(QStyle.CE_ItemViewItem, option, painter, widget)
+
+        done = index.data(DoneRole)
+        painter.save()
+        painter.setFont(self._strike_font(option.font) if done else option.font)
+        if done:
+            painter.setPen(self.DONE_COLOR)
+        elif option.state & QStyle.State_Selected:
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+        rect = option.rect.adjusted(self.PADDING, 0, -self.PADDING, 0)
+        painter.drawText(rect, Qt.AlignVCenter | Qt.AlignLeft | Qt.TextSingleLine,
+                         option.fontMetrics.elidedText(text, Qt.ElideRight, rect.width()))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        # 所有行高度一致，只按字体计算一次
+        key = option.font.key()
+        if self._size_hint is None or self._size_hint[0] != key:
+            height = QFontMetrics(option.font).height() + self.PADDING * 2
+            self._size_hint = (key, QSize(0, height))
+        return self._size_hint[1]
@@ -0,0 +1,170 @@
+from collections import defaultdict
+
+from PySide6.QtCore import Qt, QTimer
+
+
+class TodoSearchIndex:
+    """待办事项的增量搜索索引（n-gram 倒排表）
+
+    索引以事项的稳定 id 为键，随模型的增、删、改增量更新，不会整体重建。
+    查询时先用 n-gram 求交集得到候选，再做一次子串校验。
+    background=True 时已有数据在事件循环空闲时分批建立索引，建好之前查询退化为线性扫描。
+    """
+
+    GRAM = 3
+    BUILD_CHUNK = 1000  # 后台建立索引时每批处理的事项数
+    # 一次删除超过该数量时，不逐项从倒排表中移除，删除后在后台重建
+    REBUILD_REMOVED = 5000
+
+    def __init__(self, model, background=False):
+        self._model = model
+        self._grams = defaultdict(set)  # n-gram -> {id}
+        self._texts = {}  # id -> 小写文字
+        self._pending = None  # 后台建立索引时尚未处理的 (id, 文字)
+        self._removed = set()  # 后台建立索引期间被删除的 id
+        self._rebuild_after_remove = False
+        self._build(background)
+
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(lambda parent, first, last: self._remove_rows(first, last))
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelReset.connect(self._rebuild)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def isReady(self):
+        return self._pending is None
+
+    def _build(self, background):
+        model = self._model
+        if background and model.rowCount():
+            texts, _ = model.rows(0, model.rowCount())
+            scheduled = self._pending is not None
+            self._pending = list(zip(model.ids(), texts))
+            if not scheduled:
+                QTimer.singleShot(0, self._build_chunk)
+        else:
+            self._pending = None
+            self._add_rows(0, model.rowCount() - 1)
+
+    def _build_chunk(self):
+        if self._pending is None:
+            return
+        chunk = self._pending[-self.BUILD_CHUNK:]
+        del self._pending[-self.BUILD_CHUNK:]
+        for item_id, text in chunk:
+            # 建立期间已被增量更新处理过（新增/修改）或已删除的事项跳过
+            if item_id not in self._texts and item_id not in self._removed:
+                self._add(item_id, text)
+        if self._pending:
+            QTimer.singleShot(0, self._build_chunk)
+        else:
+            self._pending = None
+            self._removed.clear()
+
+    @classmethod
+    def _grams_of(cls, text):
+        n = cls.GRAM
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _add(self, item_id, text):
+        text = text.lower()
+        self._texts[item_id] = text
+        grams = self._grams
+        for gram in self._grams_of(text):
+            grams[gram].add(item_id)
+
+    def _remove(self, item_id):
+        if self._pending is not None:
+            self._removed.add(item_id)
+        text = self._texts.pop(item_id, None)
+        if text is None:
+            return
+        grams = self._grams
+        for gram in self._grams_of(text):
+            ids = grams.get(gram)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del grams[gram]
+
+    def _on_rows_inserted(self, parent, first, last):
+        if last - first + 1 <= self.BUILD_CHUNK:
+            self._add_rows(first, last)
+            return
+        # 大批量插入（导入、加载）放到后台分批建立索引，期间查询退化为线性扫描
+        texts, _ = self._model.rows(first, last + 1)
+        pending = list(zip(self._model.ids()[first:last + 1], texts))
+        if self._pending is None:
+            self._pending = pending
+            QTimer.singleShot(0, self._build_chunk)
+        else:
+            self._pending.extend(pending)
+
+    def _add_rows(self, first, last):
+        model = self._model
+        for row in range(first, last + 1):
+            self._add(model.item_id(row), model.text(row))
+
+    def _remove_rows(self, first, last):
+        if last - first + 1 > self.REBUILD_REMOVED:
+            self._rebuild_after_remove = True
+            return
+        model = self._model
+        for row in range(first, last + 1):
+            self._remove(model.item_id(row))
+
+    def _on_rows_removed(self, parent, first, last):
+        if self._rebuild_after_remove:
+            self._rebuild_after_remove = False
+            self._rebuild()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        # 只有文字变化才需要重新索引，完成状态变化不影响
+        if roles and Qt.DisplayRole not in roles and Qt.EditRole not in roles:
+            return
+        model = self._model
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            item_id = model.item_id(row)
+            text = model.text(row)
+            if self._texts.get(item_id) != text.lower():
+                self._remove(item_id)
+                self._add(item_id, text)
+
+    def _rebuild(self):
+        # 模型整体重置（例如大批量删除）后在后台重新建立
+        self._grams.clear()
+        self._texts.clear()
+        self._removed.clear()
+        self._build(background=True)
+
+    def search(self, query):
+        """返回匹配 query 的源行号列表（升序）"""
+        query = query.lower()
+        if self._pending is not None:
+            # 索引还没建好，直接扫描模型
+            model = self._model
+            return [row for row in range(model.rowCount()) if query in model.text(row).lower()]
+        if len(query) < self.GRAM:
+            # 查询太短无法使用 n-gram，直接扫描小写文字缓存
+            matched = {i for i, text in self._texts.items() if query in text}
+        else:
+            postings = []
+            for gram in self._grams_of(query):
+                ids = self._grams.get(gram)
+                if not ids:
+                    return []
+                postings.append(ids)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for ids in postings[1:]:
+                candidates &= ids
+                if not candidates:
+                    return []
+            texts = self._texts
+            matched = {i for i in candidates if query in texts[i]}
+        if not matched:
+            return []
+        return [row for row, item_id in enumerate(self._model.ids()) if item_id in matched]
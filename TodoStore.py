@@ -0,0 +1,59 @@
+import weakref
+
+from PySide6.QtCore import QObject
+
+from TodoModel import TodoListModel
+from TodoSearch import TodoSearchIndex
+from TodoUndo import TodoUndoStack
+
+
+class TodoStore(QObject):
+    """一份待办列表的数据：模型、持久化日志、搜索索引和撤销栈
+
+    多个 TodoApp 窗口可以挂在同一个 store 上，每个窗口只持有自己的过滤/排序视图（TodoFilterModel），
+    事项只保存一份；一个窗口中的修改经由模型的行级通知同步到其余窗口，不需要整体刷新。
+    store 不属于任何一个窗口（由各窗口引用），最后一个窗口离开时写出缓冲的修改；
+    日志由创建它的一方关闭（例如 aboutToQuit），store 不关闭日志。
+    """
+
+    def __init__(self, journal=None, parent=None):
+        super().__init__(parent)
+        self.model = TodoListModel(self)
+
+        # 持久化：先加载已有数据，再记录之后的每次修改
+        self.journal = journal
+        self.loaded = 0
+        if journal is not None:
+            self.loaded = journal.load(self.model)
+            journal.attach(self.model)
+
+        # 搜索索引在空闲时分批建立，之后随模型增量更新
+        self.search_index = TodoSearchIndex(self.model, background=True)
+
+        # 撤销/重做由所有窗口共享：命令记录的是源行号，与各窗口的过滤和排序无关
+        self.undo_stack = TodoUndoStack(self.model, self)
+
+        self._views = {}  # id -> 挂在本 store 上的窗口（弱引用）
+
+    def attach(self, view):
+        key = id(view)
+        if key in self._views:
+            return
+        self._views[key] = weakref.ref(view, lambda _, k=key: self._forget(k))
+        view.destroyed.connect(lambda *_, k=key: self._forget(k))
+
+    def detach(self, view):
+        self._forget(id(view))
+
+    def views(self):
+        views = (ref() for ref in self._views.values())
+        return [view for view in views if view is not None]
+
+    def _forget(self, key):
+        if self._views.pop(key, None) is not None and not self._views:
+            self.flush()
+
+    def flush(self):
+        """把缓冲的修改交给日志的写线程"""
+        if self.journal is not None:
+            self.journal.flush()
@@ -0,0 +1,359 @@
+import csv
+import json
+import os
+import re
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# 导入时识别的列名/字段名
+TEXT_KEYS = ("text", "title", "name", "content", "task", "事项", "内容", "标题")
+DONE_KEYS = ("done", "completed", "complete", "checked", "status", "完成", "状态")
+DONE_VALUES = {"1", "true", "yes", "y", "x", "done", "completed", "complete", "✓", "✔", "完成", "已完成", "是"}
+
+FORMATS = {".csv": "csv", ".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def transfer_format(path):
+    """按扩展名判断文件格式（csv / json / jsonl）"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"不支持的文件格式：{ext or path}")
+    return FORMATS[ext]
+
+
+def _is_done(value):
+    if isinstance(value, str):
+        return value.strip().lower() in DONE_VALUES
+    return bool(value)
+
+
+def _record(item):
+    """把一条导入数据转换为 (文字, 是否完成)，无法识别时返回 None"""
+    if isinstance(item, str):
+        text, done = item, False
+    elif isinstance(item, (list, tuple)) and item:
+        text, done = item[0], item[1] if len(item) > 1 else False
+    elif isinstance(item, dict):
+        text = next((item[k] for k in TEXT_KEYS if k in item), None)
+        done = next((item[k] for k in DONE_KEYS if k in item), False)
+    else:
+        return None
+    if text is None:
+        return None
+    text = str(text).strip()
+    if not text:
+        return None
+    return text, _is_done(done)
+
+
+# ---------- 读取 ----------
+
+def iter_csv(f):
+    """逐行读取 CSV；首行是列名时按列名找文字和完成状态列，否则取前两列"""
+    reader = csv.reader(f)
+    text_col, done_col = 0, 1
+    for row in reader:
+        if not row:
+            continue
+        names = [cell.strip().lower() for cell in row]
+        if reader.line_num == 1 and any(name in TEXT_KEYS for name in names):
+            text_col = next(i for i, name in enumerate(names) if name in TEXT_KEYS)
+            done_col = next((i for i, name in enumerate(names) if name in DONE_KEYS), None)
+            continue
+        if text_col >= len(row):
+            continue
+        done = row[done_col] if done_col is not None and done_col < len(row) else False
+        record = _record((row[text_col], done))
+        if record is not None:
+            yield record
+
+
+def iter_jsonl(f):
+    """逐行读取 JSON Lines"""
+    for line in f:
+        line = line.strip()
+        if line:
+            record = _record(json.loads(line))
+            if record is not None:
+                yield record
+
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def iter_json_array(f, chunk_size=64 * 1024):
+    """增量解析 JSON 数组：每次只读入一块，逐个元素解码，不把整个文件读进内存"""
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size).lstrip()
+    if not buf.startswith("["):
+        raise ValueError("JSON 文件应为数组，或使用 .jsonl 格式")
+    pos, eof = 1, False
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        item = None
+        if pos < len(buf):
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+        # 元素可能被块边界截断：读入下一块后重新解码
+        if item is None or (end == len(buf) and not eof):
+            if eof:
+                raise ValueError("JSON 数组不完整")
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+        pos = end
+        record = _record(item)
+        if record is not None:
+            yield record
+
+
+def iter_records(f, fmt):
+    """按格式逐条产生 (文字, 是否完成)"""
+    if fmt == "csv":
+        return iter_csv(f)
+    if fmt == "jsonl":
+        return iter_jsonl(f)
+    # .json 也兼容每行一个对象的写法
+    head = f.read(1)
+    while head and head.isspace():
+        head = f.read(1)
+    f.seek(0)
+    return iter_json_array(f) if head == "[" else iter_jsonl(f)
+
+
+# ---------- 写出 ----------
+
+class _Echo:
+    """csv.writer 的目标：直接返回格式化好的一行"""
+
+    def write(self, line):
+        return line
+
+
+def iter_export(texts, dones, fmt):
+    """逐行产生导出文件的内容"""
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(("text", "done"))
+        for text, done in zip(texts, dones):
+            yield writer.writerow((text, 1 if done else 0))
+        return
+    # 直接拼接每一行，不为每项创建字典
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    if fmt == "jsonl":
+        for text, done in zip(texts, dones):
+            yield '{"text": ' + encode(text) + (', "done": true}\n' if done else ', "done": false}\n')
+    else:
+        yield "["
+        separator = "\n"
+        for text, done in zip(texts, dones):
+            yield separator + '{"text": ' + encode(text) + (', "done": true}' if done else ', "done": false}')
+            separator = ",\n"
+        yield "\n]\n"
+
+
+# ---------- 分批任务 ----------
+
+class TodoTransfer(QObject):
+    """导入/导出任务的公共部分：在事件循环中分批执行，每批不超过 TIME_BUDGET_MS，可随时取消"""
+
+    TIME_BUDGET_MS = 12  # 每批最多占用事件循环的时间
+    CHECK_EVERY = 256  # 每处理多少行检查一次时间
+
+    progress = Signal(int, float, float)  # 已处理行数，进度（0~1），每秒行数
+    finished = Signal(int)  # 完成，总行数
+    canceled = Signal(int)  # 已取消，取消前处理的行数
+    failed = Signal(str)  # 出错，错误信息
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.format = transfer_format(path)
+        self.count = 0
+        self._started = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    def start(self):
+        self._started = time.perf_counter()
+        try:
+            self._open()
+        except (OSError, ValueError) as e:
+            self._fail(e)
+            return
+        self._timer.start()
+
+    def isRunning(self):
+        return self._timer.isActive()
+
+    def cancel(self):
+        if not self._timer.isActive():
+            return
+        self._timer.stop()
+        self._close(commit=False)
+        self.canceled.emit(self.count)
+
+    def elapsed(self):
+        return time.perf_counter() - self._started if self._started else 0.0
+
+    def rate(self):
+        elapsed = self.elapsed()
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def _step(self):
+        deadline = time.perf_counter() + self.TIME_BUDGET_MS / 1000
+        try:
+            done = self._run(deadline)
+        except (OSError, ValueError, csv.Error) as e:
+            self._fail(e)
+            return
+        if done:
+            self._timer.stop()
+            self._close(commit=True)
+            self.finished.emit(self.count)
+        else:
+            self.progress.emit(self.count, self._fraction(), self.rate())
+
+    def _fail(self, error):
+        self._timer.stop()
+        self._close(commit=False)
+        self.failed.emit(str(error))
+
+    # 子类重写以下方法；默认实现是一个没有内容、第一批就完成的任务
+    def _open(self):
+        """开始前打开文件等资源（出错时抛出 OSError / ValueError）"""
+
+    def _run(self, deadline):
+        """处理一批，全部完成时返回 True"""
+        return True
+
+    def _fraction(self):
+        """已完成的比例（0~1）"""
+        return 0.0
+
+    def _close(self, commit):
+        """结束时释放资源；commit 为 False 表示取消或出错"""
+
+
+class TodoImporter(TodoTransfer):
+    """流式读取 CSV / JSON 文件，分批追加到 TodoListModel 末尾
+
+    每次插入都会让视图重新布局（代价与总行数成正比），所以解析出的事项先缓存，
+    攒够 max(MIN_BATCH, 当前行数 × BATCH_GROWTH) 条再插入一次，整个导入的插入次数只有 O(log n)。
+    """
+
+    MIN_BATCH = 5000
+    BATCH_GROWTH = 0.25
+
+    inserted = Signal(int, int)  # 插入了一批：起始行，行数
+
+    def __init__(self, model, path, parent=None):
+        super().__init__(path, parent)
+        self._model = model
+        self._file = None
+        self._records = None
+        self._size = 0
+        self._texts = []  # 已解析、尚未插入的事项
+        self._dones = []
+
+    def _open(self):
+        self._size = os.path.getsize(self.path)
+        self._file = open(self.path, encoding="utf-8-sig", newline="")
+        self._records = iter_records(self._file, self.format)
+
+    def _run(self, deadline):
+        texts, dones = self._texts, self._dones
+        check = self.CHECK_EVERY
+        finished = True
+        parsed = 0
+        for text, done in self._records:
+            texts.append(text)
+            dones.append(done)
+            parsed += 1
+            if parsed % check == 0 and time.perf_counter() >= deadline:
+                finished = False
+                break
+        self.count += parsed
+        if finished or len(texts) >= max(self.MIN_BATCH, self._model.rowCount() * self.BATCH_GROWTH):
+            self._insert()
+        return finished
+
+    def _insert(self):
+        # 每批只插入一次，模型和视图各只收到一次通知
+        if self._texts:
+            first = self._model.rowCount()
+            self._model.append_many(self._texts, self._dones)
+            self.inserted.emit(first, len(self._texts))
+            self._texts, self._dones = [], []
+
+    def _fraction(self):
+        if not self._size or self._file is None:
+            return 0.0
+        # 文本层会预读，用底层二进制流的位置估算进度
+        return min(self._file.buffer.tell() / self._size, 1.0)
+
+    def _close(self, commit):
+        # 取消时已解析的行也插入模型（不回滚）
+        self._insert()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._records = None
+
+
+class TodoExporter(TodoTransfer):
+    """把 TodoListModel 的内容分批写入文件；先写临时文件，完成后再替换目标文件"""
+
+    def __init__(self, model, path, parent=None):
+        super().__init__(path, parent)
+        # 只复制列的引用列表，不生成文档内容；之后对模型的修改不影响这次导出
+        self._texts, self._dones = model.rows(0, model.rowCount())
+        self._tmp_path = path + ".part"
+        self._file = None
+        self._chunks = None
+
+    def _open(self):
+        self._file = open(self._tmp_path, "w", encoding="utf-8", newline="")
+        self._chunks = iter_export(self._texts, self._dones, self.format)
+
+    def _run(self, deadline):
+        write = self._file.write
+        check = self.CHECK_EVERY
+        lines = 0
+        for chunk in self._chunks:
+            write(chunk)
+            lines += 1
+            if lines % check == 0 and time.perf_counter() >= deadline:
+                break
+        else:
+            self.count = len(self._texts)
+            return True
+        self.count = min(self.count + lines, len(self._texts))
+        return False
+
+    def _fraction(self):
+        total = len(self._texts)
+        return self.count / total if total else 1.0
+
+    def _close(self, commit):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._chunks = None
+        if commit:
+            os.replace(self._tmp_path, self.path)
+        else:
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,205 @@
+import sys
+from array import array
+from collections import deque
+
+from PySide6.QtCore import QObject, Signal
+
+from TodoModel import group_runs
+
+
+class TodoCommand:
+    """一次可撤销的列表操作
+
+    行号按连续区间压缩存放（起始行, 行数交替排列的 array）；只有当前处于“已删除”状态的事项才保存文字。
+    kind:
+        add     事项已插入；撤销时删除（此时才保存文字以便重做）
+        remove  事项已删除（保存文字和完成状态）；撤销时按原行号插回
+        done    完成状态已设为 value；撤销时恢复为相反状态
+    """
+
+    __slots__ = ("kind", "runs", "texts", "dones", "value", "label", "merge_key", "size")
+
+    def __init__(self, kind, rows, label, texts=None, dones=None, value=False, merge_key=None):
+        self.kind = kind
+        self.runs = array("q")
+        for start, count in group_runs(rows):
+            self.runs.append(start)
+            self.runs.append(count)
+        self.texts = texts
+        self.dones = bytes(1 if d else 0 for d in dones) if dones is not None else None
+        self.value = value
+        self.label = label
+        self.merge_key = merge_key
+        self.size = self._measure()
+
+    def rows(self):
+        runs = self.runs
+        for i in range(0, len(runs), 2):
+            yield from range(runs[i], runs[i] + runs[i + 1])
+
+    def row_count(self):
+        return sum(self.runs[1::2])
+
+    def _measure(self):
+        """估算占用的内存（字节）"""
+        size = 120 + self.runs.itemsize * len(self.runs)
+        if self.texts is not None:
+            size += sys.getsizeof(self.texts) + sum(map(sys.getsizeof, self.texts)) + len(self.dones)
+        return size
+
+    def merge(self, other):
+        """把同一来源的后续插入合并进来（例如同一次导入的多批追加）
+
+        只合并插在已有行之后的插入，这样已记录的行号不会因为合并而失效。
+        """
+        if self.kind != "add" or other.kind != "add" or self.merge_key is None or self.merge_key != other.merge_key:
+            return False
+        runs, more = self.runs, other.runs
+        if not runs or not more or more[0] < runs[-2] + runs[-1]:
+            return False
+        if runs[-2] + runs[-1] == more[0]:
+            # 紧接在末尾：直接延长最后一段
+            runs[-1] += more[1]
+            more = more[2:]
+        runs.extend(more)
+        self.size = self._measure()
+        return True
+
+    # ---------- 执行 ----------
+
+    def undo(self, model):
+        if self.kind == "add":
+            self._take(model)
+        elif self.kind == "remove":
+            self._put(model)
+        else:
+            model.set_done_rows(list(self.rows()), not self.value)
+
+    def redo(self, model):
+        if self.kind == "add":
+            self._put(model)
+        elif self.kind == "remove":
+            self._take(model)
+        else:
+            model.set_done_rows(list(self.rows()), self.value)
+
+    def _take(self, model):
+        # 删除前保存文字和完成状态
+        rows = list(self.rows())
+        self.texts = [model.text(row) for row in rows]
+        self.dones = bytes(1 if model.is_done(row) else 0 for row in rows)
+        model.remove_rows(rows)
+        self.size = self._measure()
+
+    def _put(self, model):
+        model.insert_rows(list(self.rows()), self.texts, self.dones)
+        self.texts = self.dones = None
+        self.size = self._measure()
+
+
+class TodoUndoStack(QObject):
+    """待办列表的撤销/重做栈，总内存超过上限时丢弃最早的命令
+
+    命令记录的是行号，必须在修改模型的同时按顺序 push，撤销/重做也只能按栈的顺序进行。
+    """
+
+    MEMORY_LIMIT = 32 * 1024 * 1024  # 撤销栈和重做栈合计的内存上限（字节）
+
+    changed = Signal()
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self._undo = deque()
+        self._redo = []
+        self._cost = 0  # 两个栈中命令的内存合计
+        self._limit = self.MEMORY_LIMIT
+        self._evicted = 0
+
+    def setMemoryLimit(self, limit):
+        self._limit = limit
+        self._evict()
+        self.changed.emit()
+
+    def memoryLimit(self):
+        return self._limit
+
+    def memoryUsage(self):
+        return self._cost
+
+    def canUndo(self):
+        return bool(self._undo)
+
+    def canRedo(self):
+        return bool(self._redo)
+
+    def undoText(self):
+        return self._undo[-1].label if self._undo else ""
+
+    def redoText(self):
+        return self._redo[-1].label if self._redo else ""
+
+    def stats(self):
+        return {"undo": len(self._undo), "redo": len(self._redo), "bytes": self._cost,
+                "limit": self._limit, "evicted": self._evicted}
+
+    # ---------- 记录 ----------
+
+    def push(self, command):
+        """记录一条已经执行过的命令；返回 False 表示命令超过内存上限，无法撤销"""
+        self._clear_redo()
+        top = self._undo[-1] if self._undo else None
+        before = top.size if top is not None else 0
+        if top is not None and top.merge(command):
+            self._cost += top.size - before
+            command = top
+        else:
+            self._undo.append(command)
+            self._cost += command.size
+        self._evict()
+        self.changed.emit()
+        return bool(self._undo) and self._undo[-1] is command
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._cost = 0
+        self.changed.emit()
+
+    # ---------- 撤销/重做 ----------
+
+    def undo(self):
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        self._cost -= command.size
+        command.undo(self._model)
+        self._cost += command.size
+        self._redo.append(command)
+        self._evict()
+        self.changed.emit()
+        return command
+
+    def redo(self):
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        self._cost -= command.size
+        command.redo(self._model)
+        self._cost += command.size
+        self._undo.append(command)
+        self._evict()
+        self.changed.emit()
+        return command
+
+    def _clear_redo(self):
+        for command in self._redo:
+            self._cost -= command.size
+        self._redo.clear()
+
+    def _evict(self):
+        # 先丢弃最早的撤销命令，再丢弃最远的重做命令
+        while self._cost > self._limit and (self._undo or self._redo):
+            command = self._undo.popleft() if self._undo else self._redo.pop(0)
+            self._cost -= command.size
+            self._evicted += 1
@@ -0,0 +1,121 @@
+"""启动到窗口首次绘制的耗时：冷启动（每次新进程）与单实例热启动（转发给运行中的实例）
+
+    python benchmarks/bench_launch.py [--rounds 5] [--apps hello,todo] [--output result.json]
+
+耗时从 fork 子进程之前算起（通过 MACWINDOW_LAUNCH_T0 传给 MacLauncher），包括解释器启动和模块导入。
+运行期间使用临时的 XDG_DATA_HOME，不会读写真实的待办数据。
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAUNCHER = os.path.join(ROOT, "MacLauncher.py")
+
+
+def launch(args, env, wait_exit=True):
+    """启动 MacLauncher，读取它打印的第一行 JSON 报告；返回 (报告, 进程)"""
+    env = dict(env, MACWINDOW_LAUNCH_T0=repr(time.time()))
+    process = subprocess.Popen([sys.executable, LAUNCHER, *args, "--report"], cwd=ROOT, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    report = None
+    for line in process.stdout:
+        if line.startswith("{"):
+            report = json.loads(line)
+            break
+    if wait_exit:
+        process.wait(timeout=30)
+    return report, process
+
+
+def stop(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def summary(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {"samples": 0}
+    return {
+        "samples": len(samples),
+        "p50_ms": round(samples[len(samples) // 2], 1),
+        "min_ms": round(samples[0], 1),
+        "max_ms": round(samples[-1], 1),
+    }
+
+
+def bench_cold(app, rounds, env):
+    """每轮一个新进程（--standalone，不监听也不转发）"""
+    samples = []
+    for _ in range(rounds):
+        report, process = launch([app, "--standalone"], env, wait_exit=False)
+        stop(process)
+        if report is not None:
+            samples.append(report["window_ms"])
+    return summary(samples)
+
+
+def bench_warm(apps, rounds, env):
+    """先启动一个主实例，之后每次启动都只转发参数，由主实例从窗口池中打开窗口"""
+    report, primary = launch([apps[0]], env, wait_exit=False)
+    results = {}
+    try:
+        time.sleep(0.5)  # 等主实例在首帧之后补满窗口池
+        for app in apps:
+            samples = []
+            for _ in range(rounds):
+                report, _ = launch([app], env)
+                if report is not None and report.get("mode") == "warm":
+                    samples.append(report["window_ms"])
+            results[app] = summary(samples)
+        subprocess.run([sys.executable, LAUNCHER, "--quit"], cwd=ROOT, env=env, timeout=30,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        primary.wait(timeout=10)
+    finally:
+        if primary.poll() is None:
+            stop(primary)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--apps", default="hello,todo", help="逗号分隔：hello / login / todo")
+    parser.add_argument("--output", help="把结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+    apps = args.apps.split(",")
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    check = subprocess.run([sys.executable, LAUNCHER, "--stats"], cwd=ROOT, env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if check.returncode == 0:
+        sys.exit("已有 MacLauncher 实例在运行，先关闭它（python MacLauncher.py --quit）")
+
+    with tempfile.TemporaryDirectory() as directory:
+        env["XDG_DATA_HOME"] = directory
+        results = {
+            "benchmark": "launch",
+            "rounds": args.rounds,
+            "cold": {app: bench_cold(app, args.rounds, env) for app in apps},
+            "warm": bench_warm(apps, args.rounds, env),
+        }
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""登录验证期间界面响应性基准
+
+分别在界面线程内联验证、以及通过 AuthRunner 在线程池中验证，期间用 5ms 的定时器测量事件循环的停顿。
+
+    python benchmarks/bench_login.py [--rounds 5] [--iterations 200000] [--output result.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QTimer, QEventLoop  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from LoginAuth import AuthRunner, FileCredentialStore  # noqa: E402
+
+TICK_MS = 5
+
+
+class TickMonitor:
+    """记录定时器相邻两次触发的间隔，间隔越大说明事件循环被阻塞得越久"""
+
+    def __init__(self):
+        self.gaps = []
+        self._last = None
+        self._timer = QTimer()
+        self._timer.setInterval(TICK_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.gaps.append((now - self._last) * 1000)
+        self._last = now
+
+    def start(self):
+        self.gaps = []
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._tick()
+
+    def summary(self):
+        gaps = sorted(self.gaps)
+        if not gaps:
+            return {"ticks": 0}
+        return {
+            "ticks": len(gaps),
+            "max_gap_ms": round(gaps[-1], 2),
+            "p95_gap_ms": round(gaps[int(len(gaps) * 0.95) - 1 if len(gaps) > 1 else 0], 2),
+            "p50_gap_ms": round(gaps[len(gaps) // 2], 2),
+        }
+
+
+def pump(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def bench_inline(store, rounds, monitor):
+    """旧做法：在界面线程直接验证（每次验证之间让事件循环跑一下）"""
+    monitor.start()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        QTimer.singleShot(0, lambda: store.authenticate("admin", "123456"))
+        pump(TICK_MS * 2)
+    elapsed = time.perf_counter() - started
+    monitor.stop()
+    return dict(monitor.summary(), total_ms=round(elapsed * 1000, 1))
+
+
+def bench_runner(store, rounds, monitor):
+    """AuthRunner：验证在线程池中进行"""
+    runner = AuthRunner(store)
+    results = []
+    loop = QEventLoop()
+    runner.succeeded.connect(lambda username: (results.append(True), loop.quit()))
+    runner.failed.connect(lambda username: (results.append(False), loop.quit()))
+    runner.errored.connect(lambda message: (results.append(None), loop.quit()))
+    monitor.start()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        runner.start("admin", "123456")
+        loop.exec()
+        pump(TICK_MS * 2)
+    elapsed = time.perf_counter() - started
+    monitor.stop()
+    runner.waitForDone()
+    return dict(monitor.summary(), total_ms=round(elapsed * 1000, 1), all_ok=all(results))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=FileCredentialStore.ITERATIONS)
+    parser.add_argument("--output", help="把结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    with tempfile.TemporaryDirectory() as directory:
+        store = FileCredentialStore(os.path.join(directory, "credentials.json"), iterations=args.iterations)
+        started = time.perf_counter()
+        store.authenticate("admin", "123456")  # 首次调用会创建凭据文件
+        single_ms = (time.perf_counter() - started) * 1000
+
+        monitor = TickMonitor()
+        results = {
+            "benchmark": "login",
+            "iterations": args.iterations,
+            "rounds": args.rounds,
+            "single_verify_ms": round(single_ms, 1),
+            "inline": bench_inline(store, args.rounds, monitor),
+            "runner": bench_runner(store, args.rounds, monitor),
+        }
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""MacWindow / LoginWindow / TodoApp 的构建、交互和绘制基准（offscreen 平台）
+
+    python benchmarks/bench_window.py [--quick] [--output result.json]
+
+所有指标都是越小越好；时间单位为毫秒或微秒，内存单位为 KB。
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import Qt, QPoint, QPointF, QEvent, QTimer, QEventLoop  # noqa: E402
+from PySide6.QtGui import QMouseEvent  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+PAINT_SIZES = ((400, 300), (800, 600), (1280, 800), (1920, 1080))
+
+
+def pump(ms=0):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def mouse_event(kind, window, pos, buttons=Qt.LeftButton, button=Qt.NoButton):
+    global_pos = window.mapToGlobal(pos)
+    return QMouseEvent(kind, QPointF(pos), QPointF(global_pos), button, buttons, Qt.NoModifier)
+
+
+# ---------- 构建 ----------
+
+def window_factories():
+    from MacWindow import MacWindow
+    from demo2_login import LoginWindow
+    from demo3_todo import TodoApp
+    from LoginAuth import FileCredentialStore
+
+    credentials = os.path.join(tempfile.mkdtemp(), "credentials.json")
+    return {
+        "MacWindow": MacWindow,
+        "LoginWindow": lambda: LoginWindow(FileCredentialStore(credentials)),
+        "TodoApp": TodoApp,
+    }
+
+
+def bench_construct(name, factory, count):
+    """构建 count 个窗口（含样式和布局），返回单个窗口的耗时和 Python 内存分配"""
+    factory().deleteLater()  # 预热：导入、样式表编译等一次性开销不计入
+    pump()
+    gc.collect()
+    windows, samples = [], []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(count):
+        started = time.perf_counter()
+        window = factory()
+        window.ensurePolished()
+        window.content.layout().activate()
+        samples.append((time.perf_counter() - started) * 1000)
+        windows.append(window)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    for window in windows:
+        window.deleteLater()
+    pump()
+    return {
+        f"construct.{name}.p50_ms": percentile(samples, 0.5),
+        f"construct.{name}.py_alloc_kb": allocated / count / 1024,
+    }
+
+
+# ---------- 鼠标事件流 ----------
+
+def bench_resize_stream(events):
+    """从右下角拖动缩放：mouseMoveEvent 只缓存位置，_perform_resize 才真正改变几何"""
+    from MacWindow import MacWindow
+
+    window = MacWindow()
+    window.setGeometry(100, 100, 800, 600)
+    window.show()
+    pump(20)
+    corner = QPoint(window.width() - 2, window.height() - 2)
+    window.mousePressEvent(mouse_event(QEvent.MouseButtonPress, window, corner, Qt.LeftButton, Qt.LeftButton))
+    window._resize_timer.stop()  # 由基准自己驱动每一帧
+
+    moves = [corner + QPoint(i % 200, (i * 7) % 150) for i in range(events)]
+    started = time.perf_counter()
+    for pos in moves:
+        window.mouseMoveEvent(mouse_event(QEvent.MouseMove, window, pos))
+    move_us = (time.perf_counter() - started) / events * 1e6
+
+    frames = max(1, events // 10)
+    samples = []
+    for i in range(frames):
+        global_pos = window._drag_pos + QPoint(i % 200, (i * 7) % 150)
+        started = time.perf_counter()
+        window._perform_resize(global_pos)
+        QApplication.sendPostedEvents()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    window.mouseReleaseEvent(mouse_event(QEvent.MouseButtonRelease, window, corner, Qt.NoButton, Qt.LeftButton))
+    window.close()
+    window.deleteLater()
+    pump()
+    return {
+        "resize.move_event_us": move_us,
+        "resize.perform_p50_ms": percentile(samples, 0.5),
+        "resize.perform_p95_ms": percentile(samples, 0.95),
+    }
+
+
+def bench_drag_stream(events):
+    """拖动标题栏移动窗口（每个事件都会做一次吸附查询）"""
+    from MacWindow import MacWindow
+
+    window = MacWindow()
+    window.setGeometry(100, 100, 800, 600)
+    window.show()
+    pump(20)
+    title = QPoint(window.width() // 2, window.TITLE_BAR_HEIGHT // 2)
+    window.mousePressEvent(mouse_event(QEvent.MouseButtonPress, window, title, Qt.LeftButton, Qt.LeftButton))
+    started = time.perf_counter()
+    for i in range(events):
+        window.mouseMoveEvent(mouse_event(QEvent.MouseMove, window, title + QPoint(i % 300, i % 200)))
+    move_us = (time.perf_counter() - started) / events * 1e6
+    window.mouseReleaseEvent(mouse_event(QEvent.MouseButtonRelease, window, title, Qt.NoButton, Qt.LeftButton))
+    window.close()
+    window.deleteLater()
+    pump()
+    return {"drag.move_event_us": move_us}
+
+
+def bench_hover_stream(events):
+    """无按键移动：边缘检测和光标更新"""
+    from MacWindow import MacWindow
+
+    window = MacWindow()
+    window.setGeometry(100, 100, 800, 600)
+    window.show()
+    pump(20)
+    points = [QPoint((i * 37) % window.width(), (i * 53) % window.height()) for i in range(events)]
+    started = time.perf_counter()
+    for pos in points:
+        window._update_hover(pos)
+    hover_us = (time.perf_counter() - started) / events * 1e6
+    window.close()
+    window.deleteLater()
+    pump()
+    return {"hover.update_us": hover_us}
+
+
+# ---------- 最大化/还原 ----------
+
+def bench_toggle_max(cycles):
+    """完整的最大化 + 还原循环：墙钟时间（含动画时长）和期间占用的 CPU 时间"""
+    from MacWindow import MacWindow
+
+    window = MacWindow()
+    window.setGeometry(100, 100, 800, 600)
+    window.show()
+    pump(20)
+    wall, cpu = [], []
+    for _ in range(cycles):
+        started, started_cpu = time.perf_counter(), time.process_time()
+        for _ in range(2):
+            window.toggle_max_restore()
+            while window._is_animating:
+                pump(5)
+        wall.append((time.perf_counter() - started) * 1000)
+        cpu.append((time.process_time() - started_cpu) * 1000)
+    window.close()
+    window.deleteLater()
+    pump()
+    return {
+        "maximize.cycle_ms": percentile(wall, 0.5),
+        "maximize.cycle_cpu_ms": percentile(cpu, 0.5),
+    }
+
+
+# ---------- 绘制 ----------
+
+def bench_paint(repeat):
+    """不同尺寸下整窗重绘的耗时：默认样式表、带阴影、最大化
+
+    最大化的窗口先经 toggle_max_restore() 进入最大化状态，再改成各个尺寸（offscreen 屏幕只有 800x800）。
+    """
+    from MacWindow import MacWindow
+
+    results = {}
+    variants = (("qss", False, False), ("shadow", True, False), ("qss_max", False, True))
+    for label, shadow, maximized in variants:
+        window = MacWindow(min_size=(100, 100))
+        window.setWindowShadow(shadow)
+        window.show()
+        if maximized:
+            window.toggle_max_restore()
+            pump(window.ANIMATION_DURATION + 100)
+        for w, h in PAINT_SIZES:
+            window.resize(w, h)
+            pump(10)
+            window.repaint()  # 第一次绘制会建立缓存，不计入
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                window.repaint()
+                samples.append((time.perf_counter() - started) * 1000)
+            results[f"paint.{w}x{h}.{label}_ms"] = percentile(samples, 0.5)
+        window.close()
+        window.deleteLater()
+        pump()
+    return results
+
+
+def run(quick=False):
+    """运行全部窗口基准，返回 {指标名: 数值}"""
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    scale = 1 if quick else 4
+    metrics = {}
+    for name, factory in window_factories().items():
+        metrics.update(bench_construct(name, factory, 5 * scale))
+    metrics.update(bench_resize_stream(500 * scale))
+    metrics.update(bench_drag_stream(500 * scale))
+    metrics.update(bench_hover_stream(2000 * scale))
+    metrics.update(bench_toggle_max(1 if quick else 3))
+    metrics.update(bench_paint(10 * scale))
+    return {name: round(value, 4) for name, value in metrics.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="减少重复次数，快速跑一遍")
+    parser.add_argument("--output", help="把结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    metrics = run(args.quick)
+    text = json.dumps(metrics, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return metrics
+
+
+if __name__ == "__main__":
+    main()
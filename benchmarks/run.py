@@ -0,0 +1,115 @@
+"""运行全部基准，并与保存的基线比较
+
+    python benchmarks/run.py                      # 运行并与 benchmarks/baseline.json 比较
+    python benchmarks/run.py --update-baseline    # 用本次结果覆盖基线
+    python benchmarks/run.py --quick --output result.json
+
+指标都是越小越好。比基线慢 THRESHOLD 以上、且差值超过噪声下限的指标记为回退，有回退时退出码为 1。
+基线与机器有关，换机器后先用 --update-baseline 重新生成。
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import bench_login
+import bench_window
+
+from PySide6 import __version__ as PYSIDE_VERSION
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+THRESHOLD = 0.25  # 允许的相对变慢比例
+# 按后缀的绝对差下限，小于此值视为噪声（按顺序匹配第一个）；事件循环停顿受定时器精度影响，下限取一个 tick
+NOISE_FLOOR = {"_gap_ms": bench_login.TICK_MS, "_ms": 0.05, "_us": 1.0, "_kb": 4.0}
+
+
+def login_metrics(quick):
+    """登录基准只取和界面响应性有关的指标（内联验证的停顿本来就大，不作为回退依据）"""
+    result = bench_login.main(["--rounds", "2" if quick else "5", "--iterations", "50000"])
+    return {
+        "login.single_verify_ms": result["single_verify_ms"],
+        "login.runner.max_gap_ms": result["runner"]["max_gap_ms"],
+        "login.runner.p95_gap_ms": result["runner"]["p95_gap_ms"],
+    }
+
+
+def noise_floor(name):
+    for suffix, floor in NOISE_FLOOR.items():
+        if name.endswith(suffix):
+            return floor
+    return 0.0
+
+
+def compare(metrics, baseline, threshold):
+    """返回 [(指标, 基线, 本次, 相对变化, 是否回退)]，只比较两边都有的指标"""
+    rows = []
+    for name, value in metrics.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = (value - base) / base if base else 0.0
+        regressed = value > base * (1 + threshold) and value - base > noise_floor(name)
+        rows.append((name, base, value, change, regressed))
+    return rows
+
+
+def print_report(rows):
+    width = max((len(row[0]) for row in rows), default=10)
+    for name, base, value, change, regressed in rows:
+        flag = "  <-- 回退" if regressed else ""
+        print(f"{name:<{width}}  {base:>10.3f}  {value:>10.3f}  {change:>+7.1%}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="减少重复次数，快速跑一遍")
+    parser.add_argument("--output", help="把本次结果写入 JSON 文件")
+    parser.add_argument("--baseline", default=BASELINE, help="基线文件（默认 benchmarks/baseline.json）")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="判定回退的相对变慢比例")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果覆盖基线")
+    args = parser.parse_args(argv)
+
+    metrics = bench_window.run(args.quick)
+    metrics.update(login_metrics(args.quick))
+    result = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pyside": PYSIDE_VERSION,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM", ""),
+            "quick": args.quick,
+        },
+        "metrics": metrics,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"\n基线已更新：{args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n没有基线文件 {args.baseline}，先运行 --update-baseline")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["metrics"]
+    rows = compare(metrics, baseline, args.threshold)
+    print(f"\n{'指标':<20}  {'基线':>10}  {'本次':>10}  {'变化':>7}")
+    print_report(rows)
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} 项指标回退（阈值 {args.threshold:.0%}）")
+        return 1
+    print(f"\n没有回退（阈值 {args.threshold:.0%}）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,12 +12,14 @@ class MyApp(MacWindow):
 
         layout = QVBoxLayout()
         label = QLabel("🍎 这里是仿 Mac 的窗口框架！")
-        label.setMouseTracking(True)
         label.setAlignment(Qt.AlignCenter)
         layout.addWidget(label)
 
         self.setContentLayout(layout)
 
+        # 开启窗口阴影（九宫格位图，只生成一次）
+        self.setWindowShadow(True)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -1,21 +1,56 @@
 import sys
 
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QApplication, QVBoxLayout, QLineEdit, QPushButton, QMessageBox
 )
 
+from LoginAuth import AuthRunner, FileCredentialStore
+from MacTheme import MacTheme
 from MacWindow import MacWindow  # 你封装的窗口类
 
+# 登录窗口的样式，注册到应用级主题中统一编译
+LOGIN_STYLE = """
+    QLineEdit[macStyle="loginInput"] {
+        border: 1px solid $border;
+        border-radius: 6px;
+        padding: 0 10px;
+        font-size: 14px;
+        color: $text;
+        background-color: $input_bg;
+    }
+    QLineEdit[macStyle="loginInput"]:focus {
+        border-color: #8ec354;
+        background-color: $input_focus_bg;
+    }
+    QPushButton#loginButton {
+        background-color: #a6d785;
+        color: #2d4a11;
+        border: none;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 14px;
+    }
+    QPushButton#loginButton:hover {
+        background-color: #8ec354;
+    }
+    QPushButton#loginButton[busy="true"] {
+        background-color: #d3ebc2;
+        color: #6b8a4f;
+    }
+"""
+MacTheme.register_style("LoginWindow", LOGIN_STYLE)
+
 
 class LoginWindow(MacWindow):
-    def __init__(self):
+    def __init__(self, backend=None):
         super().__init__()
 
         self.setWindowTitle("登录")
         self.resize(400, 280)
         self.setMinimumSize(300, 250)
-        self.title_label.setText("  登录系统  ")
+        self.setTitle("登录系统")
 
         layout = QVBoxLayout()
         layout.setSpacing(15)
@@ -26,7 +61,7 @@ class LoginWindow(MacWindow):
         self.username_input.setText("admin")
         self.username_input.setFixedHeight(36)
         self.username_input.setPlaceholderText("请输入用户名")
-        self.username_input.setStyleSheet(self._input_style())
+        self.username_input.setProperty("macStyle", "loginInput")
 
         # 密码输入，默认值123456
         self.password_input = QLineEdit()
@@ -34,26 +69,15 @@ class LoginWindow(MacWindow):
         self.password_input.setEchoMode(QLineEdit.Password)
         self.password_input.setFixedHeight(36)
         self.password_input.setPlaceholderText("请输入密码")
-        self.password_input.setStyleSheet(self._input_style())
+        self.password_input.setProperty("macStyle", "loginInput")
 
         # 登录按钮，浅绿色
         self.login_btn = QPushButton("登录")
+        self.login_btn.setObjectName("loginButton")
         self.login_btn.setCursor(Qt.PointingHandCursor)
         self.login_btn.setFixedHeight(36)
-        self.login_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #a6d785;
-                color: #2d4a11;
-                border: none;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #8ec354;
-            }
-        """)
         self.login_btn.clicked.connect(self.handle_login)
+        self.password_input.returnPressed.connect(self.handle_login)
 
         layout.addWidget(self.username_input)
         layout.addWidget(self.password_input)
@@ -61,31 +85,39 @@ class LoginWindow(MacWindow):
 
         self.setContentLayout(layout)
 
-    def _input_style(self):
-        return """
-            QLineEdit {
-                border: 1px solid #bbb;
-                border-radius: 6px;
-                padding: 0 10px;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border-color: #8ec354;
-            }
-        """
+        # 凭据校验（加盐哈希，耗时数百毫秒）放到线程池中执行，界面保持响应
+        self.auth = AuthRunner(backend or FileCredentialStore(), self)
+        self.auth.busyChanged.connect(self._set_busy)
+        self.auth.succeeded.connect(lambda username: QMessageBox.information(self, "登录成功", "欢迎回来！"))
+        self.auth.failed.connect(lambda username: QMessageBox.warning(self, "登录失败", "用户名或密码错误！"))
+        self.auth.errored.connect(lambda message: QMessageBox.warning(self, "登录失败", message))
+        self.auth.timedOut.connect(lambda: QMessageBox.warning(self, "登录失败", "验证超时，请稍后重试"))
+        QShortcut(QKeySequence.Cancel, self, self.auth.cancel)
 
     def handle_login(self):
+        # 验证进行中再次点击按钮表示取消
+        if self.auth.isBusy():
+            self.auth.cancel()
+            return
         username = self.username_input.text().strip()
         password = self.password_input.text().strip()
+        self.auth.start(username, password)
 
-        if username == "admin" and password == "123456":
-            QMessageBox.information(self, "登录成功", "欢迎回来！")
-        else:
-            QMessageBox.warning(self, "登录失败", "用户名或密码错误！")
+    def _set_busy(self, busy):
+        """验证期间禁用输入框，按钮显示进行中（再次点击或按 Esc 取消）"""
+        self.username_input.setEnabled(not busy)
+        self.password_input.setEnabled(not busy)
+        self.login_btn.setText("验证中...（点击取消）" if busy else "登录")
+        self.login_btn.setProperty("busy", busy)
+        self.login_btn.style().unpolish(self.login_btn)
+        self.login_btn.style().polish(self.login_btn)
+        if not busy:
+            self.password_input.setFocus()
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     win = LoginWindow()
+    app.aboutToQuit.connect(win.auth.waitForDone)
     win.show()
     sys.exit(app.exec())
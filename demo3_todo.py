@@ -1,60 +1,137 @@
 import sys
 
-from PySide6.QtCore import Qt, QPoint
+from PySide6.QtCore import Qt, QPoint, QModelIndex, QTimer
+from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QApplication, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
-    QListWidget, QListWidgetItem, QLabel, QMenu
+    QListView, QLabel, QAbstractItemView, QFileDialog
 )
 
+from MacMenu import MenuItem, SEPARATOR
+from MacTheme import MacTheme
 from MacWindow import MacWindow
+from TodoJournal import TodoJournal
+from TodoModel import TodoFilterModel, TodoItemDelegate
+from TodoStore import TodoStore
+from TodoUndo import TodoCommand
+
+# 待办窗口的样式（右键菜单使用共享的 MacMenu 样式），注册到应用级主题中统一编译
+TODO_STYLE = """
+    QLineEdit#todoInput, QLineEdit#todoSearch {
+        border: 0.5px solid $border;
+        border-radius: 4px;
+        padding: 0 12px;
+        font-size: 15px;
+        color: $text;
+        background-color: $input_bg;
+    }
+    QLineEdit#todoInput:focus, QLineEdit#todoSearch:focus {
+        border-color: #4caf50;
+        background-color: $input_focus_bg;
+    }
+    QPushButton#todoAddButton {
+        background-color: #4caf50;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        font-size: 15px;
+        font-weight: 600;
+        padding: 8px 15px;
+    }
+    QPushButton#todoAddButton:hover {
+        background-color: #3a9d3a;
+    }
+    QPushButton#todoAddButton:pressed {
+        background-color: #357a34;
+    }
+    QListView#todoList {
+        border: 0.5px solid $soft_border;
+        border-radius: 4px;
+        padding: 6px;
+        font-size: 15px;
+        color: $text;
+        background-color: $list_bg;
+    }
+    QLabel#todoStatus {
+        color: $muted_text;
+        font-size: 13px;
+    }
+"""
+MacTheme.register_style("TodoApp", TODO_STYLE)
+
+# 右键菜单：所有待办窗口共享，第一次右键时才构建，之后每次只刷新文字和可用状态
+# 输入框菜单的目标是输入框本身
+MacWindow.defineMenu("todo.input", [
+    MenuItem("撤销", "undo", enabled=lambda c: c.target.isUndoAvailable()),
+    MenuItem("重做", "redo", enabled=lambda c: c.target.isRedoAvailable()),
+    SEPARATOR,
+    MenuItem("剪切", "cut", enabled=lambda c: c.target.hasSelectedText()),
+    MenuItem("复制", "copy", enabled=lambda c: c.target.hasSelectedText()),
+    MenuItem("粘贴", "paste"),
+    MenuItem("全选", "selectAll", enabled=lambda c: bool(c.target.text())),
+])
+
+# 列表菜单的目标是 TodoApp；index / selected / single / bulk 由 show_context_menu 传入
+MacWindow.defineMenu("todo.list", [
+    MenuItem("编辑该事项", lambda c: c.target.todo_list.edit(c.index), visible=lambda c: c.single),
+    MenuItem("删除该事项", lambda c: c.target.delete_item(c.index), visible=lambda c: c.single),
+    MenuItem(lambda c: f"完成所选（{len(c.selected)}）", lambda c: c.target.set_selected_done(True),
+             visible=lambda c: c.bulk),
+    MenuItem(lambda c: f"取消完成所选（{len(c.selected)}）", lambda c: c.target.set_selected_done(False),
+             visible=lambda c: c.bulk),
+    MenuItem(lambda c: f"删除所选（{len(c.selected)}）", "delete_selected", visible=lambda c: c.bulk),
+    SEPARATOR,
+    MenuItem("清除已完成", "clear_completed", enabled=lambda c: c.target.todo_model.done_count() > 0),
+    SEPARATOR,
+    MenuItem(lambda c: f"撤销{c.target.undo_stack.undoText()}", "undo",
+             enabled=lambda c: c.target.undo_stack.canUndo()),
+    MenuItem(lambda c: f"重做{c.target.undo_stack.redoText()}", "redo",
+             enabled=lambda c: c.target.undo_stack.canRedo()),
+    SEPARATOR,
+    MenuItem("导入...", "choose_import_file", enabled=lambda c: c.target.transfer is None),
+    MenuItem("导出...", "choose_export_file", enabled=lambda c: c.target.transfer is None),
+    MenuItem("取消导入/导出", "cancel_transfer", visible=lambda c: c.target.transfer is not None),
+    SEPARATOR,
+    MenuItem("显示全部", lambda c: c.target.setDoneFilter(None), checked=lambda c: c.target.doneFilter() is None),
+    MenuItem("只显示未完成", lambda c: c.target.setDoneFilter(False),
+             checked=lambda c: c.target.doneFilter() is False),
+    MenuItem("只显示已完成", lambda c: c.target.setDoneFilter(True), checked=lambda c: c.target.doneFilter() is True),
+    SEPARATOR,
+    MenuItem("按添加顺序", lambda c: c.target.setSortOrder("manual"),
+             checked=lambda c: c.target.sortOrder() == "manual"),
+    MenuItem("按名称排序", lambda c: c.target.setSortOrder("text"), checked=lambda c: c.target.sortOrder() == "text"),
+    MenuItem("未完成在前", lambda c: c.target.setSortOrder("pending"),
+             checked=lambda c: c.target.sortOrder() == "pending"),
+    SEPARATOR,
+    MenuItem("新建视图窗口", "open_view"),
+])
 
 
 class CustomLineEdit(QLineEdit):
     def contextMenuEvent(self, event):
-        menu = QMenu(self)
-        menu.setStyleSheet("""
-            QMenu {
-                background-color: #fff;
-                border: 1px solid #ccc;
-                border-radius: 0px;
-                padding: 4px 0;
-                font-size: 14px;
-                color: #333;
-            }
-            QMenu::item {
-                padding: 6px 20px;
-            }
-            QMenu::item:selected {
-                background-color: #4caf50;
-                color: white;
-            }
-        """)
-        undo_action = menu.addAction("撤销")
-        redo_action = menu.addAction("重做")
-        menu.addSeparator()
-        cut_action = menu.addAction("剪切")
-        copy_action = menu.addAction("复制")
-        paste_action = menu.addAction("粘贴")
-        select_all_action = menu.addAction("全选")
-
-        undo_action.triggered.connect(self.undo)
-        redo_action.triggered.connect(self.redo)
-        cut_action.triggered.connect(self.cut)
-        copy_action.triggered.connect(self.copy)
-        paste_action.triggered.connect(self.paste)
-        select_all_action.triggered.connect(self.selectAll)
-
-        menu.exec(event.globalPos())
+        window = self.window()
+        if isinstance(window, MacWindow):
+            window.execMenu("todo.input", event.globalPos(), target=self)
+        else:
+            super().contextMenuEvent(event)
 
 
 class TodoApp(MacWindow):
-    def __init__(self):
+    SEARCH_DEBOUNCE_MS = 150  # 搜索输入停止多久后才执行查询
+    LAYOUT_BATCH = 2000  # 列表每次布局的行数
+    TRANSFER_FILTER = "待办列表 (*.csv *.json *.jsonl *.ndjson)"  # 导入/导出的文件类型
+    SORT_ORDERS = ("manual", "text", "pending")  # 添加顺序 / 按名称 / 未完成在前
+    DONE_FILTER_NAMES = {None: "全部", False: "未完成", True: "已完成"}
+    VIEW_OFFSET = 30  # 新建视图窗口相对当前窗口的偏移
+
+    def __init__(self, journal=None, store=None):
+        """store 为 None 时新建一份数据（journal 用于持久化）；传入 store 时作为它的又一个视图窗口"""
         super().__init__()
 
         self.setWindowTitle("待办事项")
         self.resize(500, 400)
         self.setMinimumSize(400, 300)
-        self.title_label.setText("  我的待办事项  ")
+        self.setTitle("我的待办事项")
 
         layout = QVBoxLayout()
         layout.setContentsMargins(30, 30, 30, 20)
@@ -63,144 +140,339 @@ class TodoApp(MacWindow):
         # 输入区
         input_layout = QHBoxLayout()
         self.input_line = CustomLineEdit()
+        self.input_line.setObjectName("todoInput")
         self.input_line.setPlaceholderText("添加新的待办事项...")
-        self.input_line.setStyleSheet(self._input_style())
         self.input_line.setFixedHeight(36)
         self.input_line.returnPressed.connect(self.add_item)
 
         self.add_btn = QPushButton("添加")
+        self.add_btn.setObjectName("todoAddButton")
         self.add_btn.setFixedWidth(80)
         self.add_btn.setFixedHeight(36)
         self.add_btn.setCursor(Qt.PointingHandCursor)
-        self.add_btn.setStyleSheet(self._button_style())
         self.add_btn.clicked.connect(self.add_item)
 
         input_layout.addWidget(self.input_line)
         input_layout.addWidget(self.add_btn)
 
-        # 待办事项列表
-        self.todo_list = QListWidget()
+        # 搜索框：输入停止后再查询，只改变哪些行可见
+        self.search_line = QLineEdit()
+        self.search_line.setObjectName("todoSearch")
+        self.search_line.setPlaceholderText("搜索事项...")
+        self.search_line.setClearButtonEnabled(True)
+        self.search_line.setFixedHeight(30)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.apply_search)
+        self.search_line.textChanged.connect(self._search_timer.start)
+
+        # 待办事项列表（模型/视图：只绘制可见行，行高统一）
+        # 数据在 store 中，可由多个窗口共享；本窗口只持有自己的过滤/排序视图
+        # store 不以本窗口为父对象：创建它的窗口关闭销毁后，其他视图窗口仍可继续使用
+        self.store = store if store is not None else TodoStore(journal)
+        self.store.attach(self)
+        self.todo_model = self.store.model
+        self.filter_model = TodoFilterModel(self.todo_model, self)
+        self._done_filter = None  # 只显示未完成(False) / 已完成(True)，None 显示全部
+        self._sort_order = "manual"
+        self.todo_list = QListView()
+        self.todo_list.setObjectName("todoList")
+        self.todo_list.setModel(self.filter_model)
+        self.todo_list.setEditTriggers(QListView.EditKeyPressed)
+        self.todo_list.setItemDelegate(TodoItemDelegate(self.todo_list))
+        self.todo_list.setUniformItemSizes(True)
+        # 行数很多时视图的重新布局分批完成，插入大量事项期间界面不会卡住
+        self.todo_list.setLayoutMode(QListView.Batched)
+        self.todo_list.setBatchSize(self.LAYOUT_BATCH)
+        self.todo_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.todo_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.todo_list.customContextMenuRequested.connect(self.show_context_menu)
-        self.todo_list.itemClicked.connect(self.toggle_item_done)
-
-        self.todo_list.setStyleSheet("""
-            QListWidget {
-                border: 0.5px solid #ddd;
-                border-radius: 4px;
-                padding: 6px;
-                font-size: 15px;
-                background-color: #fff;
-            }
-        """)
+        self.todo_list.clicked.connect(self.toggle_item_done)
+        delete_shortcut = QShortcut(QKeySequence.Delete, self.todo_list, self.delete_selected)
+        delete_shortcut.setContext(Qt.WidgetShortcut)
 
         # 状态栏
         self.status_label = QLabel("右键点击事项可删除")
-        self.status_label.setStyleSheet("color: #666666; font-size: 13px;")
+        self.status_label.setObjectName("todoStatus")
 
         layout.addLayout(input_layout)
+        layout.addWidget(self.search_line)
         layout.addWidget(self.todo_list)
         layout.addWidget(self.status_label)
 
         self.setContentLayout(layout)
 
-    def _input_style(self):
-        return """
-            QLineEdit {
-                border: 0.5px solid #aaa;
-                border-radius: 4px;
-                padding: 0 12px;
-                font-size: 15px;
-                color: #333;
-                background-color: #fafafa;
-            }
-            QLineEdit:focus {
-                border-color: #4caf50;
-                background-color: #fff;
-            }
-        """
-
-    def _button_style(self):
-        return """
-            QPushButton {
-                background-color: #4caf50;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-size: 15px;
-                font-weight: 600;
-                padding: 8px 15px;
-                transition: background-color 0.2s ease;
-            }
-            QPushButton:hover {
-                background-color: #3a9d3a;
-            }
-            QPushButton:pressed {
-                background-color: #357a34;
-            }
-        """
+        # 持久化日志、搜索索引和撤销栈都由 store 提供，所有视图窗口共享
+        self.journal = self.store.journal
+        if store is None and self.store.loaded:
+            self.status_label.setText(f"已加载 {self.store.loaded} 个事项")
+        self.search_index = self.store.search_index
+
+        # 列表操作的撤销/重做（输入框获得焦点时 Ctrl+Z 仍由输入框自己处理）
+        self.undo_stack = self.store.undo_stack
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence.Redo, self, self.redo)
+
+        # 导入/导出：分批在事件循环中执行，运行期间 Esc 取消
+        self.transfer = None
+        QShortcut(QKeySequence.Open, self, self.choose_import_file)
+        QShortcut(QKeySequence("Ctrl+E"), self, self.choose_export_file)
+        self._cancel_shortcut = QShortcut(QKeySequence.Cancel, self, self.cancel_transfer)
+        self._cancel_shortcut.setEnabled(False)
+
+    def closeEvent(self, event):
+        """关闭时取消未完成的导入/导出，并把缓冲的修改交给写线程"""
+        self.cancel_transfer()
+        self.store.flush()
+        super().closeEvent(event)
+
+    def reset_for_reuse(self):
+        """被窗口池回收时清空输入框和状态栏，视图恢复为显示全部、按添加顺序"""
+        super().reset_for_reuse()
+        self.cancel_transfer()
+        self.input_line.clear()
+        self.search_line.clear()
+        self.setSortOrder("manual")
+        self.setDoneFilter(None)
+        self.status_label.setText("右键点击事项可删除")
+
+    # ---------- 视图 ----------
+
+    def setDoneFilter(self, done):
+        """只显示未完成（False）或已完成（True）的事项，None 显示全部；只影响本窗口"""
+        if done is not None:
+            done = bool(done)
+        self._done_filter = done
+        self.setTitle("我的待办事项" if done is None else f"我的待办事项 · {self.DONE_FILTER_NAMES[done]}")
+        self.apply_search()
+
+    def doneFilter(self):
+        return self._done_filter
+
+    def setSortOrder(self, order):
+        """设置本窗口的排序方式（manual / text / pending）"""
+        if order not in self.SORT_ORDERS:
+            raise ValueError(f"未知的排序方式：{order}")
+        self._sort_order = order
+        model = self.todo_model
+        if order == "text":
+            key = lambda row: model.text(row).lower()
+        elif order == "pending":
+            key = model.is_done
+        else:
+            key = None
+        self.filter_model.setSortKey(key)
+
+    def sortOrder(self):
+        return self._sort_order
+
+    def open_view(self):
+        """在同一份数据上再打开一个窗口：搜索、过滤和排序与本窗口互不影响，修改实时同步"""
+        view = type(self)(store=self.store)
+        view.setAttribute(Qt.WA_DeleteOnClose)  # 数据在 store 中，视图窗口关闭即销毁
+        view.move(self.pos() + QPoint(self.VIEW_OFFSET, self.VIEW_OFFSET))
+        view.show()
+        return view
 
     def add_item(self):
         text = self.input_line.text().strip()
         if not text:
             return
 
-        item = QListWidgetItem(text)
-        # 初始状态：未完成，黑色字体，无删除线
-        self.set_item_done(item, done=False)
-        self.todo_list.addItem(item)
+        # 初始状态：未完成
+        row = self.todo_model.rowCount()
+        self.todo_model.append(text)
+        self.undo_stack.push(TodoCommand("add", [row], "添加事项"))
         self.input_line.clear()
         self.status_label.setText(f"添加事项：{text}")
 
+    def apply_search(self):
+        """按搜索框内容和完成状态过滤列表（只改变可见行）"""
+        query = self.search_line.text().strip()
+        done = self._done_filter
+        model = self.todo_model
+        if not query:
+            if done is None:
+                self.filter_model.setFilter(None)
+                self.status_label.setText(f"共 {model.rowCount()} 个事项")
+            else:
+                self.filter_model.setFilter(lambda row: model.is_done(row) == done)
+                self.status_label.setText(f"{self.DONE_FILTER_NAMES[done]} {self.filter_model.rowCount()} 个事项")
+            return
+        needle = query.lower()
+        rows = self.search_index.search(query)
+        if done is None:
+            accept = lambda row: needle in model.text(row).lower()
+        else:
+            accept = lambda row: model.is_done(row) == done and needle in model.text(row).lower()
+            rows = [row for row in rows if model.is_done(row) == done]
+        self.filter_model.setFilter(accept, rows=rows)
+        self.status_label.setText(f"找到 {self.filter_model.rowCount()} 个事项")
+
+    def _source_row(self, index: QModelIndex):
+        return self.filter_model.source_row(index.row())
+
+    def selected_rows(self):
+        """当前选中事项对应的源行号（升序）；按选择区间遍历，不逐个生成索引"""
+        rows = []
+        for selection in self.todo_list.selectionModel().selection():
+            rows.extend(self.filter_model.source_row(row)
+                        for row in range(selection.top(), selection.bottom() + 1))
+        rows.sort()
+        return rows
+
     def show_context_menu(self, pos: QPoint):
-        item = self.todo_list.itemAt(pos)
-        if item:
-            menu = QMenu(self)
-            menu.setStyleSheet("""
-                QMenu {
-                    background-color: #fff;
-                    border: 1px solid #ccc;
-                    border-radius: 0px;
-                    padding: 4px 0;
-                    font-size: 14px;
-                    color: #333;
-                }
-                QMenu::item {
-                    padding: 6px 20px;
-                }
-                QMenu::item:selected {
-                    background-color: #4caf50;
-                    color: white;
-                }
-            """)
-            delete_action = menu.addAction("删除该事项")
-            action = menu.exec(self.todo_list.mapToGlobal(pos))
-            if action == delete_action:
-                self.todo_list.takeItem(self.todo_list.row(item))
-                self.status_label.setText("已删除一项事项")
-
-    def toggle_item_done(self, item: QListWidgetItem):
-        # 切换完成状态
-        done = item.data(Qt.UserRole) or False
-        self.set_item_done(item, not done)
-
-    def set_item_done(self, item: QListWidgetItem, done: bool):
-        """根据完成状态设置字体样式和颜色"""
-        font = item.font()
-        font.setStrikeOut(done)
-        item.setFont(font)
+        index = self.todo_list.indexAt(pos)
+        selected = self.selected_rows()
+        single = index.isValid() and len(selected) <= 1  # 右键单个事项：编辑/删除该事项
+        self.execMenu("todo.list", self.todo_list.mapToGlobal(pos),
+                      index=index, selected=selected, single=single, bulk=not single and bool(selected))
+
+    def delete_item(self, index: QModelIndex):
+        """删除一项事项（index 为视图中的索引）"""
+        self.remove_rows([self._source_row(index)], "删除事项")
+        self.status_label.setText("已删除一项事项")
+
+    def set_selected_done(self, done: bool):
+        """把选中的事项批量标记为完成/未完成（每段连续区间只通知一次）"""
+        changed = self.todo_model.set_done_rows(self.selected_rows(), done)
+        state = "完成" if done else "未完成"
+        if changed:
+            self.undo_stack.push(TodoCommand("done", changed, f"标记 {len(changed)} 个事项为{state}", value=done))
+        self.status_label.setText(f"已将 {len(changed)} 个事项标记为{state}")
+
+    def delete_selected(self):
+        """删除选中的事项"""
+        rows = self.selected_rows()
+        if not rows:
+            return
+        self.remove_rows(rows, f"删除 {len(rows)} 个事项")
+        self.status_label.setText(f"已删除 {len(rows)} 个事项")
+
+    def clear_completed(self):
+        """删除所有已完成的事项（包括被搜索过滤掉的）"""
+        rows = self.todo_model.done_rows()
+        if not rows:
+            return
+        self.remove_rows(rows, f"清除 {len(rows)} 个已完成事项")
+        self.status_label.setText(f"已清除 {len(rows)} 个已完成事项")
+
+    def remove_rows(self, rows, label):
+        """删除源行 rows（升序），整体记为一条撤销命令"""
+        model = self.todo_model
+        texts = [model.text(row) for row in rows]
+        dones = [model.is_done(row) for row in rows]
+        # 不用 clear()：逐行发出选择变化通知对大选区很慢，这些行马上就会被删除
+        self.todo_list.selectionModel().reset()
+        model.remove_rows(rows)
+        if not self.undo_stack.push(TodoCommand("remove", rows, label, texts=texts, dones=dones)):
+            self.status_label.setText(f"{label}（超过撤销内存上限，无法撤销）")
+
+    def undo(self):
+        command = self.undo_stack.undo()
+        if command is not None:
+            self.status_label.setText(f"已撤销：{command.label}")
+
+    def redo(self):
+        command = self.undo_stack.redo()
+        if command is not None:
+            self.status_label.setText(f"已重做：{command.label}")
+
+    # ---------- 导入/导出 ----------
+
+    def choose_import_file(self):
+        if self.transfer is not None:
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "导入待办事项", "", self.TRANSFER_FILTER)
+        if path:
+            self.import_file(path)
+
+    def choose_export_file(self):
+        if self.transfer is not None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "导出待办事项", "todo.csv", self.TRANSFER_FILTER)
+        if path:
+            self.export_file(path)
+
+    def import_file(self, path):
+        """流式导入 CSV / JSON 文件，事项分批追加到列表末尾"""
+        self._start_transfer("import", path, "导入")
+
+    def export_file(self, path):
+        """把当前所有事项流式写入 CSV / JSON 文件"""
+        self._start_transfer("export", path, "导出")
+
+    def cancel_transfer(self):
+        if self.transfer is not None:
+            self.transfer.cancel()
+
+    def _start_transfer(self, kind, path, verb):
+        if self.transfer is not None:
+            return
+        # 导入/导出模块（csv、json 解析等）只在第一次使用时加载
+        from TodoTransfer import TodoImporter, TodoExporter
+
+        transfer_class = TodoImporter if kind == "import" else TodoExporter
+        try:
+            transfer = transfer_class(self.todo_model, path, self)
+        except ValueError as e:
+            self.status_label.setText(f"{verb}失败：{e}")
+            return
+        self.transfer = transfer
+        self._cancel_shortcut.setEnabled(True)
+        if kind == "import":
+            # 同一次导入的各批插入合并为一条撤销命令（中间穿插了其他操作时才会分开）
+            transfer.inserted.connect(lambda first, count: self.undo_stack.push(
+                TodoCommand("add", range(first, first + count), "导入事项", merge_key=id(transfer))))
+        transfer.progress.connect(
+            lambda count, fraction, rate: self.status_label.setText(
+                f"正在{verb}：{count} 项（{fraction:.0%}），{rate:.0f} 项/秒，按 Esc 取消"))
+        transfer.finished.connect(
+            lambda count: self._end_transfer(f"已{verb} {count} 个事项，耗时 {transfer.elapsed():.1f} 秒"))
+        transfer.canceled.connect(lambda count: self._end_transfer(f"已取消{verb}（已处理 {count} 项）"))
+        transfer.failed.connect(lambda message: self._end_transfer(f"{verb}失败：{message}"))
+        self.status_label.setText(f"正在{verb}...")
+        transfer.start()
+
+    def _end_transfer(self, message):
+        self.transfer.deleteLater()
+        self.transfer = None
+        self._cancel_shortcut.setEnabled(False)
+        self.status_label.setText(message)
+
+    def toggle_item_done(self, index: QModelIndex):
+        # 切换完成状态；按住 Ctrl/Shift 点击只用于多选
+        if QApplication.keyboardModifiers() & (Qt.ControlModifier | Qt.ShiftModifier | Qt.MetaModifier):
+            return
+        row = self._source_row(index)
+        self.set_item_done(row, not self.todo_model.is_done(row))
+
+    def set_item_done(self, row: int, done: bool):
+        """设置完成状态（删除线和颜色由 TodoItemDelegate 绘制）"""
+        if self.todo_model.is_done(row) != done:
+            self.todo_model.set_done(row, done)
+            self.undo_stack.push(TodoCommand("done", [row], "完成事项" if done else "取消完成事项", value=done))
+        text = self.todo_model.text(row)
         if done:
-            item.setForeground(Qt.gray)
-            item.setData(Qt.UserRole, True)
-            self.status_label.setText(f"完成事项：{item.text()}")
+            self.status_label.setText(f"完成事项：{text}")
         else:
-            item.setForeground(Qt.black)
-            item.setData(Qt.UserRole, False)
-            self.status_label.setText(f"未完成事项：{item.text()}")
-
+            self.status_label.setText(f"未完成事项：{text}")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    win = TodoApp()
+    if "--watchdog" in sys.argv:
+        # 界面卡顿超过阈值时把调用栈写入 watchdog.log，并在窗口上提示
+        from MacWatchdog import MacWatchdog
+
+        MacWatchdog.instance().start()
+        app.aboutToQuit.connect(MacWatchdog.instance().stop)
+    journal = TodoJournal()
+    app.aboutToQuit.connect(journal.close)
+    win = TodoApp(journal=journal)
+    win.setGeometryKey("todo")  # 记住主窗口的位置、大小和最大化状态
     win.show()
+    if "--views" in sys.argv:
+        # 同一份数据的第二个窗口：只显示未完成的事项
+        win.open_view().setDoneFilter(False)
     sys.exit(app.exec())
@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("XDG_DATA_HOME", tempfile.mkdtemp())  # 不碰用户自己的数据目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def pump(app):
+    """处理 ms 毫秒内的事件（包括 deleteLater）"""
+
+    def pump(ms=0):
+        end = time.perf_counter() + ms / 1000
+        app.processEvents()
+        while time.perf_counter() < end:
+            app.processEvents()
+            time.sleep(0.001)
+
+    return pump
@@ -0,0 +1,36 @@
+import json
+import os
+
+import pytest
+
+from LoginAuth import AuthBackend, FileCredentialStore
+
+
+def test_backend_requires_authenticate():
+    with pytest.raises(TypeError):
+        AuthBackend()
+
+
+def test_default_account_stays_in_memory(tmp_path):
+    path = str(tmp_path / "credentials.json")
+    store = FileCredentialStore(path, iterations=1000)
+    assert store.authenticate("admin", "123456")
+    assert not store.authenticate("admin", "wrong")
+    assert not os.path.exists(path)  # 默认账号不写入文件
+
+    store.set_password("bob", "secret")
+    with open(path, encoding="utf-8") as f:
+        assert list(json.load(f)["users"]) == ["bob"]
+    assert not store.authenticate("admin", "123456")
+
+    reopened = FileCredentialStore(path, iterations=1000)
+    assert reopened.authenticate("bob", "secret")
+    assert not reopened.authenticate("admin", "123456")
+
+
+def test_changing_default_password_persists_it(tmp_path):
+    path = str(tmp_path / "credentials.json")
+    FileCredentialStore(path, iterations=1000).set_password("admin", "new")
+    reopened = FileCredentialStore(path, iterations=1000)
+    assert reopened.authenticate("admin", "new")
+    assert not reopened.authenticate("admin", "123456")
@@ -0,0 +1,39 @@
+import json
+import os
+
+from PySide6.QtNetwork import QLocalSocket
+
+from MacLauncher import MacLauncher, _DemoHost
+
+
+def send(key, message, pump):
+    socket = QLocalSocket()
+    socket.connectToServer(key)
+    assert socket.waitForConnected(1000)
+    socket.write(json.dumps(message).encode("utf-8") + b"\n")
+    socket.flush()
+    reply = b""
+    for _ in range(200):
+        pump(5)
+        reply += socket.readAll().data()
+        if reply.endswith(b"\n"):
+            break
+    socket.abort()
+    return json.loads(reply)
+
+
+def test_bad_forwarded_requests_are_rejected(app, pump):
+    launcher = MacLauncher(key=f"MacWindow-test-{os.getpid()}")
+    assert launcher.listen()
+    host = _DemoHost(launcher, app)
+    try:
+        for argv, wait in ((["nosuchkind"], False), (["nosuchkind"], True), ("todo", False), ([1, 2], True)):
+            reply = send(launcher.key, {"argv": argv, "cwd": "", "wait": wait}, pump)
+            assert reply["ok"] is False and reply["error"]
+        assert launcher.isListening()  # 主实例照常运行
+        assert send(launcher.key, {"argv": ["--stats"], "cwd": "", "wait": True}, pump)["ok"] is True
+    finally:
+        app.aboutToQuit.disconnect(host._on_quit)
+        launcher.close()
+        host.deleteLater()
+        pump()
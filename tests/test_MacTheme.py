@@ -0,0 +1,23 @@
+from PySide6.QtGui import QColor
+
+from MacTheme import MacTheme
+
+
+def test_token_cache_follows_theme_changes(app):
+    current = MacTheme.current()
+    MacTheme.register_theme("test", {"window_bg": "#101010", "close": "#ff0000"})
+    try:
+        MacTheme.apply("test")
+        assert MacTheme.token("window_bg") == "#101010"
+        assert MacTheme.color("window_bg") == QColor("#101010")
+        assert MacTheme.token("close_hover") == "rgb(216,0,0)"
+
+        MacTheme.register_theme("test", {"window_bg": "#202020"})
+        assert MacTheme.token("window_bg") == "#202020"
+        assert MacTheme.color("window_bg") == QColor("#202020")
+
+        MacTheme.apply(current)
+        assert MacTheme.color("window_bg") != QColor("#202020")
+    finally:
+        MacTheme.apply(current)
+        MacTheme._themes.pop("test", None)
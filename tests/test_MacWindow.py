@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QMouseEvent
+from PySide6.QtWidgets import QApplication
+
+from MacWindow import MacWindow
+
+
+class PaintedTitleWindow(MacWindow):
+    PAINTED_TITLE_BAR = True
+
+
+def test_title_bar_hover_leaves_no_cursor(pump):
+    window = PaintedTitleWindow()
+    window.show()
+    pump()
+    title_bar = window.title_bar
+    button = title_bar._button_rects[0].center()
+    move = QMouseEvent(QEvent.MouseMove, QPointF(button), QPointF(title_bar.mapToGlobal(button)),
+                       Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+    QApplication.sendEvent(title_bar, move)
+    assert title_bar.cursor().shape() == Qt.PointingHandCursor
+
+    QApplication.sendEvent(title_bar, QEvent(QEvent.Leave))
+    assert not title_bar.testAttribute(Qt.WA_SetCursor)  # 窗口边缘的缩放光标不会被遮住
+    window.close()
+    pump()
+
+
+def test_menu_machinery_loads_on_demand():
+    # 新进程中检查：没有声明菜单的程序不加载 MacMenu，也不注册菜单样式
+    code = (
+        "import sys\n"
+        "from PySide6.QtWidgets import QApplication\n"
+        "app = QApplication([])\n"
+        "from MacWindow import MacWindow\n"
+        "from MacTheme import MacTheme\n"
+        "MacWindow().show()\n"
+        "assert 'MacMenu' not in sys.modules and 'MacMenu' not in MacTheme._styles\n"
+        "MacWindow.defineMenu('test', [])\n"
+        "assert 'MacMenu' in MacTheme._styles\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True, timeout=60)
+
+
+@pytest.mark.parametrize("mode", [MacWindow.ANIMATION_MODE_GEOMETRY, MacWindow.ANIMATION_MODE_SNAPSHOT])
+def test_profiler_hooks_animations_when_created(app, pump, mode):
+    window = MacWindow(default_size=(700, 700))
+    window.setAnimationMode(mode)
+    window.SNAPSHOT_MIN_AREA = 0
+    window.show()
+    pump()
+    try:
+        window.setProfilingEnabled(True)
+        assert window._animation is None  # 开启统计不会提前创建动画
+
+        window.toggle_max_restore()
+        pump(window.ANIMATION_DURATION + 100)
+        assert window.profilerStats()[window.profiler().ANIMATION]["count"] > 0
+        if mode == MacWindow.ANIMATION_MODE_SNAPSHOT:
+            assert window._animation is None  # 截图动画不需要窗口自身的几何动画
+
+        window.setProfilingEnabled(False)
+        assert "updateCurrentValue" not in vars(window._snapshot_animation or window._animation)
+    finally:
+        window.close()
+        pump()
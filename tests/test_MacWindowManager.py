@@ -0,0 +1,54 @@
+import gc
+import weakref
+
+from MacWindow import MacWindow
+from MacWindowManager import MacWindowManager
+
+
+def test_closed_windows_are_released(pump):
+    manager = MacWindowManager.instance()
+    refs = []
+    for _ in range(20):
+        window = MacWindow()
+        window.show()
+        pump()
+        window.close()
+        pump()
+        refs.append(weakref.ref(window))
+        del window
+    pump()
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+    assert manager.windows() == []
+    assert len(manager._windows) == 0
+
+
+def test_hidden_window_leaves_snap_index(pump):
+    manager = MacWindowManager.instance()
+    window = MacWindow()
+    window.show()
+    pump()
+    assert window in manager.windows()
+    window.hide()
+    assert window not in manager.windows()
+    window.show()
+    pump()
+    assert window in manager.windows()
+    window.close()
+    pump()
+
+
+def test_visible_window_stays_alive_without_other_references(pump):
+    manager = MacWindowManager.instance()
+    window = MacWindow()
+    window.show()
+    pump()
+    ref = weakref.ref(window)
+    del window
+    gc.collect()
+    assert ref() is not None and ref() in manager.windows()  # 例如窗口池取出后只由屏幕上的窗口本身持有
+
+    ref().close()
+    pump()
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,22 @@
+from MacWindow import MacWindow
+from MacWindowPool import MacWindowPool
+
+
+def test_windows_over_the_cap_are_deleted(pump):
+    pool = MacWindowPool(MacWindow, size=0, max_size=1)
+    windows = [pool.acquire() for _ in range(3)]
+    destroyed = []
+    for window in windows:
+        window.destroyed.connect(lambda *_: destroyed.append(True))
+        window.show()
+    pump()
+    for window in windows:
+        window.close()
+    pump()
+
+    # 调用方仍持有引用，超过上限的窗口也要销毁（例如 MacLauncher 记录的登录窗口）
+    assert pool.available() == 1
+    assert pool.stats()["recycled"] == 1
+    assert len(destroyed) == 2
+    pool.clear()
+    pump()
@@ -0,0 +1,70 @@
+import json
+
+from TodoJournal import TodoJournal
+from TodoModel import TodoListModel
+
+
+def contents(model):
+    return model.rows(0, model.rowCount())
+
+
+def reload(directory):
+    journal = TodoJournal(directory)
+    model = TodoListModel()
+    journal.load(model)
+    journal.close()
+    return model
+
+
+def edit(model):
+    model.append_many([f"事项 {i}" for i in range(50)])
+    model.set_done_rows(range(0, 50, 3), True)
+    model.remove_rows(range(10, 20))
+    model.insert(5, "插入", True)
+    model.set_row(0, "改名", False)
+
+
+def test_journal_replays_to_same_model(tmp_path, app):
+    journal = TodoJournal(str(tmp_path))
+    model = TodoListModel()
+    journal.load(model)
+    journal.attach(model)
+    edit(model)
+    journal.close()  # 写线程写完缓冲的全部记录后退出
+
+    assert contents(reload(str(tmp_path))) == contents(model)
+
+
+def test_compaction_starts_a_new_generation(tmp_path, app):
+    journal = TodoJournal(str(tmp_path))
+    journal.COMPACT_THRESHOLD = 7  # 编辑过程中压缩若干次
+    model = TodoListModel()
+    journal.load(model)
+    journal.attach(model)
+    edit(model)
+    model.toggle(1)
+    journal.close()
+
+    with open(journal.snapshot_path, encoding="utf-8") as f:
+        generation = json.loads(f.readline())["gen"]
+    with open(journal.journal_path, encoding="utf-8") as f:
+        assert json.loads(f.readline())["gen"] == generation
+    assert generation > 0
+    assert contents(reload(str(tmp_path))) == contents(model)
+
+
+def test_stale_journal_is_not_replayed(tmp_path, app):
+    journal = TodoJournal(str(tmp_path))
+    model = TodoListModel()
+    journal.load(model)
+    journal.attach(model)
+    edit(model)
+    journal.compact()
+    journal.close()
+
+    # 模拟压缩中途退出：快照已换代，日志还是上一代的内容，重放会重复应用修改
+    with open(journal.journal_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"gen": 0}) + "\n")
+        f.write(json.dumps({"op": "add", "row": 0, "texts": ["重复"], "done": [False]}) + "\n")
+
+    assert contents(reload(str(tmp_path))) == contents(model)
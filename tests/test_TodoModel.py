@@ -0,0 +1,116 @@
+import random
+
+from TodoModel import TodoListModel, TodoFilterModel
+
+
+def make_model(count):
+    model = TodoListModel()
+    model.append_many([f"事项 {i}" for i in range(count)])
+    return model
+
+
+def visible(view):
+    return [view.source_row(row) for row in range(view.rowCount())]
+
+
+def test_filtered_range_change_is_grouped_into_runs(app):
+    model = make_model(200)
+    shown = [i < 50 for i in range(200)]
+    view = TodoFilterModel(model)
+    view.setFilter(lambda row: shown[row])
+
+    signals = []
+    view.rowsRemoved.connect(lambda parent, first, last: signals.append(("del", first, last)))
+    view.rowsInserted.connect(lambda parent, first, last: signals.append(("add", first, last)))
+    view.modelReset.connect(lambda: signals.append(("reset",)))
+
+    # 一次 dataChanged 内：10..19 隐藏，60..69 显示，各自只发出一次区间通知
+    for row in range(10, 20):
+        shown[row] = False
+    for row in range(60, 70):
+        shown[row] = True
+    model.dataChanged.emit(model.index(10), model.index(69))
+    assert visible(view) == [r for r in range(200) if shown[r]]
+    assert signals == [("del", 10, 19), ("add", 40, 49)]
+
+    # 超过 MAX_INCREMENTAL_ROWS 的区间整体重置
+    signals.clear()
+    shown[:] = [i % 3 == 0 for i in range(200)]
+    model.dataChanged.emit(model.index(0), model.index(199))
+    assert visible(view) == [r for r in range(200) if shown[r]]
+    assert signals == [("reset",)]
+
+
+def items(model):
+    return [(model.text(row), model.is_done(row), model.item_id(row)) for row in range(model.rowCount())]
+
+
+def test_bulk_edits_match_plain_list(app):
+    model = make_model(300)
+    expected = items(model)
+
+    model.set_done_rows(range(0, 300, 7), True)  # 区间多于 MAX_RANGED_RUNS，整体通知
+    model.set_done_rows(range(20, 40), True)
+    expected = [(text, done or row % 7 == 0 or 20 <= row < 40, id_) for row, (text, done, id_) in enumerate(expected)]
+    assert items(model) == expected
+
+    for rows in (range(10, 30), range(0, 300, 3)):  # 连续区间 / 逐段过多时整体重建
+        rows = [row for row in rows if row < model.rowCount()]
+        before = [(text, done) for text, done, _ in expected]
+        removed = [expected[row] for row in rows]
+        model.remove_rows(rows)
+        expected = [item for row, item in enumerate(expected) if row not in set(rows)]
+        assert items(model) == expected
+
+        # insert_rows 是 remove_rows 的逆操作：内容复原，新行获得新的 id
+        model.insert_rows(rows, [text for text, _, _ in removed], [done for _, done, _ in removed])
+        restored = items(model)
+        assert [(text, done) for text, done, _ in restored] == before
+        assert len({id_ for _, _, id_ in restored}) == model.rowCount()
+        expected = restored
+
+    assert model.done_count() == sum(done for _, done, _ in expected)
+    assert model.done_rows() == [row for row, (_, done, _) in enumerate(expected) if done]
+
+
+def test_sorted_view_matches_brute_force(app):
+    rng = random.Random(5)
+    model = make_model(150)
+    for row in range(0, 150, 4):
+        model.set_done(row, True)
+    view = TodoFilterModel(model)
+    view.setFilter(lambda row: "3" not in model.text(row))
+    view.setSortKey(lambda row: (model.is_done(row), model.text(row)))
+
+    def expected():
+        rows = [row for row in range(model.rowCount()) if "3" not in model.text(row)]
+        return sorted(rows, key=lambda row: (model.is_done(row), model.text(row), row))
+
+    for step in range(300):
+        action = rng.random()
+        count = model.rowCount()
+        if action < 0.2:
+            row = rng.randint(0, count)
+            # 偶尔插入超过 MAX_INCREMENTAL_ROWS 行，走整体重置
+            size = 100 if rng.random() < 0.05 else rng.randint(1, 3)
+            model.insert_many(row, [f"新 {step}.{i}" for i in range(size)])
+        elif action < 0.35 and count:
+            model.remove_rows(rng.sample(range(count), min(rng.randint(1, 80), count)))
+        elif action < 0.6 and count:
+            model.set_done_rows(rng.sample(range(count), min(rng.randint(1, 10), count)), rng.random() < 0.5)
+        elif action < 0.8 and count:
+            model.set_text(rng.randrange(count), f"改 {rng.randint(0, 50)}")
+        elif count:
+            first = rng.randrange(count)
+            model.set_done_rows(range(first, min(count, first + rng.randint(1, 100))), rng.random() < 0.5)
+        assert visible(view) == expected()
+
+
+def test_unfiltered_view_passes_rows_through(app):
+    model = make_model(10)
+    view = TodoFilterModel(model)
+    assert len(model) == model.rowCount() == view.rowCount() == 10
+    assert view.index(9).isValid() and not view.index(10).isValid()
+    model.remove_rows_range(0, 5)
+    assert len(model) == 5 and not view.index(5).isValid()
+    assert view.index(4).data() == "事项 9"
@@ -0,0 +1,76 @@
+import random
+
+from TodoModel import TodoListModel, TodoFilterModel
+from TodoSearch import TodoSearchIndex
+
+WORDS = ["买", "牛奶", "milk", "Bread", "报告", "report", "周一", "call", "Mom", "a"]
+QUERIES = ["牛奶", "milk", "MILK", "rea", "报告 周", "ca", "a", "mom", "不存在"]
+
+
+def random_text(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def scan(model, query):
+    query = query.lower()
+    return [row for row in range(model.rowCount()) if query in model.text(row).lower()]
+
+
+def test_search_matches_substring_scan(app, pump):
+    rng = random.Random(12)
+    model = TodoListModel()
+    model.append_many(random_text(rng) for _ in range(300))
+    index = TodoSearchIndex(model, background=True)
+    index.REBUILD_REMOVED = 50  # 大批量删除走后台重建
+
+    def check():
+        for query in QUERIES:
+            assert index.search(query) == scan(model, query), query
+
+    check()  # 建立索引之前退化为线性扫描
+    pump()
+    assert index.isReady()
+    check()
+
+    for step in range(200):
+        action = rng.random()
+        if action < 0.3:
+            model.insert(rng.randint(0, model.rowCount()), random_text(rng))
+        elif action < 0.5 and model.rowCount():
+            model.remove_row(rng.randrange(model.rowCount()))
+        elif action < 0.8 and model.rowCount():
+            model.set_text(rng.randrange(model.rowCount()), random_text(rng))
+        elif model.rowCount():
+            model.set_done(rng.randrange(model.rowCount()), True)
+        check()
+
+    model.remove_rows_range(0, 100)
+    check()
+    pump()
+    assert index.isReady()
+    check()
+
+
+def test_filtered_view_matches_brute_force(app, pump):
+    rng = random.Random(7)
+    model = TodoListModel()
+    model.append_many(random_text(rng) for _ in range(200))
+    index = TodoSearchIndex(model)
+    view = TodoFilterModel(model)
+    needle = "milk"
+    view.setFilter(lambda row: needle in model.text(row).lower(), rows=index.search(needle))
+
+    for step in range(300):
+        action = rng.random()
+        if action < 0.25:
+            row = rng.randint(0, model.rowCount())
+            model.insert_many(row, [random_text(rng) for _ in range(rng.randint(1, 3))])
+        elif action < 0.45 and model.rowCount():
+            row = rng.randrange(model.rowCount())
+            model.remove_rows_range(row, min(rng.randint(1, 3), model.rowCount() - row))
+        elif action < 0.6 and model.rowCount():
+            model.remove_rows(rng.sample(range(model.rowCount()), min(5, model.rowCount())))
+        elif model.rowCount():
+            model.set_text(rng.randrange(model.rowCount()), random_text(rng))
+        rows = [view.source_row(row) for row in range(view.rowCount())]
+        assert rows == scan(model, needle) == index.search(needle)
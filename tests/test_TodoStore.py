@@ -0,0 +1,105 @@
+from PySide6.QtCore import Qt
+
+from TodoJournal import TodoJournal
+from demo3_todo import TodoApp
+
+
+def test_views_outlive_originating_window(tmp_path, pump):
+    journal = TodoJournal(str(tmp_path))
+    first = TodoApp(journal=journal)
+    first.setAttribute(Qt.WA_DeleteOnClose)
+    first.show()
+    view = first.open_view()
+    store = view.store
+    pump()
+
+    first.close()
+    pump()
+    del first
+    assert store.views() == [view]
+
+    view.input_line.setText("买牛奶")
+    view.add_item()
+    assert store.model.rowCount() == 1
+    assert view.filter_model.rowCount() == 1
+
+    view.close()  # 最后一个视图离开：缓冲的修改交给写线程，日志仍由创建方关闭
+    pump()
+    del view
+    assert store.views() == []
+    assert journal._buffer == []
+    assert journal._writer.is_alive()
+
+    journal.close()
+    journal.close()  # 多个关闭方（aboutToQuit、启动器）重复关闭不会出错
+    journal.flush()
+    assert not journal._writer.is_alive()
+
+    reloaded = TodoJournal(str(tmp_path))
+    try:
+        assert reloaded.load(store.model.__class__()) == 1
+    finally:
+        reloaded.close()
+
+
+def expected_rows(view):
+    """按窗口自己的搜索、完成状态过滤和排序直接计算应显示的源行号"""
+    model = view.todo_model
+    needle = view.search_line.text().strip().lower()
+    done = view.doneFilter()
+    rows = [row for row in range(model.rowCount())
+            if needle in model.text(row).lower() and (done is None or model.is_done(row) == done)]
+    if view.sortOrder() == "text":
+        rows.sort(key=lambda row: (model.text(row).lower(), row))
+    elif view.sortOrder() == "pending":
+        rows.sort(key=lambda row: (model.is_done(row), row))
+    return rows
+
+
+def test_views_share_items_and_undo_history(app, pump):
+    first = TodoApp()
+    second = first.open_view()
+    third = first.open_view()
+    views = (first, second, third)
+    first.setSortOrder("text")
+    second.setSortOrder("pending")
+    second.setDoneFilter(False)
+    third.search_line.setText("牛奶")
+    third.apply_search()
+
+    def check():
+        for view in views:
+            rows = [view.filter_model.source_row(row) for row in range(view.filter_model.rowCount())]
+            assert rows == expected_rows(view)
+
+    try:
+        assert second.store is first.store and third.undo_stack is first.undo_stack
+        for i, text in enumerate(["买牛奶", "写报告", "牛奶 x2", "周一开会", "Call Mom", "还牛奶钱"]):
+            views[i % 3].input_line.setText(text)
+            views[i % 3].add_item()
+            check()
+
+        first.set_item_done(0, True)
+        second.set_item_done(2, True)
+        check()
+        third.remove_rows([1, 3], "删除事项")
+        check()
+        second.clear_completed()
+        check()
+
+        # 任一窗口撤销/重做的是所有窗口共同的修改历史
+        history = []
+        while first.undo_stack.canUndo():
+            history.append(first.todo_model.rows(0, first.todo_model.rowCount()))
+            views[len(history) % 3].undo()
+            check()
+        assert first.todo_model.rowCount() == 0
+        for state in reversed(history):
+            views[len(history) % 3].redo()
+            check()
+            history.pop()
+            assert first.todo_model.rows(0, first.todo_model.rowCount()) == state
+    finally:
+        for view in views:
+            view.close()
+        pump()
@@ -0,0 +1,27 @@
+from TodoModel import TodoListModel
+from TodoTransfer import TodoTransfer, TodoImporter, TodoExporter
+
+
+def run(transfer, pump):
+    results = []
+    transfer.finished.connect(lambda count: results.append(("finished", count)))
+    transfer.failed.connect(lambda error: results.append(("failed", error)))
+    transfer.start()
+    while transfer.isRunning():
+        pump()
+    return results
+
+
+def test_base_transfer_finishes_empty(tmp_path, app, pump):
+    assert run(TodoTransfer(str(tmp_path / "todo.csv")), pump) == [("finished", 0)]
+
+
+def test_export_then_import_round_trip(tmp_path, app, pump):
+    model = TodoListModel()
+    model.append_many([f"事项 {i}, \"引号\"" for i in range(1000)], [i % 3 == 0 for i in range(1000)])
+    for name in ("todo.csv", "todo.json", "todo.jsonl"):
+        path = str(tmp_path / name)
+        assert run(TodoExporter(model, path), pump) == [("finished", 1000)]
+        imported = TodoListModel()
+        assert run(TodoImporter(imported, path), pump) == [("finished", 1000)]
+        assert imported.rows(0, 1000) == model.rows(0, 1000), name
@@ -0,0 +1,98 @@
+import random
+
+from TodoModel import TodoListModel
+from TodoUndo import TodoCommand, TodoUndoStack
+
+
+def contents(model):
+    return model.rows(0, model.rowCount())
+
+
+def add(stack, model, row, texts, merge_key=None):
+    model.insert_many(row, texts)
+    return stack.push(TodoCommand("add", range(row, row + len(texts)), "添加事项", merge_key=merge_key))
+
+
+def remove(stack, model, rows):
+    rows = sorted(rows)
+    texts = [model.text(row) for row in rows]
+    dones = [model.is_done(row) for row in rows]
+    model.remove_rows(rows)
+    return stack.push(TodoCommand("remove", rows, "删除事项", texts=texts, dones=dones))
+
+
+def mark(stack, model, rows, done):
+    changed = model.set_done_rows(rows, done)
+    if changed:
+        stack.push(TodoCommand("done", changed, "标记事项", value=done))
+
+
+def test_undo_redo_round_trip(app):
+    rng = random.Random(3)
+    model = TodoListModel()
+    model.append_many(f"事项 {i}" for i in range(100))
+    stack = TodoUndoStack(model)
+    history = [contents(model)]
+
+    for step in range(60):
+        action = rng.random()
+        count = model.rowCount()
+        if action < 0.35 or count < 10:
+            add(stack, model, rng.randint(0, count), [f"新 {step}.{i}" for i in range(rng.randint(1, 5))])
+        elif action < 0.7:
+            # 既有连续区间也有分散的行，分散的行数超过 MAX_RANGED_RUNS 时模型整体重建
+            rows = rng.sample(range(count), rng.randint(1, min(80, count)))
+            remove(stack, model, rows)
+        else:
+            mark(stack, model, rng.sample(range(count), rng.randint(1, min(20, count))), rng.random() < 0.5)
+        history.append(contents(model))
+    history = [state for i, state in enumerate(history) if i == 0 or state != history[i - 1]]
+
+    for state in reversed(history[:-1]):
+        stack.undo()
+        assert contents(model) == state
+    assert not stack.canUndo()
+    for state in history[1:]:
+        stack.redo()
+        assert contents(model) == state
+    assert not stack.canRedo()
+
+
+def test_runs_are_compressed_and_imports_merge(app):
+    model = TodoListModel()
+    stack = TodoUndoStack(model)
+    key = object()
+    for batch in range(10):
+        add(stack, model, model.rowCount(), [f"导入 {batch}.{i}" for i in range(1000)], merge_key=key)
+    assert stack.stats()["undo"] == 1  # 同一次导入的多批追加合并为一条命令
+    command = stack._undo[-1]
+    assert list(command.runs) == [0, 10000]  # 一万行只占一个区间
+    assert command.texts is None  # 插入状态下不保存文字
+
+    stack.undo()
+    assert model.rowCount() == 0
+    assert len(command.texts) == 10000  # 撤销插入后才保存文字以便重做
+    stack.redo()
+    assert model.rowCount() == 10000 and model.text(9999) == "导入 9.999"
+    assert command.texts is None
+
+
+def test_memory_limit_evicts_oldest(app):
+    model = TodoListModel()
+    model.append_many(f"事项 {i}" for i in range(1000))
+    stack = TodoUndoStack(model)
+    for start in range(0, 500, 50):
+        remove(stack, model, range(start, start + 10))
+    sizes = [command.size for command in stack._undo]
+    assert stack.memoryUsage() == sum(sizes)
+
+    stack.setMemoryLimit(sum(sizes[-3:]))
+    assert stack.stats()["undo"] == 3 and stack.stats()["evicted"] == len(sizes) - 3
+    assert stack.memoryUsage() <= stack.memoryLimit()
+
+    # 单条命令超过上限时无法撤销，但模型照常修改
+    stack.setMemoryLimit(sizes[0] // 2)
+    before = model.rowCount()
+    assert not remove(stack, model, range(0, 10))
+    assert model.rowCount() == before - 10
+    assert not stack.canUndo() and stack.memoryUsage() == 0